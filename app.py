@@ -1,26 +1,126 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from psycopg_pool import PoolTimeout
 from routes import route
+from app.services.artigo_service import ArtigoService
+from app.services import estoque_service
 import logging
+import time
 from config import settings
+from database.connection import get_database
+from database.view_refresh import ViewRefresher
+from repositories.autocomplete import AutocompleteRefresher, autocomplete_fingerprint, load_autocomplete_index
+from monitoring.metrics import CallbackGauge, registry, startup_duration_seconds
+from monitoring.admission import AdmissionController, AdmissionMiddleware, RouteClass, default_rules
+from monitoring.middleware import MetricsMiddleware
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Abrir o pool e criar os serviços antes de aceitar requisições"""
+    start = time.perf_counter()
+    db = get_database()
+    await db.open()
+    startup_duration_seconds.set(time.perf_counter() - start, phase="pool")
+    estoque_view = None
+    if settings.ESTOQUE_VIEW_REFRESH_INTERVAL is not None:
+        estoque_view = ViewRefresher(
+            "estoque", estoque_service.reload_materialized_view, settings.ESTOQUE_VIEW_REFRESH_INTERVAL
+        )
+        estoque_view.start()
+    app.state.estoque_view = estoque_view
+
+    autocomplete = None
+    autocomplete_refresher = None
+    if settings.ARTIGO_AUTOCOMPLETE:
+        index_start = time.perf_counter()
+        try:
+            # Antes da carga: uma escrita no meio dela provoca uma recarga a mais, não uma a menos
+            fingerprint = await autocomplete_fingerprint(db)
+            autocomplete = await load_autocomplete_index(db)
+            logger.info(f"Índice de autocompletar carregado com {len(autocomplete)} artigos")
+            if settings.ARTIGO_AUTOCOMPLETE_REFRESH_INTERVAL is not None:
+                autocomplete_refresher = AutocompleteRefresher(
+                    autocomplete, db, settings.ARTIGO_AUTOCOMPLETE_REFRESH_INTERVAL, fingerprint
+                )
+                autocomplete_refresher.start()
+        except Exception as e:
+            # Sem o índice, /autocomplete usa a busca textual no banco
+            logger.warning(f"Erro ao carregar o índice de autocompletar: {e}")
+        startup_duration_seconds.set(time.perf_counter() - index_start, phase="autocomplete")
+    app.state.autocomplete_refresher = autocomplete_refresher
+    app.state.artigo_service = ArtigoService(db, estoque_view=estoque_view, autocomplete=autocomplete)
+
+    if settings.STARTUP_WARMUP:
+        warmup_start = time.perf_counter()
+        try:
+            summary = await app.state.artigo_service.warmup()
+            logger.info(f"Aquecimento concluído: {summary}")
+        except Exception as e:
+            # Sem aquecimento a aplicação funciona, só com a primeira requisição mais lenta
+            logger.warning(f"Erro ao aquecer conexões e cache: {e}")
+        startup_duration_seconds.set(time.perf_counter() - warmup_start, phase="warmup")
+
+    elapsed = time.perf_counter() - start
+    startup_duration_seconds.set(elapsed, phase="total")
+    logger.info(f"Aplicação pronta em {elapsed:.3f}s")
+    try:
+        yield
+    finally:
+        if autocomplete_refresher is not None:
+            await autocomplete_refresher.stop()
+        if estoque_view is not None:
+            await estoque_view.stop()
+        await db.close()
+
+
 # Criar instância da aplicação FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description=settings.DESCRIPTION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 
 app.include_router(route.router, prefix="/api/v1/artigos", tags=["artigos"])
 
 
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    logger.error(f"Tempo esgotado aguardando conexão do pool: {exc}")
+    return JSONResponse(status_code=503, content={"detail": "Banco de dados sobrecarregado"})
+
+
+admission = AdmissionController(
+    [
+        RouteClass(
+            name,
+            priority=int(limits["priority"]),
+            concurrency=int(limits["concurrency"]),
+            queue=int(limits["queue"]),
+            timeout=limits["timeout"]
+        )
+        for name, limits in settings.ADMISSION_LIMITS.items()
+    ],
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY
+)
+
+# Adicionado antes do CORS: os 503 do controle de admissão também levam os cabeçalhos CORS
+if settings.ADMISSION_CONTROL:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission,
+        rules=default_rules(f"{settings.API_V1_STR}/artigos")
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -29,12 +129,117 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    MetricsMiddleware,
+    slow_request_threshold=(
+        settings.SLOW_REQUEST_THRESHOLD_MS / 1000
+        if settings.SLOW_REQUEST_THRESHOLD_MS is not None else None
+    ),
+)
+
+
+def _numeric_stats(stats: dict) -> dict:
+    return {(name,): value for name, value in stats.items() if isinstance(value, (int, float))}
+
+
+registry.register(CallbackGauge(
+    "soundmood_db_pool",
+    "Estatísticas do pool de conexões",
+    lambda: _numeric_stats(get_database().stats()),
+    ("stat",)
+))
+registry.register(CallbackGauge(
+    "soundmood_admission_queue_depth",
+    "Requisições aguardando na fila de admissão por classe de rota",
+    admission.queue_depths,
+    ("route_class",)
+))
+registry.register(CallbackGauge(
+    "soundmood_admission_active",
+    "Requisições admitidas em andamento por classe de rota",
+    admission.active_counts,
+    ("route_class",)
+))
+
+
+def _artigo_cache_stats() -> dict:
+    service = getattr(app.state, "artigo_service", None)
+    return service.cache.stats() if service else {}
+
+
+registry.register(CallbackGauge(
+    "soundmood_artigo_cache",
+    "Estatísticas do cache de artigos",
+    lambda: _numeric_stats(_artigo_cache_stats()),
+    ("stat",)
+))
+
+
+def _estoque_view_stats() -> dict:
+    estoque_view = getattr(app.state, "estoque_view", None)
+    return estoque_view.stats() if estoque_view else {}
+
+
+registry.register(CallbackGauge(
+    "soundmood_estoque_view",
+    "Estado da materialized view do estoque (staleness_seconds, refreshes, ...)",
+    lambda: _numeric_stats(_estoque_view_stats()),
+    ("stat",)
+))
+
+
+def _autocomplete_stats() -> dict:
+    service = getattr(app.state, "artigo_service", None)
+    if not service or not service.autocomplete:
+        return {}
+    refresher = getattr(app.state, "autocomplete_refresher", None)
+    return {**service.autocomplete.stats(), **(refresher.stats() if refresher else {})}
+
+
+registry.register(CallbackGauge(
+    "soundmood_autocomplete_index",
+    "Tamanho do índice de autocompletar e recargas a partir do banco",
+    lambda: _numeric_stats(_autocomplete_stats()),
+    ("stat",)
+))
+
 
 @app.get("/")
 async def main():
     return { "message": "API Running :^)"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Métricas no formato texto do Prometheus"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get(f"{settings.API_V1_STR}/database/pool")
+async def database_pool_stats():
+    """Estatísticas do pool de conexões"""
+    return get_database().stats()
+
+
+@app.get(f"{settings.API_V1_STR}/cache/artigos")
+async def artigo_cache_stats():
+    """Estatísticas do cache de artigos"""
+    return _artigo_cache_stats()
+
+
+@app.get(f"{settings.API_V1_STR}/cache/singleflight")
+async def singleflight_stats():
+    """Leituras executadas, coalescidas e descartadas por escritas"""
+    service = getattr(app.state, "artigo_service", None)
+    return service.flights.stats() if service else {}
+
+
+@app.get(f"{settings.API_V1_STR}/database/estoque-view")
+async def estoque_view_stats():
+    """Atraso e duração das atualizações da view do estoque"""
+    return _estoque_view_stats()
+
+
 
 if __name__ == "__main__":
     import uvicorn
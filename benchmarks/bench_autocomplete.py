@@ -0,0 +1,95 @@
+"""Memória e latência do índice de autocompletar com títulos sintéticos
+
+Uso (na raiz do projeto):
+
+    python -m benchmarks.bench_autocomplete --titles 1000000 --queries 20000
+"""
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+
+from repositories.autocomplete import AutocompleteIndex, normalize
+
+WORDS = [
+    "análise", "dados", "redes", "neurais", "educação", "saúde", "pública", "modelos",
+    "aprendizado", "profundo", "sistemas", "distribuídos", "ensino", "médio", "políticas",
+    "urbanas", "genômica", "clima", "amazônia", "economia", "computação", "quântica",
+    "linguagem", "natural", "avaliação", "impacto", "estudo", "caso", "brasil", "região",
+]
+
+
+def synthetic_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for artigo_id in range(1, count + 1):
+        titulo = " ".join(rng.choices(WORDS, k=rng.randint(3, 10))).capitalize()
+        doi = f"10.{rng.randint(1000, 99999)}/{rng.getrandbits(36):x}" if rng.random() < 0.7 else None
+        yield artigo_id, titulo, doi
+
+
+def percentile(timings, fraction: float) -> float:
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.titles))
+    start = time.perf_counter()
+    index = AutocompleteIndex.build(rows)
+    build_seconds = time.perf_counter() - start
+
+    # Segunda montagem só para medir a memória (o tracemalloc deixa tudo mais lento)
+    gc.collect()
+    tracemalloc.start()
+    measured = AutocompleteIndex.build(rows)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del measured
+    print(
+        f"{len(index)} artigos, {index.stats()['keys']} chaves: montagem {build_seconds:.2f}s, "
+        f"índice {memory / 2**20:.0f} MiB ({memory / len(index):.0f} B/artigo, sem contar os títulos)"
+    )
+
+    rng = random.Random(11)
+    sample = rng.sample(rows, min(args.queries, len(rows)))
+    for length in (1, 3, 6, 12):
+        prefixes = [normalize(titulo)[:length] for _, titulo, _ in sample]
+        timings = []
+        found = 0
+        for prefix in prefixes:
+            t0 = time.perf_counter()
+            found += len(index.complete(prefix, args.k))
+            timings.append((time.perf_counter() - t0) * 1_000_000)
+        timings.sort()
+        print(
+            f"prefixo de {length:>2} caracteres  p50: {percentile(timings, 0.5):>6.1f}µs  "
+            f"p95: {percentile(timings, 0.95):>6.1f}µs  p99: {percentile(timings, 0.99):>6.1f}µs  "
+            f"média de sugestões: {found / len(prefixes):.1f}"
+        )
+
+    writes = []
+    next_id = args.titles + 1
+    for artigo_id, titulo, doi in synthetic_rows(1000, seed=99):
+        t0 = time.perf_counter()
+        index.upsert(next_id + artigo_id, titulo, doi)
+        writes.append((time.perf_counter() - t0) * 1_000_000)
+    removals = []
+    for artigo_id in range(next_id + 1, next_id + 1001):
+        t0 = time.perf_counter()
+        index.remove(artigo_id)
+        removals.append((time.perf_counter() - t0) * 1_000_000)
+    print(
+        f"inclusão média: {statistics.fmean(writes):.1f}µs  "
+        f"remoção média: {statistics.fmean(removals):.1f}µs"
+    )
+
+
+if __name__ == "__main__":
+    main()
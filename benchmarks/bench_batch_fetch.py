@@ -0,0 +1,81 @@
+"""Comparar a busca de artigos com autores id a id contra a consulta em lote
+
+Uso (na raiz do projeto):
+
+    python -m benchmarks.bench_batch_fetch --ids 100 --iterations 20
+"""
+import argparse
+import statistics
+import time
+
+import psycopg
+from psycopg.rows import dict_row
+
+from config import settings
+from repositories.repository import ARTIGOS_WITH_AUTHORS_QUERY
+
+# Consulta usada por get_artigo_with_authors antes da agregação no servidor
+PER_ID_QUERY = """
+    SELECT a.id_artigo, a.titulo, a.DOI, a.publicadora, a.data_publicacao,
+        au.id_autor, au.nome as autor_nome
+    FROM Artigos a
+    LEFT JOIN Autorias aut ON a.id_artigo = aut.id_titulo
+    LEFT JOIN Autores au ON aut.id_autor = au.id_autor
+    WHERE a.id_artigo = %s
+"""
+
+
+def per_id_loop(cursor, ids) -> int:
+    for artigo_id in ids:
+        cursor.execute(PER_ID_QUERY, (artigo_id,))
+        cursor.fetchall()
+    return len(ids)
+
+
+def batched(cursor, ids) -> int:
+    cursor.execute(ARTIGOS_WITH_AUTHORS_QUERY, (ids,))
+    cursor.fetchall()
+    return 1
+
+
+def measure(fn, cursor, ids, iterations: int) -> dict:
+    timings = []
+    round_trips = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        round_trips = fn(cursor, ids)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "round_trips": round_trips,
+        "mean_ms": statistics.fmean(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=100, help="artigos por requisição")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--dsn", default=settings.database_url)
+    args = parser.parse_args()
+
+    with psycopg.connect(args.dsn, row_factory=dict_row, autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT id_artigo FROM Artigos ORDER BY random() LIMIT %s", (args.ids,)
+            )
+            ids = [row["id_artigo"] for row in cursor.fetchall()]
+            print(f"{len(ids)} artigos por requisição, {args.iterations} iterações")
+
+            for label, fn in (("id a id", per_id_loop), ("lote", batched)):
+                fn(cursor, ids)
+                stats = measure(fn, cursor, ids, args.iterations)
+                print(
+                    f"{label:<8} idas ao banco: {stats['round_trips']:>4}  "
+                    f"média: {stats['mean_ms']:>8.2f}ms  p95: {stats['p95_ms']:>8.2f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
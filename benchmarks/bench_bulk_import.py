@@ -0,0 +1,78 @@
+"""Medir a vazão (linhas/s) da importação em lote contra o POST por linha
+
+Uso (com a API rodando):
+
+    python -m benchmarks.bench_bulk_import --url http://localhost:8000 --rows 50000
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+
+import httpx
+
+ARTIGOS_PATH = "/api/v1/artigos/"
+
+
+def fake_artigo(run_id: str, index: int) -> dict:
+    return {
+        "titulo": f"Artigo de carga {run_id} #{index}",
+        "DOI": f"10.5555/bench.{run_id}.{index}",
+        "publicadora": random.choice(["SciELO", "Elsevier", "Springer", "USP"]),
+        "data_publicacao": f"{random.randint(1990, 2024)}-{random.randint(1, 12):02d}-01",
+    }
+
+
+def bench_bulk(client: httpx.Client, rows: int, run_id: str) -> dict:
+    def body():
+        for index in range(rows):
+            yield (json.dumps(fake_artigo(run_id, index)) + "\n").encode("utf-8")
+
+    start = time.perf_counter()
+    response = client.post(
+        f"{ARTIGOS_PATH}bulk",
+        content=body(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    result = response.json()
+    return {
+        "inserted": result["inserted"],
+        "failed": result["failed"],
+        "client_rows_per_second": result["inserted"] / elapsed,
+        "server_rows_per_second": result["rows_per_second"],
+    }
+
+
+def bench_single(client: httpx.Client, rows: int, run_id: str) -> dict:
+    start = time.perf_counter()
+    for index in range(rows):
+        client.post(ARTIGOS_PATH, json=fake_artigo(run_id, index)).raise_for_status()
+    elapsed = time.perf_counter() - start
+    return {"inserted": rows, "client_rows_per_second": rows / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--single-rows", type=int, default=500, help="amostra para o POST por linha")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    with httpx.Client(base_url=args.url, timeout=None) as client:
+        single = bench_single(client, args.single_rows, f"{run_id}s")
+        print(f"POST por linha: {single['inserted']} linhas, {single['client_rows_per_second']:.0f} linhas/s")
+
+        bulk = bench_bulk(client, args.rows, f"{run_id}b")
+        print(
+            f"Lote NDJSON:    {bulk['inserted']} linhas ({bulk['failed']} falhas), "
+            f"{bulk['client_rows_per_second']:.0f} linhas/s "
+            f"(servidor: {bulk['server_rows_per_second']:.0f} linhas/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
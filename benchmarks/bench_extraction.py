@@ -0,0 +1,154 @@
+"""Comparar go.extract_product_info (BeautifulSoup) com os motores rápidos
+
+Mede o tempo por página de cada motor (BeautifulSoup, lxml em uma passada e
+lxml incremental com parada antecipada) sobre um corpus de HTML salvo e
+confere se os resultados são idênticos.
+
+Uso:
+
+    python -m benchmarks.bench_extraction --corpus paginas/ --repeat 5
+    python -m benchmarks.bench_extraction --save-corpus paginas/   # gera o corpus sintético
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import go
+from scraping import fast_extract
+from scraping.streaming import DEFAULT_CHUNK_SIZE, StreamingExtractor
+
+Engine = Callable[[str], Dict]
+
+
+def streaming_extract(html: str) -> Dict:
+    """Simula a chegada da resposta em blocos de rede"""
+    data = html.encode("utf-8")
+    extractor = StreamingExtractor("utf-8")
+    for offset in range(0, len(data), DEFAULT_CHUNK_SIZE):
+        if extractor.feed(data[offset:offset + DEFAULT_CHUNK_SIZE]) is not None:
+            break
+    return extractor.close()
+
+
+def _filler(rng: random.Random, blocks: int) -> str:
+    parts = []
+    for index in range(blocks):
+        parts.append(
+            f'<div class="card item-{index}"><a href="/p/{index}">'
+            f'<img src="/i/{index}.jpg" alt="Produto relacionado {index}"></a>'
+            f'<span class="title">Produto relacionado {index}</span>'
+            f'<ul><li>Frete grátis</li><li>{rng.randint(1, 48)}x sem juros</li></ul></div>'
+        )
+    return "\n".join(parts)
+
+
+def synthetic_corpus(seed: int = 7) -> List[Tuple[str, str]]:
+    """Páginas de varejo sintéticas cobrindo as três estratégias"""
+    rng = random.Random(seed)
+    pages = []
+    for size in (50, 2000):
+        product = {
+            "@context": "https://schema.org", "@type": "Product", "name": "Fone Bluetooth X200",
+            "brand": {"@type": "Brand", "name": "Acme"},
+            "offers": {"@type": "Offer", "price": "199.90", "priceCurrency": "BRL"},
+        }
+        pages.append((f"json_ld_{size}.html", (
+            f'<html><head><title>Fone X200 | Loja</title>'
+            f'<script type="application/ld+json">{{"@type": "BreadcrumbList"}}</script>'
+            f'<script type="application/ld+json">{json.dumps(product)}</script></head>'
+            f'<body>{_filler(rng, size)}</body></html>'
+        )))
+        pages.append((f"microdata_{size}.html", (
+            f'<html><head><title>Cafeteira | Loja</title></head><body>{_filler(rng, size)}'
+            f'<div itemscope itemtype="http://schema.org/Product">'
+            f'<h1 itemprop="name"> Cafeteira <b>Expresso</b> 15 bar </h1>'
+            f'<span itemprop="brand">Oster</span>'
+            f'<meta itemprop="price" content="899.00"><span class="price">R$ 899,00</span></div>'
+            f'</body></html>'
+        )))
+        pages.append((f"heuristic_{size}.html", (
+            f'<html><head><title>Loja Exemplo</title>'
+            f'<meta property="og:title" content="Tênis de Corrida Ultra Leve Masculino">'
+            f'<meta property="product:price:amount" content="349.99"></head>'
+            f'<body><img src="/logo.png" alt="Logo Passos"><!-- 10x de 34,99 -->'
+            f'{_filler(rng, size)}<h1>Tênis <em>Ultra</em> Leve</h1>'
+            f'<div class="product-brand"> </div><div class="vendor">Passos</div>'
+            f'<p class="sale-price">Por apenas R$ 1.349,99</p></body></html>'
+        )))
+        pages.append((f"text_scan_{size}.html", (
+            f'<html><head><title>Sem dados estruturados</title><style>.a{{width:1px}}</style></head>'
+            f'<body><div class="header">Atendimento</div>{_filler(rng, size)}'
+            f'<div class="produto"><span>Leve por €1,299.00 hoje</span></div></body></html>'
+        )))
+    return pages
+
+
+def load_corpus(directory: Path) -> List[Tuple[str, str]]:
+    pages = []
+    for path in sorted(directory.glob("*.htm*")):
+        pages.append((path.name, path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def time_engine(engine: Engine, html: str, repeat: int) -> Tuple[Dict, float]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = engine(html)
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="diretório com páginas .html salvas")
+    parser.add_argument("--save-corpus", type=Path, help="gravar o corpus sintético e sair")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.save_corpus:
+        args.save_corpus.mkdir(parents=True, exist_ok=True)
+        for name, html in synthetic_corpus():
+            (args.save_corpus / name).write_text(html, encoding="utf-8")
+        print(f"Corpus sintético gravado em {args.save_corpus}")
+        return
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    engines = {
+        "fast": fast_extract.extract_product_info,
+        "stream": streaming_extract,
+    }
+    totals = {"soup": 0.0, **{label: 0.0 for label in engines}}
+    mismatches = []
+
+    print(f"{'página':<28} {'KB':>6} {'soup':>9} {'fast':>9} {'stream':>9}")
+    for name, html in pages:
+        soup_result, soup_ms = time_engine(go.extract_product_info, html, args.repeat)
+        totals["soup"] += soup_ms
+        timings = []
+        for label, engine in engines.items():
+            result, elapsed_ms = time_engine(engine, html, args.repeat)
+            totals[label] += elapsed_ms
+            timings.append(elapsed_ms)
+            if result != soup_result:
+                mismatches.append((name, label, soup_result, result))
+        print(
+            f"{name[:28]:<28} {len(html) / 1024:>6.0f} {soup_ms:>7.2f}ms "
+            + " ".join(f"{elapsed_ms:>7.2f}ms" for elapsed_ms in timings)
+        )
+
+    print("\nMédia por página: " + ", ".join(
+        f"{label} {total / len(pages):.2f}ms" for label, total in totals.items()
+    ))
+    print(f"Resultados divergentes: {len(mismatches)}")
+    for name, label, soup_result, result in mismatches:
+        print(f"  {name} [{label}]: soup={soup_result} {label}={result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark do armazenamento vetorizado de features e da busca por similaridade
+
+Gera uma biblioteca sintética de N faixas direto no formato em disco e mede:
+montagem, tamanho dos arquivos, memória do processo (RSS), classificação de
+humor da biblioteca inteira, vizinhos mais próximos (uma consulta e um lote)
+e, para comparação, as mesmas operações em Python puro sobre dicionários
+(numa amostra, extrapoladas).
+
+Uso:
+
+    python -m benchmarks.bench_moods --tracks 500000
+"""
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import math
+import random
+import resource
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from mood.feature_store import FEATURE_COLUMNS, MOODS, FeatureStore, classify_moods, write_feature_store
+
+
+def synthetic_rows(count: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    for start in range(0, count, 65_536):
+        size = min(65_536, count - start)
+        block = rng.random((size, len(FEATURE_COLUMNS)))
+        block[:, FEATURE_COLUMNS.index("tempo")] = rng.uniform(60, 200, size)
+        block[:, FEATURE_COLUMNS.index("loudness")] = rng.uniform(-30, 0, size)
+        for offset, values in enumerate(block.tolist()):
+            yield f"{start + offset:022d}", values
+
+
+def rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(function, repeat: int = 3) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def python_mood(row: Dict[str, float]) -> str:
+    positive = row["valence"] >= 0.5
+    if row["energy"] >= 0.5:
+        return MOODS[0] if positive else MOODS[1]
+    return MOODS[3] if positive else MOODS[2]
+
+
+def python_nearest(rows: List[Dict[str, float]], query: Dict[str, float], k: int) -> List[int]:
+    distances = [
+        math.sqrt(sum((row[column] - query[column]) ** 2 for column in FEATURE_COLUMNS))
+        for row in rows
+    ]
+    return sorted(range(len(rows)), key=distances.__getitem__)[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=500_000)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=100, help="consultas no lote de kNN")
+    parser.add_argument("--sample", type=int, default=50_000, help="faixas na comparação em Python puro")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        write_feature_store(directory, args.tracks, synthetic_rows(args.tracks))
+        build_seconds = time.perf_counter() - start
+        size_mb = sum(path.stat().st_size for path in Path(directory).iterdir()) / 2 ** 20
+
+        rss_before = rss_mb()
+        store = FeatureStore(directory)
+        print(f"{len(store)} faixas, {size_mb:.1f} MB em disco, montagem {build_seconds:.2f}s")
+
+        classify_seconds = timed(store.moods)
+        print(f"humor (biblioteca inteira): {classify_seconds * 1000:9.2f} ms  {store.mood_counts()}")
+
+        query_index = random.Random(1).randrange(len(store))
+        track_id = store.ids[query_index].decode("ascii")
+        single_seconds = timed(lambda: store.similar(track_id, args.k))
+        print(f"kNN (1 consulta, k={args.k}):    {single_seconds * 1000:9.2f} ms")
+
+        queries = np.asarray(store.vectors[:args.batch])
+        batch_seconds = timed(lambda: store.nearest_indices(queries, args.k), repeat=1)
+        print(
+            f"kNN (lote de {args.batch}):        {batch_seconds * 1000:9.2f} ms  "
+            f"({batch_seconds / args.batch * 1000:.2f} ms por consulta)"
+        )
+        print(f"RSS máximo após abrir e consultar: {rss_mb():.0f} MB (antes de abrir: {rss_before:.0f} MB)")
+
+        # Python puro sobre dicionários, numa amostra
+        sample = min(args.sample, len(store))
+        rows = [dict(zip(FEATURE_COLUMNS, values)) for values in np.asarray(store.features[:sample]).tolist()]
+        scale = len(store) / sample
+        python_classify = timed(lambda: [python_mood(row) for row in rows], repeat=1) * scale
+        standardized = [
+            dict(zip(FEATURE_COLUMNS, values)) for values in np.asarray(store.vectors[:sample]).tolist()
+        ]
+        python_knn = timed(lambda: python_nearest(standardized, standardized[0], args.k), repeat=1) * scale
+        print(f"Python puro (extrapolado de {sample}): humor {python_classify * 1000:.0f} ms "
+              f"({python_classify / classify_seconds:.0f}x), kNN {python_knn * 1000:.0f} ms "
+              f"({python_knn / single_seconds:.0f}x)")
+
+        # Conferência: mesmo resultado nos dois caminhos
+        vectorized = store.moods()[:sample]
+        assert all(MOODS[code] == python_mood(row) for code, row in zip(vectorized, rows))
+        expected = python_nearest(standardized, standardized[0], args.k)
+        subset = FeatureStore(directory)
+        subset.vectors, subset.norms = subset.vectors[:sample], subset.norms[:sample]
+        subset.ids = subset.ids[:sample]
+        found = subset.nearest_indices(subset.vectors[0], args.k)[0][0].tolist()
+        assert found == expected, (found, expected)
+        assert classify_moods(np.array([np.nan]), np.array([0.9]))[0] == -1
+        print("Resultados conferidos com a implementação em Python puro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Medir o ganho dos prepared statements e do aquecimento na inicialização
+
+Compara as consultas fixas do ArtigoService executadas sem preparo contra as
+mesmas consultas preparadas na conexão, e o tempo até a primeira resposta de
+uma conexão nova com e sem o aquecimento.
+
+Uso (na raiz do projeto):
+
+    python -m benchmarks.bench_prepared --iterations 500
+"""
+import argparse
+import statistics
+import time
+
+import psycopg
+from psycopg.rows import dict_row
+
+from config import settings
+from repositories.repository import (
+    ARTIGO_BY_ID_QUERY,
+    ARTIGOS_KEYSET_QUERY,
+    ARTIGOS_OFFSET_QUERY,
+    ARTIGOS_WITH_AUTHORS_QUERY,
+)
+from repositories.search import TEXT_QUERY
+
+
+def statements(sample: dict) -> dict:
+    return {
+        "por id": (ARTIGO_BY_ID_QUERY, (sample["id_artigo"],)),
+        "listagem": (ARTIGOS_OFFSET_QUERY, (100, 0)),
+        "keyset": (ARTIGOS_KEYSET_QUERY, (sample["titulo"], sample["id_artigo"], 100)),
+        "com autores": (ARTIGOS_WITH_AUTHORS_QUERY, ([sample["id_artigo"]],)),
+        "busca": (TEXT_QUERY, ("dados", "dados", 20, 0)),
+    }
+
+
+def measure(cursor, query, params, iterations: int, prepare) -> dict:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        cursor.execute(query, params, prepare=prepare)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": statistics.fmean(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def first_request(dsn: str, query: str, params: tuple, warmup: dict) -> float:
+    """Conectar, (opcionalmente) aquecer e medir a primeira consulta de uma requisição"""
+    with psycopg.connect(dsn, row_factory=dict_row, autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            for warm_query, warm_params in warmup.values():
+                cursor.execute(warm_query, warm_params, prepare=True)
+                cursor.fetchall()
+            start = time.perf_counter()
+            cursor.execute(query, params, prepare=True if warmup else None)
+            cursor.fetchall()
+            return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--connections", type=int, default=10, help="conexões novas na medição a frio")
+    parser.add_argument("--dsn", default=settings.database_url)
+    args = parser.parse_args()
+
+    with psycopg.connect(args.dsn, row_factory=dict_row, autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(ARTIGOS_OFFSET_QUERY, (100, 0))
+            rows = cursor.fetchall()
+            sample = rows[-1] if rows else {"id_artigo": 1, "titulo": ""}
+            queries = statements(sample)
+
+            print(f"{args.iterations} execuções por consulta")
+            for label, (query, params) in queries.items():
+                # prepare=False: plano refeito a cada execução
+                plain = measure(cursor, query, params, args.iterations, prepare=False)
+                cursor.execute(query, params, prepare=True)
+                cursor.fetchall()
+                prepared = measure(cursor, query, params, args.iterations, prepare=True)
+                print(
+                    f"{label:<12} sem preparo: {plain['mean_ms']:>7.3f}ms (p95 {plain['p95_ms']:>7.3f}ms)  "
+                    f"preparada: {prepared['mean_ms']:>7.3f}ms (p95 {prepared['p95_ms']:>7.3f}ms)  "
+                    f"ganho: {plain['mean_ms'] / prepared['mean_ms']:>5.2f}x"
+                )
+
+    query, params = queries["com autores"]
+    for label, warmup in (("frio", {}), ("aquecido", queries)):
+        timings = [first_request(args.dsn, query, params, warmup) for _ in range(args.connections)]
+        print(f"primeira consulta {label:<9} média: {statistics.fmean(timings):>7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
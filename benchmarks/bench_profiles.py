@@ -0,0 +1,135 @@
+"""Custo por página da extração com e sem perfis por domínio
+
+Gera páginas sintéticas de alguns "domínios" com marcação estável (cada um
+vencendo por uma estratégia diferente), mede o tempo por página do motor
+lxml completo e do motor guiado por perfil (aprendido na primeira página de
+cada domínio) e confere se os resultados coincidem. No fim, muda o template
+de um domínio para mostrar a invalidação e o reaprendizado.
+
+Uso:
+
+    python -m benchmarks.bench_profiles --pages 200 --size 1500
+    python -m benchmarks.bench_profiles --soup   # inclui go.py (BeautifulSoup)
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+import go
+from benchmarks.bench_extraction import _filler
+from scraping import fast_extract
+from scraping.profiles import ProfileRegistry
+
+Page = Tuple[str, str]
+
+
+def _heuristic_classes(rng: random.Random, index: int, size: int) -> str:
+    return (
+        f'<html><head><title>Loja Classes</title></head><body>'
+        f'<img src="/logo.png" alt="Logo Classes">{_filler(rng, size)}'
+        f'<div class="product-title">Notebook Modelo {index} {rng.randint(100, 999)}GB</div>'
+        f'<span class="brand">Marca {index % 7}</span>'
+        f'<p class="price">R$ {rng.randint(1000, 9999)},{rng.randint(10, 99)}</p></body></html>'
+    )
+
+
+def _heuristic_text(rng: random.Random, index: int, size: int) -> str:
+    return (
+        f'<html><head><title>Produto {index} | Bazar</title>'
+        f'<meta property="og:title" content="Bazar - Luminária Articulada {index} Cores"></head>'
+        f'<body><img src="/l.png" alt="Bazar LOGO">{_filler(rng, size)}'
+        f'<section><p>Por apenas R$ {rng.randint(10, 99)},{rng.randint(10, 99)} à vista</p>'
+        f'</section></body></html>'
+    )
+
+
+def _json_ld(rng: random.Random, index: int, size: int) -> str:
+    product = {
+        "@context": "https://schema.org", "@type": "Product", "name": f"Fone {index}",
+        "brand": {"@type": "Brand", "name": "Acme"},
+        "offers": {"@type": "Offer", "price": f"{rng.randint(50, 500)}.90"},
+    }
+    return (
+        f'<html><head><title>Fone | Loja</title>'
+        f'<script type="application/ld+json">{json.dumps(product)}</script></head>'
+        f'<body>{_filler(rng, size)}</body></html>'
+    )
+
+
+def _microdata(rng: random.Random, index: int, size: int) -> str:
+    return (
+        f'<html><head><title>Cafeteira | Loja</title></head><body>{_filler(rng, size)}'
+        f'<div itemscope itemtype="http://schema.org/Product">'
+        f'<h1 itemprop="name">Cafeteira {index}</h1><span itemprop="brand">Oster</span>'
+        f'<meta itemprop="price" content="{rng.randint(100, 999)}.00"></div></body></html>'
+    )
+
+
+TEMPLATES: Dict[str, Callable[[random.Random, int, int], str]] = {
+    "classes.example": _heuristic_classes,
+    "texto.example": _heuristic_text,
+    "jsonld.example": _json_ld,
+    "microdata.example": _microdata,
+}
+
+
+def domain_corpus(pages: int, size: int, seed: int = 11) -> List[Page]:
+    """`pages` páginas por domínio, intercaladas como numa fila de scraping"""
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(pages):
+        for domain, template in TEMPLATES.items():
+            corpus.append((f"https://{domain}/p/{index}", template(rng, index, size)))
+    return corpus
+
+
+def time_per_page(corpus: List[Page], extract: Callable[[str, str], Dict]) -> Tuple[float, List[Dict]]:
+    results = []
+    samples = []
+    for url, html in corpus:
+        start = time.perf_counter()
+        results.append(extract(url, html))
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100, help="páginas por domínio")
+    parser.add_argument("--size", type=int, default=1000, help="blocos de conteúdo por página")
+    parser.add_argument("--soup", action="store_true", help="medir também go.py (lento)")
+    args = parser.parse_args()
+
+    corpus = domain_corpus(args.pages, args.size)
+    columns = {"fast": lambda url, html: fast_extract.extract_product_info(html)}
+    if args.soup:
+        columns["soup"] = lambda url, html: go.extract_product_info(html)
+    registry = ProfileRegistry()
+    columns["fast+perfil"] = registry.extract
+
+    print(f"{len(corpus)} páginas, {len(TEMPLATES)} domínios, {args.size} blocos por página")
+    baseline = None
+    for name, extract in columns.items():
+        median_ms, results = time_per_page(corpus, extract)
+        line = f"{name:>12}: {median_ms:8.3f} ms/página (mediana)"
+        if baseline is None:
+            baseline = (median_ms, results)
+        else:
+            divergent = sum(1 for a, b in zip(baseline[1], results) if a != b)
+            line += f"  {baseline[0] / median_ms:5.1f}x  divergências: {divergent}"
+        print(line)
+    print(f"perfis: {registry.stats}")
+
+    # Mudança de template em um domínio: o perfil deixa de casar e é reaprendido
+    TEMPLATES["classes.example"] = _heuristic_text
+    changed = [(url, html) for url, html in domain_corpus(3, args.size, seed=12) if "classes" in url]
+    for url, html in changed:
+        assert registry.extract(url, html) == fast_extract.extract_product_info(html)
+    print(f"após mudar o template de classes.example: {registry.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Comparar a busca ILIKE antiga com a busca textual ranqueada
+
+Uso (na raiz do projeto, com as migrações aplicadas):
+
+    python -m benchmarks.bench_search --iterations 50 "redes neurais" "educação" 10.1590/abc
+"""
+import argparse
+import statistics
+import time
+
+import psycopg
+from psycopg.rows import dict_row
+
+from config import settings
+from repositories.search import DOI_QUERY, normalize_doi, text_query
+
+# Consulta usada por ArtigoService.search_artigos antes da busca textual
+ILIKE_QUERY = """
+    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
+    FROM Artigos
+    WHERE titulo ILIKE %s OR DOI ILIKE %s OR publicadora ILIKE %s
+    ORDER BY titulo
+    LIMIT %s
+"""
+
+DEFAULT_TERMS = ["dados", "educação", "saude publica", "machine learning"]
+
+
+def run_ilike(cursor, term: str, limit: int) -> int:
+    param = f"%{term}%"
+    cursor.execute(ILIKE_QUERY, (param, param, param, limit))
+    return len(cursor.fetchall())
+
+
+def run_fts(cursor, term: str, limit: int) -> int:
+    doi = normalize_doi(term)
+    if doi:
+        cursor.execute(DOI_QUERY, (doi,))
+        results = cursor.fetchall()
+        if results:
+            return len(results[:limit])
+    cursor.execute(*text_query(term, 0, limit))
+    return len(cursor.fetchall())
+
+
+def measure(fn, cursor, term: str, limit: int, iterations: int) -> dict:
+    timings = []
+    rows = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        rows = fn(cursor, term, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "rows": rows,
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("terms", nargs="*", default=DEFAULT_TERMS)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--dsn", default=settings.database_url)
+    args = parser.parse_args()
+
+    with psycopg.connect(args.dsn, row_factory=dict_row, autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT count(*) AS total FROM Artigos")
+            print(f"Artigos: {cursor.fetchone()['total']}")
+            print(f"{'termo':<24} {'modo':<6} {'linhas':>6} {'média':>9} {'p50':>9} {'p95':>9}")
+            for term in args.terms:
+                for label, fn in (("ilike", run_ilike), ("fts", run_fts)):
+                    # Uma execução de aquecimento para não medir cache frio
+                    fn(cursor, term, args.limit)
+                    stats = measure(fn, cursor, term, args.limit, args.iterations)
+                    print(
+                        f"{term[:24]:<24} {label:<6} {stats['rows']:>6} "
+                        f"{stats['mean_ms']:>7.2f}ms {stats['p50_ms']:>7.2f}ms {stats['p95_ms']:>7.2f}ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
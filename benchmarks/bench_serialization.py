@@ -0,0 +1,82 @@
+"""Comparar o custo de CPU da serialização das listas de artigos
+
+O caminho via Pydantic reproduz o que acontecia em list/search: um modelo por
+linha no serviço e, na rota, validação e serialização de novo contra
+`response_model=List[ArtigoResponse]`. O caminho direto é o ArtigoListResponse.
+Não precisa de banco; as linhas são sintéticas, no formato do psycopg.
+
+Uso (na raiz do projeto):
+
+    python -m benchmarks.bench_serialization --rows 100 200 --iterations 2000
+"""
+from datetime import date, timedelta
+from typing import List
+import argparse
+import json
+import random
+import time
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from models.model import ArtigoResponse
+from routes.responses import ArtigoListResponse, orjson
+
+
+def synthetic_rows(count: int, seed: int = 42) -> List[dict]:
+    rng = random.Random(seed)
+    words = ["análise", "dados", "redes", "neurais", "educação", "saúde", "pública", "modelos", "aprendizado"]
+    return [
+        {
+            "id_artigo": 100_000 + i,
+            "titulo": " ".join(rng.choices(words, k=rng.randint(3, 9))).capitalize(),
+            "doi": f"10.{rng.randint(1000, 99999)}/{rng.getrandbits(40):x}" if rng.random() < 0.8 else None,
+            "publicadora": rng.choice(["SciELO", "Elsevier", "Springer", "IEEE", None]),
+            "data_publicacao": date(2000, 1, 1) + timedelta(days=rng.randint(0, 9000)),
+        }
+        for i in range(count)
+    ]
+
+
+def pydantic_path(rows: List[dict], adapter: TypeAdapter) -> bytes:
+    # Serviço: um modelo por linha
+    models = [ArtigoResponse(**row, DOI=row["doi"]) for row in rows]
+    # Rota: FastAPI converte de volta, valida contra o response_model e serializa
+    validated = adapter.validate_python([model.model_dump() for model in models])
+    return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+
+def direct_path(rows: List[dict]) -> bytes:
+    return ArtigoListResponse(rows).body
+
+
+def cpu_per_request(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 100, 200])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[ArtigoResponse])
+    print(f"codificador: {'orjson' if orjson else 'json (biblioteca padrão)'}, {args.iterations} requisições")
+    for count in args.rows:
+        rows = synthetic_rows(count)
+        if json.loads(pydantic_path(rows, adapter)) != json.loads(direct_path(rows)):
+            raise SystemExit(f"Os dois caminhos divergem para {count} linhas")
+
+        slow = cpu_per_request(lambda: pydantic_path(rows, adapter), args.iterations)
+        fast = cpu_per_request(lambda: direct_path(rows), args.iterations)
+        print(
+            f"{count:>4} linhas  pydantic: {slow:>8.1f}µs  direto: {fast:>7.1f}µs  "
+            f"ganho: {slow / fast:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Servidor HTTP local que serve páginas de produto de um diretório
+
+Substitui as lojas reais ao testar o pipeline de extração. Responde com
+ETag e Last-Modified, atende requisições condicionais (304) e pode simular
+latência.
+
+Uso:
+
+    python -m benchmarks.fixture_server --pages paginas/ --port 8765 --delay 0.05
+    # URLs: http://127.0.0.1:8765/<arquivo>.html
+"""
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import argparse
+import hashlib
+import threading
+import time
+
+from benchmarks.bench_extraction import load_corpus, synthetic_corpus
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, pages: Dict[str, bytes], delay: float = 0.0):
+        super().__init__(address, FixtureHandler)
+        self.delay = delay
+        self.requests_served = 0
+        self.modified_at = time.time()
+        self.pages: Dict[str, Tuple[bytes, str]] = {}
+        for name, body in pages.items():
+            self.set_page(name, body)
+
+    def set_page(self, name: str, body: bytes) -> None:
+        """Adicionar ou alterar uma página (gera novo ETag)"""
+        self.pages["/" + name.lstrip("/")] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        self.modified_at = time.time()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+
+    def do_GET(self):
+        self.server.requests_served += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        page = self.server.pages.get(self.path.split("?")[0])
+        if page is None:
+            self.send_error(404)
+            return
+
+        body, etag = page
+        if self._not_modified(etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(self.server.modified_at, usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag: str) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.server.modified_at) <= since
+        return False
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(
+    pages: Optional[Dict[str, bytes]] = None, port: int = 0, delay: float = 0.0
+) -> FixtureServer:
+    """Iniciar o servidor em uma thread; porta 0 escolhe uma porta livre"""
+    if pages is None:
+        pages = {name: html.encode("utf-8") for name, html in synthetic_corpus()}
+    server = FixtureServer(("127.0.0.1", port), pages, delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=Path, help="diretório de páginas (padrão: corpus sintético)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="latência simulada em segundos")
+    args = parser.parse_args()
+
+    pages = None
+    if args.pages:
+        pages = {name: html.encode("utf-8") for name, html in load_corpus(args.pages)}
+    server = start_fixture_server(pages, args.port, args.delay)
+    print(f"Servindo {len(server.pages)} páginas em {server.base_url}")
+    for path in sorted(server.pages):
+        print(f"  {server.base_url}{path}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
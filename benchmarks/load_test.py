@@ -0,0 +1,290 @@
+"""Teste de carga reproduzível da API de artigos
+
+Popula o Postgres local com artigos e autores sintéticos, dispara cada
+operação da API com concorrência controlada e grava vazão e latências
+(p50/p95/p99) em JSON para comparação entre execuções.
+
+Uso (com a API rodando):
+
+    python -m benchmarks.load_test --seed-artigos 100000 --seed-autores 20000
+    python -m benchmarks.load_test --requests 2000 --concurrency 32 --compare benchmarks/results/anterior.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import psycopg
+
+from config import settings
+
+ARTIGOS_PATH = "/api/v1/artigos/"
+RESULTS_DIR = Path(__file__).parent / "results"
+SEARCH_TERMS = ["dados", "educação", "saúde", "redes", "ensino", "clima", "genética", "economia"]
+WORDS = [
+    "análise", "dados", "educação", "saúde", "pública", "redes", "neurais", "ensino",
+    "clima", "genética", "economia", "política", "brasileira", "estudo", "modelo", "sistema",
+]
+
+
+def seed_database(dsn: str, artigos: int, autores: int, autores_por_artigo: int, seed: int) -> None:
+    """Inserir artigos, autores e autorias sintéticos em operações por conjunto"""
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT setseed(%s)", (seed / 2**31,))
+            cursor.execute("SELECT coalesce(max(id_artigo), 0) FROM Artigos")
+            last_id = cursor.fetchone()[0]
+            cursor.execute(
+                "INSERT INTO Autores (nome) SELECT 'Autor ' || g FROM generate_series(1, %s) g",
+                (autores,)
+            )
+            cursor.execute(
+                """
+                WITH titulos AS (
+                    INSERT INTO Titulo (tipo_midia)
+                    SELECT 'artigo' FROM generate_series(1, %(n)s)
+                    RETURNING id_titulo
+                )
+                INSERT INTO Artigos (id_artigo, titulo, DOI, publicadora, data_publicacao)
+                SELECT id_titulo,
+                    initcap((%(words)s::text[])[1 + floor(random() * %(w)s)::int] || ' ' ||
+                        (%(words)s::text[])[1 + floor(random() * %(w)s)::int] || ' ' ||
+                        (%(words)s::text[])[1 + floor(random() * %(w)s)::int]) || ' ' || id_titulo,
+                    '10.5555/carga.' || id_titulo,
+                    (ARRAY['SciELO', 'Elsevier', 'Springer', 'USP', 'Unicamp'])[1 + floor(random() * 5)::int],
+                    DATE '1990-01-01' + floor(random() * 12000)::int
+                FROM titulos
+                """,
+                {"n": artigos, "words": WORDS, "w": len(WORDS)}
+            )
+            cursor.execute(
+                """
+                INSERT INTO Autorias (id_titulo, id_autor)
+                SELECT a.id_artigo, au.ids[1 + floor(random() * cardinality(au.ids))::int]
+                FROM Artigos a
+                CROSS JOIN generate_series(1, %s)
+                CROSS JOIN (SELECT array_agg(id_autor) AS ids FROM Autores) au
+                WHERE a.id_artigo > %s
+                ON CONFLICT DO NOTHING
+                """,
+                (autores_por_artigo, last_id)
+            )
+    print(f"Banco populado: {artigos} artigos, {autores} autores")
+
+
+def fake_artigo(rng: random.Random) -> dict:
+    return {
+        "titulo": " ".join(rng.choices(WORDS, k=4)).capitalize(),
+        "DOI": f"10.5555/lt.{rng.getrandbits(48):x}",
+        "publicadora": rng.choice(["SciELO", "Elsevier", "Springer"]),
+        "data_publicacao": f"{rng.randint(1990, 2024)}-{rng.randint(1, 12):02d}-01",
+    }
+
+
+class WorkerState:
+    """Estado próprio de cada worker: sorteios e posição na paginação"""
+
+    def __init__(self, seed: int, scenario: str, worker: int):
+        # Semente derivada: a sequência de cada worker não depende dos demais
+        self.rng = random.Random(f"{seed}:{scenario}:{worker}")
+        self.cursor: Optional[str] = None
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    name: str,
+    request: Callable[[int, WorkerState], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    """Executar `total` requisições com no máximo `concurrency` simultâneas"""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async def worker(number: int):
+        state = WorkerState(seed, name, number)
+        # Índices fixos por worker, em vez de uma fila compartilhada, para que
+        # o que cada um envia não dependa da ordem de escalonamento
+        for index in range(number, total, concurrency):
+            start = time.perf_counter()
+            try:
+                response = await request(index, state)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    result = {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "errors": errors,
+        "statuses": statuses,
+    }
+    print(
+        f"{name:<8} {result['throughput_rps']:>8.1f} req/s  p50 {result['p50_ms']:>7.2f}ms  "
+        f"p95 {result['p95_ms']:>7.2f}ms  p99 {result['p99_ms']:>7.2f}ms  erros {errors}"
+    )
+    return result
+
+
+async def run_load(args) -> dict:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        response = await client.get(ARTIGOS_PATH, params={"limit": 100})
+        response.raise_for_status()
+        existing_ids = [artigo["id_artigo"] for artigo in response.json()]
+        if not existing_ids:
+            raise SystemExit("Nenhum artigo encontrado; rode antes com --seed-artigos")
+
+        # Por índice da requisição, não por ordem de chegada das respostas
+        created: Dict[int, int] = {}
+        created_ids: List[int] = []
+        payloads = [fake_artigo(rng) for _ in range(args.requests)]
+
+        async def create(index, state):
+            response = await client.post(ARTIGOS_PATH, json=payloads[index])
+            if response.status_code == 201:
+                created[index] = response.json()["id_artigo"]
+            return response
+
+        async def get(index, state):
+            return await client.get(f"{ARTIGOS_PATH}{state.rng.choice(existing_ids)}")
+
+        async def list_page(index, state):
+            # Cada worker percorre o catálogo por cursor; volta ao início ao chegar no fim
+            params = {"limit": 100, **({"cursor": state.cursor} if state.cursor else {})}
+            response = await client.get(ARTIGOS_PATH, params=params)
+            state.cursor = response.headers.get("X-Next-Cursor")
+            return response
+
+        async def search(index, state):
+            return await client.get(f"{ARTIGOS_PATH}search/", params={"q": state.rng.choice(SEARCH_TERMS)})
+
+        async def update(index, state):
+            artigo_id = created_ids[index % len(created_ids)]
+            return await client.put(f"{ARTIGOS_PATH}{artigo_id}", json={"publicadora": "Atualizada"})
+
+        async def delete(index, state):
+            return await client.delete(f"{ARTIGOS_PATH}{created_ids[index]}")
+
+        scenarios = {
+            "create": create,
+            "get": get,
+            "list": list_page,
+            "search": search,
+            "update": update,
+            "delete": delete,
+        }
+        results = {}
+        for name in args.scenarios:
+            total = args.requests
+            created_ids[:] = [created[index] for index in sorted(created)]
+            if name in ("update", "delete"):
+                if not created_ids:
+                    print(f"{name:<8} ignorado: nenhum artigo criado nesta execução")
+                    continue
+                if name == "delete":
+                    total = min(total, len(created_ids))
+            results[name] = await run_scenario(name, scenarios[name], total, args.concurrency, args.seed)
+        return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(current: dict, previous_path: Path) -> None:
+    previous = json.loads(previous_path.read_text(encoding="utf-8"))["scenarios"]
+    print(f"\nComparação com {previous_path}:")
+    for name, result in current.items():
+        if name not in previous:
+            continue
+        before = previous[name]
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if before[metric]:
+                change = (result[metric] - before[metric]) / before[metric] * 100
+                print(f"  {name:<8} {metric:<15} {before[metric]:>9.2f} -> {result[metric]:>9.2f} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--dsn", default=settings.database_url)
+    parser.add_argument("--seed-artigos", type=int, default=0, help="artigos a inserir antes da carga")
+    parser.add_argument("--seed-autores", type=int, default=1000)
+    parser.add_argument("--autores-por-artigo", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=1000, help="requisições por cenário")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42, help="semente dos dados e da carga")
+    parser.add_argument(
+        "--scenarios", nargs="+", default=["create", "get", "list", "search", "update", "delete"],
+        choices=["create", "get", "list", "search", "update", "delete"]
+    )
+    parser.add_argument("--output", type=Path, help="arquivo JSON de saída (padrão: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="resultado anterior para comparar")
+    args = parser.parse_args()
+
+    if args.seed_artigos:
+        seed_database(args.dsn, args.seed_artigos, args.seed_autores, args.autores_por_artigo, args.seed)
+
+    started_at = datetime.now(timezone.utc)
+    results = asyncio.run(run_load(args))
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "url": args.url,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    output = args.output or RESULTS_DIR / f"load_{started_at:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Stub local da Web API do Spotify para testar a ingestão da biblioteca
+
+Implementa o necessário de /v1/me, /v1/me/tracks, /v1/audio-features e
+/v1/artists sobre uma biblioteca sintética, com os mesmos limites por
+requisição da API real (400 acima deles), latência simulada e, se pedido,
+respostas 429 com Retry-After.
+
+Uso:
+
+    python -m benchmarks.spotify_stub --tracks 10000 --port 8766 --delay 0.05
+    python -m integrations.spotify_integration --base-url http://127.0.0.1:8766/v1 --token stub
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import json
+import random
+import threading
+import time
+
+LIMITS = {"/v1/me/tracks": 50, "/v1/audio-features": 100, "/v1/artists": 50}
+
+
+def synthetic_library(size: int, seed: int = 3) -> Dict[str, List[Dict]]:
+    """Faixas salvas (mais recente primeiro), audio features e artistas"""
+    rng = random.Random(seed)
+    artists = [
+        {
+            "id": f"artist{index:06d}", "name": f"Artista {index}", "type": "artist",
+            "genres": rng.sample(["mpb", "samba", "rock", "indie", "jazz", "funk", "pop"], 2),
+            "popularity": rng.randint(0, 100), "followers": {"total": rng.randint(0, 10 ** 6)},
+        }
+        for index in range(max(1, size // 5))
+    ]
+    newest = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    items = []
+    features = {}
+    for index in range(size):
+        track_id = f"track{index:07d}"
+        items.append({
+            "added_at": (newest - timedelta(hours=index)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "track": {
+                "id": track_id, "name": f"Faixa {index}", "type": "track",
+                "album": {"name": f"Álbum {index // 10}"},
+                "artists": [
+                    {"id": artist["id"], "name": artist["name"]}
+                    for artist in rng.sample(artists, min(2, len(artists)))
+                ],
+                "duration_ms": rng.randint(90_000, 420_000), "popularity": rng.randint(0, 100),
+                "explicit": rng.random() < 0.1,
+            },
+        })
+        features[track_id] = random_features(rng, track_id)
+    return {"items": items, "features": features, "artists": {artist["id"]: artist for artist in artists}}
+
+
+def random_features(rng: random.Random, track_id: str) -> Dict:
+    return {
+        "id": track_id, "type": "audio_features",
+        "danceability": rng.random(), "energy": rng.random(), "valence": rng.random(),
+        "tempo": rng.uniform(60, 200), "acousticness": rng.random(),
+        "instrumentalness": rng.random(), "liveness": rng.random(), "speechiness": rng.random(),
+        "loudness": rng.uniform(-30, 0), "mode": rng.randint(0, 1), "key": rng.randint(0, 11),
+        "time_signature": 4,
+    }
+
+
+class SpotifyStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, library: Dict, delay: float = 0.0, rate_limit_every: int = 0):
+        super().__init__(address, SpotifyStubHandler)
+        self.library = library
+        self.delay = delay
+        self.rate_limit_every = rate_limit_every
+        self.user_id = "stub-user"
+        self.requests = Counter()
+        self._served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def should_rate_limit(self) -> bool:
+        with self._lock:
+            self._served += 1
+            return bool(self.rate_limit_every) and self._served % self.rate_limit_every == 0
+
+
+class SpotifyStubHandler(BaseHTTPRequestHandler):
+    server: SpotifyStub
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.requests[url.path] += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send(401, {"error": {"status": 401, "message": "No token provided"}})
+        if self.server.should_rate_limit():
+            return self._send(429, {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                              {"Retry-After": "0"})
+
+        handler = {
+            "/v1/me": self._me,
+            "/v1/me/tracks": self._saved_tracks,
+            "/v1/audio-features": self._by_ids("features", "audio_features"),
+            "/v1/artists": self._by_ids("artists", "artists"),
+        }.get(url.path)
+        if handler is None:
+            return self._send(404, {"error": {"status": 404, "message": "Service not found"}})
+
+        limit = LIMITS.get(url.path)
+        requested = int(params.get("limit", 20)) if url.path == "/v1/me/tracks" else len(
+            [item for item in params.get("ids", "").split(",") if item]
+        )
+        if limit and requested > limit:
+            return self._send(400, {"error": {"status": 400, "message": "Invalid limit"}})
+        self._send(200, handler(params))
+
+    def _me(self, params: Dict) -> Dict:
+        return {"id": self.server.user_id, "display_name": "Stub"}
+
+    def _saved_tracks(self, params: Dict) -> Dict:
+        items = self.server.library["items"]
+        limit = int(params.get("limit", 20))
+        offset = int(params.get("offset", 0))
+        next_url = None
+        if offset + limit < len(items):
+            next_url = f"{self.server.base_url}/me/tracks?offset={offset + limit}&limit={limit}"
+        return {
+            "href": self.path, "items": items[offset:offset + limit], "limit": limit,
+            "offset": offset, "total": len(items), "next": next_url,
+        }
+
+    def _by_ids(self, collection: str, key: str):
+        def handle(params: Dict) -> Dict:
+            objects = self.server.library[collection]
+            ids = [item for item in params.get("ids", "").split(",") if item]
+            return {key: [objects.get(item_id) for item_id in ids]}
+        return handle
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_spotify_stub(
+    tracks: int = 1000, port: int = 0, delay: float = 0.0, rate_limit_every: int = 0
+) -> SpotifyStub:
+    """Iniciar o stub em uma thread; porta 0 escolhe uma porta livre"""
+    server = SpotifyStub(("127.0.0.1", port), synthetic_library(tracks), delay, rate_limit_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=1000, help="faixas na biblioteca sintética")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.0, help="latência simulada em segundos")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="responder 429 a cada N requisições")
+    args = parser.parse_args()
+
+    server = start_spotify_stub(args.tracks, args.port, args.delay, args.rate_limit_every)
+    print(f"Stub da Web API do Spotify com {args.tracks} faixas em {server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
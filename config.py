@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,13 +8,80 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "onixlibrary"
     DATABASE_USER: str = "super_user"
     DATABASE_PASSWORD: str = "carimboatrasado"
+
+    # Pool de conexões
+    DATABASE_POOL_MIN_SIZE: int = 2
+    DATABASE_POOL_MAX_SIZE: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0  # segundos aguardando uma conexão livre
+    DATABASE_POOL_MAX_IDLE: float = 300.0  # conexões ociosas acima do mínimo são fechadas
+    DATABASE_POOL_MAX_LIFETIME: float = 3600.0  # conexões são recicladas após esse tempo
+    # Execuções de uma mesma consulta antes de prepará-la na conexão (None desativa, ex.: pgbouncer)
+    DATABASE_PREPARE_THRESHOLD: Optional[int] = 5
+
+    # Inicialização
+    STARTUP_WARMUP: bool = False  # preparar consultas e pré-carregar o cache antes de aceitar requisições
+    ARTIGO_WARMUP_CACHE_SIZE: int = 1000  # artigos pré-carregados no cache (0 só prepara as consultas)
+
+    # Cache de artigos
+    ARTIGO_CACHE_MAX_SIZE: int = 10000  # 0 desativa o cache em memória
+    ARTIGO_CACHE_TTL: float = 300.0
+    ARTIGO_CACHE_REDIS_URL: Optional[str] = None  # compartilha o cache entre workers
+    # ETags em memória para responder 304 (0 desativa). Só vale com um worker e sem Redis:
+    # nos outros casos o ETag vem do cache compartilhado ou do banco
+    ARTIGO_VALIDATOR_CACHE_SIZE: int = 50000
+    ARTIGO_SINGLE_FLIGHT: bool = True  # leituras idênticas simultâneas compartilham uma consulta
+    ARTIGO_CACHE_CONTROL: str = "no-cache"  # clientes revalidam com If-None-Match a cada leitura
+
+    # Importação em lote
+    ARTIGO_BULK_CHUNK_SIZE: int = 1000  # linhas validadas e inseridas por transação
+
+    # Materialized view do estoque: intervalo mínimo entre atualizações (None desativa)
+    ESTOQUE_VIEW_REFRESH_INTERVAL: Optional[float] = 30.0
+
+    # Autocompletar: índice de prefixos em memória, carregado na inicialização
+    ARTIGO_AUTOCOMPLETE: bool = True
+    ARTIGO_AUTOCOMPLETE_MAX_LIMIT: int = 50
+    # Escritas de outros processos (workers, migrações, psql) aparecem nas sugestões em até
+    # esse intervalo mais a duração de uma recarga (None: só as escritas deste processo)
+    ARTIGO_AUTOCOMPLETE_REFRESH_INTERVAL: Optional[float] = 300.0
+
+    # Busca em lote
+    ARTIGO_BATCH_MAX_IDS: int = 200
+
+    # Exportação
+    ARTIGO_EXPORT_BATCH_SIZE: int = 2000  # linhas buscadas do cursor e escritas por vez
     
     # API
+    WEB_CONCURRENCY: int = 1  # processos da API (mesma variável lida pelo uvicorn e gunicorn)
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Biblioteca Onix"
     VERSION: str = "1.0.0"
     DESCRIPTION: str = "API para gerenciamento de biblioteca e empréstimos de livros"
     
+    # Spotify
+    SPOTIFY_API_URL: str = "https://api.spotify.com/v1"
+    SPOTIFY_CONCURRENCY: int = 8  # requisições simultâneas à Web API
+    SPOTIFY_RATE_LIMIT: Optional[float] = 10.0  # requisições por segundo (None desativa o limitador)
+    SPOTIFY_RATE_BURST: int = 20
+    SPOTIFY_TOKEN_CACHE: str = ".spotify_token_cache"  # compartilhado entre processos
+    SPOTIFY_LIBRARY_DB: str = "spotify_library.sqlite"
+    SPOTIFY_RECONCILE_INTERVAL: float = 7 * 24 * 3600.0  # listagem completa para achar remoções
+    SPOTIFY_FEATURE_STORE: str = "spotify_features"  # diretório dos arrays de audio features
+
+    # Controle de admissão: acima dos limites, 503 com Retry-After em vez de acumular requisições
+    ADMISSION_CONTROL: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 64  # soma de todas as classes
+    # Menor prioridade é atendida primeiro; timeout é a espera máxima na fila, em segundos
+    ADMISSION_LIMITS: dict[str, dict[str, float]] = {
+        "read": {"priority": 0, "concurrency": 48, "queue": 256, "timeout": 2.0},
+        "write": {"priority": 1, "concurrency": 16, "queue": 64, "timeout": 5.0},
+        "search": {"priority": 2, "concurrency": 8, "queue": 32, "timeout": 1.0},
+        "bulk": {"priority": 3, "concurrency": 2, "queue": 4, "timeout": 0.5},
+    }
+
+    # Monitoramento
+    SLOW_REQUEST_THRESHOLD_MS: Optional[float] = None  # registra requisições acima desse tempo
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = [
         "http://localhost:3000", 
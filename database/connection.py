@@ -0,0 +1,118 @@
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence, Tuple
+import logging
+import time
+
+from psycopg import AsyncConnection, AsyncCursor, AsyncServerCursor
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from config import settings
+from monitoring.metrics import observe_query
+
+logger = logging.getLogger(__name__)
+
+
+class _InstrumentedExecute:
+    """Registra duração, linhas e erros de cada execute() nas métricas"""
+
+    async def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await super().execute(query, params, **kwargs)
+            failed = False
+            return result
+        finally:
+            observe_query(query, time.perf_counter() - start, max(self.rowcount, 0), failed)
+
+
+class InstrumentedCursor(_InstrumentedExecute, AsyncCursor):
+    pass
+
+
+class InstrumentedServerCursor(_InstrumentedExecute, AsyncServerCursor):
+    pass
+
+
+async def _configure_connection(conn: AsyncConnection) -> None:
+    conn.server_cursor_factory = InstrumentedServerCursor
+    # Consultas repetidas passam a usar um prepared statement da própria conexão
+    conn.prepare_threshold = settings.DATABASE_PREPARE_THRESHOLD
+
+
+class Database:
+    """Pool assíncrono de conexões com o Postgres"""
+
+    def __init__(self, conninfo: Optional[str] = None):
+        self.pool = AsyncConnectionPool(
+            conninfo or settings.database_url,
+            min_size=settings.DATABASE_POOL_MIN_SIZE,
+            max_size=settings.DATABASE_POOL_MAX_SIZE,
+            timeout=settings.DATABASE_POOL_TIMEOUT,
+            max_idle=settings.DATABASE_POOL_MAX_IDLE,
+            max_lifetime=settings.DATABASE_POOL_MAX_LIFETIME,
+            kwargs={"row_factory": dict_row, "cursor_factory": InstrumentedCursor},
+            configure=_configure_connection,
+            open=False,
+        )
+
+    async def open(self) -> None:
+        """Abrir o pool e aguardar as conexões mínimas"""
+        await self.pool.open(wait=True, timeout=settings.DATABASE_POOL_TIMEOUT)
+        logger.info(
+            f"Pool de conexões aberto (min={self.pool.min_size}, max={self.pool.max_size})"
+        )
+
+    async def close(self) -> None:
+        """Fechar o pool e todas as conexões"""
+        await self.pool.close()
+        logger.info("Pool de conexões fechado")
+
+    @asynccontextmanager
+    async def cursor(self, name: Optional[str] = None) -> AsyncIterator[AsyncCursor]:
+        """Cursor em uma conexão do pool; commit ao sair, rollback em caso de erro
+
+        Com `name`, o cursor é do lado do servidor e as linhas são buscadas em lotes.
+        """
+        async with self.pool.connection() as conn:
+            async with conn.cursor(name=name) if name else conn.cursor() as cursor:
+                yield cursor
+
+    async def prime(self, statements: Sequence[Tuple[str, tuple]]) -> int:
+        """Preparar `statements` em cada uma das conexões mínimas do pool
+
+        As conexões são retiradas todas ao mesmo tempo, para que cada uma seja
+        visitada uma vez; devolve quantas foram preparadas.
+        """
+        async with AsyncExitStack() as stack:
+            connections = [
+                await stack.enter_async_context(self.pool.connection())
+                for _ in range(self.pool.min_size)
+            ]
+            for conn in connections:
+                async with conn.cursor() as cursor:
+                    for query, params in statements:
+                        await cursor.execute(query, params, prepare=True)
+                        await cursor.fetchall()
+        return len(connections)
+
+    def stats(self) -> dict:
+        """Estatísticas do pool para dimensionamento"""
+        return {"closed": self.pool.closed, **self.pool.get_stats()}
+
+
+_database: Optional[Database] = None
+
+
+def get_database() -> Database:
+    """Instância compartilhada do pool"""
+    global _database
+    if _database is None:
+        _database = Database()
+    return _database
+
+
+def get_db_cursor():
+    """Cursor assíncrono do pool compartilhado"""
+    return get_database().cursor()
@@ -0,0 +1,4 @@
+-- Índice para paginação por cursor (keyset) em GET /api/v1/artigos/
+-- Atende ORDER BY titulo, id_artigo e WHERE (titulo, id_artigo) > (...)
+CREATE INDEX IF NOT EXISTS idx_artigos_titulo_id
+    ON Artigos (titulo, id_artigo);
@@ -0,0 +1,24 @@
+-- Busca textual ranqueada para ArtigoService.search_artigos
+-- Substitui as varreduras ILIKE '%q%' por um tsvector indexado (GIN)
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() é STABLE; o wrapper IMMUTABLE permite usá-lo em colunas geradas
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+-- Coluna gerada: o Postgres a mantém atualizada em INSERT/UPDATE, e ela
+-- desaparece junto com a linha no DELETE
+ALTER TABLE Artigos ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', f_unaccent(coalesce(titulo, ''))), 'A') ||
+        setweight(to_tsvector('portuguese', f_unaccent(coalesce(publicadora, ''))), 'B') ||
+        setweight(to_tsvector('simple', coalesce(DOI, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_artigos_search_vector
+    ON Artigos USING GIN (search_vector);
+
+-- Caminho rápido para busca exata por DOI
+CREATE INDEX IF NOT EXISTS idx_artigos_doi_lower
+    ON Artigos (lower(DOI));
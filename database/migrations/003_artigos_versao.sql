@@ -0,0 +1,3 @@
+-- Versão por linha para os ETags das rotas de leitura de artigos
+-- Linhas existentes começam na versão 1; ArtigoService.update_artigo incrementa
+ALTER TABLE Artigos ADD COLUMN IF NOT EXISTS versao integer NOT NULL DEFAULT 1;
@@ -0,0 +1,142 @@
+"""Atualização em segundo plano de uma materialized view
+
+Escritas só marcam a view como desatualizada (`mark_dirty`, sem I/O). Uma
+tarefa em segundo plano junta as marcações e roda no máximo uma atualização
+por vez, com pelo menos `interval` segundos entre o início de duas
+atualizações. Uma escrita fica visível na view em até `interval` mais a
+duração de uma atualização.
+
+`stop` não interrompe uma atualização em andamento (uma função síncrona roda
+em `asyncio.to_thread`, que não pode ser cancelado): espera ela terminar
+antes da atualização final, para nunca haver duas ao mesmo tempo.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+import asyncio
+import logging
+import time
+
+from monitoring.metrics import view_refresh_duration_seconds, view_refreshes_total
+
+logger = logging.getLogger(__name__)
+
+RefreshFunction = Callable[[], Union[None, Awaitable[None]]]
+Sleep = Callable[[float], Awaitable[None]]
+
+
+def _is_async(function: RefreshFunction) -> bool:
+    # Objetos com `async def __call__` não são detectados pelo iscoroutinefunction
+    return asyncio.iscoroutinefunction(function) or asyncio.iscoroutinefunction(
+        getattr(function, "__call__", None)
+    )
+
+
+class ViewRefresher:
+    def __init__(
+        self,
+        name: str,
+        refresh: RefreshFunction,
+        interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Sleep = asyncio.sleep,
+    ):
+        self.name = name
+        self.interval = interval
+        self._refresh = refresh
+        # Relógio e espera substituíveis nos testes
+        self._clock = clock
+        self._sleep = sleep
+        self._dirty = asyncio.Event()
+        # Momento da escrita mais antiga que a view ainda não reflete
+        self._dirty_since: Optional[float] = None
+        self._refreshing_since: Optional[float] = None
+        self._last_started = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+        # Atualização em andamento; sobrevive ao cancelamento de `_task`
+        self._current: Optional[asyncio.Task] = None
+        self.marks = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.last_duration: Optional[float] = None
+        self.last_refreshed_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, flush: bool = True) -> None:
+        """Encerrar a tarefa; com `flush`, aplica as escritas pendentes antes"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._current is not None:
+            await self._current
+            self._current = None
+        if flush and self._dirty_since is not None:
+            await self._refresh_once()
+
+    def mark_dirty(self) -> None:
+        """Registrar uma escrita que a view ainda não reflete"""
+        self.marks += 1
+        if self._dirty_since is None:
+            self._dirty_since = self._clock()
+        self._dirty.set()
+
+    def staleness(self) -> float:
+        """Idade, em segundos, da escrita mais antiga ainda não refletida"""
+        pending = [since for since in (self._dirty_since, self._refreshing_since) if since is not None]
+        return self._clock() - min(pending) if pending else 0.0
+
+    async def _run(self) -> None:
+        while True:
+            await self._dirty.wait()
+            delay = self._last_started + self.interval - self._clock()
+            if delay > 0:
+                # Escritas que chegam durante a espera entram nesta mesma atualização
+                await self._sleep(delay)
+            # shield: cancelar `_task` não cancela a atualização; `stop` espera por ela
+            self._current = asyncio.ensure_future(self._refresh_once())
+            await asyncio.shield(self._current)
+
+    async def _refresh_once(self) -> None:
+        self._dirty.clear()
+        self._refreshing_since, self._dirty_since = self._dirty_since, None
+        self._last_started = self._clock()
+        start = time.perf_counter()
+        try:
+            if _is_async(self._refresh):
+                await self._refresh()
+            else:
+                await asyncio.to_thread(self._refresh)
+        except Exception as e:
+            self.failures += 1
+            view_refreshes_total.inc(view=self.name, status="error")
+            logger.error(f"Erro ao atualizar a view {self.name}: {e}")
+            # Continua desatualizada; nova tentativa depois do intervalo
+            pending = [s for s in (self._refreshing_since, self._dirty_since) if s is not None]
+            self._dirty_since = min(pending) if pending else None
+            self._dirty.set()
+        else:
+            self.refreshes += 1
+            self.last_duration = time.perf_counter() - start
+            self.last_refreshed_at = time.time()
+            view_refreshes_total.inc(view=self.name, status="ok")
+            view_refresh_duration_seconds.observe(self.last_duration, view=self.name)
+        finally:
+            self._refreshing_since = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "dirty": self._dirty_since is not None or self._refreshing_since is not None,
+            "staleness_seconds": self.staleness(),
+            "interval_seconds": self.interval,
+            "marks": self.marks,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_duration_seconds": self.last_duration,
+            "last_refreshed_at": self.last_refreshed_at,
+        }
@@ -1,7 +1,20 @@
 import re
 import json
 from bs4 import BeautifulSoup
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Iterable
+
+# Compartilhados com o motor rápido em scraping/fast_extract.py
+PRODUCT_TYPES = ['Product', 'http://schema.org/Product']
+PRODUCT_ITEMTYPE = "http://schema.org/Product"
+NAME_CLASSES = ['product-name', 'product-title', 'product__name', 'prod-name']
+BRAND_CLASSES = ['brand', 'product-brand', 'maker', 'vendor']
+PRICE_CLASSES = ['price', 'product-price', 'current-price', 'sale-price']
+
+# Regex para encontrar preços
+PRICE_REGEX = re.compile(
+    r'(\$|\€|\£)?\s?(\d{1,3}(?:[.,\s]?\d{3})*(?:[.,]\d{2})?)',
+    re.UNICODE
+)
 
 def extract_product_info(html_content: str) -> Dict[str, Optional[str]]:
     soup = BeautifulSoup(html_content, 'html.parser')
@@ -31,13 +44,16 @@ def extract_product_info(html_content: str) -> Dict[str, Optional[str]]:
 
 def _extract_from_json_ld(soup: BeautifulSoup) -> Optional[Dict[str, str]]:
     scripts = soup.find_all('script', {'type': 'application/ld+json'})
-    for script in scripts:
+    return _product_from_json_ld(script.string for script in scripts)
+
+def _product_from_json_ld(texts: Iterable[Optional[str]]) -> Optional[Dict[str, str]]:
+    for text in texts:
         try:
-            data = json.loads(script.string, strict=False)
+            data = json.loads(text, strict=False)
             if isinstance(data, list):
                 data = data[0]
                 
-            if data.get('@type') in ['Product', 'http://schema.org/Product']:
+            if data.get('@type') in PRODUCT_TYPES:
                 product_info = {}
                 
                 # Nome
@@ -63,7 +79,7 @@ def _extract_from_json_ld(soup: BeautifulSoup) -> Optional[Dict[str, str]]:
     return None
 
 def _extract_from_microdata(soup: BeautifulSoup) -> Optional[Dict[str, str]]:
-    product = soup.find(itemtype="http://schema.org/Product")
+    product = soup.find(itemtype=PRODUCT_ITEMTYPE)
     if not product:
         return None
     
@@ -107,7 +123,7 @@ def _find_product_name(soup: BeautifulSoup) -> Optional[str]:
         candidates.append(meta['content'].strip())
     
     # 4. Classes comuns
-    for class_name in ['product-name', 'product-title', 'product__name', 'prod-name']:
+    for class_name in NAME_CLASSES:
         for elem in soup.find_all(class_=class_name):
             text = elem.get_text(strip=True)
             if text:
@@ -122,7 +138,7 @@ def _find_product_brand(soup: BeautifulSoup) -> Optional[str]:
     # Estratégias para encontrar a marca
     strategies = [
         {'itemprop': 'brand'},
-        {'class': ['brand', 'product-brand', 'maker', 'vendor']},
+        {'class': BRAND_CLASSES},
         {'id': 'brand'},
         {'name': 'brand'}
     ]
@@ -143,17 +159,10 @@ def _find_product_brand(soup: BeautifulSoup) -> Optional[str]:
     return None
 
 def _find_product_price(soup: BeautifulSoup) -> Optional[str]:
-    # Regex para encontrar preços
-    price_regex = re.compile(
-        r'(\$|\€|\£)?\s?(\d{1,3}(?:[.,\s]?\d{3})*(?:[.,]\d{2})?)',
-        re.UNICODE
-    )
-    
-    # Elementos com classes relacionadas a preço
-    price_classes = ['price', 'product-price', 'current-price', 'sale-price']
+    price_regex = PRICE_REGEX
     
     # Procurar em elementos específicos
-    for class_name in price_classes:
+    for class_name in PRICE_CLASSES:
         for elem in soup.find_all(class_=class_name):
             text = elem.get_text(strip=True)
             match = price_regex.search(text)
@@ -0,0 +1,103 @@
+"""Autenticação preguiçosa no Spotify com token compartilhado entre processos
+
+O `SpotifyOAuth` só é criado quando um token é pedido pela primeira vez. O
+token fica em memória e em um arquivo de cache (o mesmo formato do
+`CacheFileHandler` do spotipy); processos diferentes reaproveitam o arquivo e,
+quando ele expira, só um deles renova (trava exclusiva no arquivo `.lock`).
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import json
+import logging
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LazySpotifyOAuth:
+    """Fonte de token para o SpotifyClient (chamável que devolve o access token)"""
+
+    def __init__(
+        self,
+        scope: str,
+        cache_path: str = settings.SPOTIFY_TOKEN_CACHE,
+        expiry_margin: float = 60.0,
+    ):
+        self.scope = scope
+        self.cache_path = cache_path
+        self.expiry_margin = expiry_margin
+        self._auth_manager = None
+        self._token_info: Optional[Dict] = None
+        self._rejected: Optional[str] = None
+
+    def __call__(self) -> str:
+        if self._valid(self._token_info):
+            return self._token_info["access_token"]
+
+        token_info = self._read_cache()
+        if not self._valid(token_info):
+            with self._lock():
+                # Outro processo pode ter renovado enquanto esperávamos a trava
+                token_info = self._read_cache()
+                if not self._valid(token_info):
+                    token_info = self._refresh(token_info)
+        self._token_info = token_info
+        self._rejected = None
+        return token_info["access_token"]
+
+    def invalidate(self) -> None:
+        """Descartar o token atual (a API respondeu 401); o próximo pedido renova"""
+        if self._token_info:
+            self._rejected = self._token_info["access_token"]
+        self._token_info = None
+
+    def _valid(self, token_info: Optional[Dict]) -> bool:
+        return (
+            bool(token_info)
+            and token_info.get("access_token") != self._rejected
+            and token_info.get("expires_at", 0) - self.expiry_margin > time.time()
+        )
+
+    def _refresh(self, token_info: Optional[Dict]) -> Dict:
+        logger.info("Renovando o token do Spotify")
+        manager = self._manager()
+        if token_info and token_info.get("refresh_token"):
+            # get_access_token devolveria o token rejeitado do cache
+            return manager.refresh_access_token(token_info["refresh_token"])
+        return manager.get_access_token(as_dict=True)
+
+    def _read_cache(self) -> Optional[Dict]:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _manager(self):
+        if self._auth_manager is None:
+            from spotipy.cache_handler import CacheFileHandler
+            from spotipy.oauth2 import SpotifyOAuth
+
+            self._auth_manager = SpotifyOAuth(
+                scope=self.scope, cache_handler=CacheFileHandler(cache_path=self.cache_path)
+            )
+        return self._auth_manager
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self.cache_path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
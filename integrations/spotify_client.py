@@ -0,0 +1,221 @@
+"""Cliente assíncrono da Web API do Spotify
+
+Um `httpx.AsyncClient` com conexões reaproveitadas. Toda chamada passa por:
+
+- um limitador token bucket compartilhado pelo cliente, que também pausa
+  todas as chamadas pelo tempo do `Retry-After` quando a API responde 429;
+- coalescência: GETs idênticos (mesmo caminho e parâmetros) em andamento
+  compartilham uma única requisição;
+- métricas no registro de monitoring.metrics (requisições, latência, novas
+  tentativas, chamadas coalescidas e tempo de espera no limitador).
+
+O token só é obtido na primeira requisição. A URL base é configurável para
+apontar para um stub local (ver benchmarks/spotify_stub.py).
+"""
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+import asyncio
+import logging
+import math
+import time
+
+import httpx
+
+from config import settings
+from monitoring.metrics import (
+    spotify_coalesced_total,
+    spotify_rate_limit_wait_seconds_total,
+    spotify_request_duration_seconds,
+    spotify_requests_total,
+    spotify_retries_total,
+)
+
+logger = logging.getLogger(__name__)
+
+# Máximos por requisição da Web API
+SAVED_TRACKS_PAGE_LIMIT = 50
+AUDIO_FEATURES_BATCH = 100
+ARTISTS_BATCH = 50
+
+RETRYABLE_STATUS = (500, 502, 503, 504)
+
+TokenSource = Union[str, Callable[[], str]]
+
+DEFAULT_RETRY_AFTER = 1.0
+
+
+def retry_after_seconds(value: Optional[str], default: float = DEFAULT_RETRY_AFTER) -> float:
+    """Segundos de um Retry-After, em segundos ou data HTTP (RFC 9110); inválido vira `default`"""
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return default
+    return max(0.0, seconds) if math.isfinite(seconds) else default
+
+
+class SpotifyAPIError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Spotify respondeu {status_code}: {message}")
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """Limitador de taxa: `rate` requisições por segundo com rajadas de até `capacity`"""
+
+    def __init__(self, rate: Optional[float], capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Esperar a vez (ordem de chegada); devolve o tempo esperado em segundos"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self.rate is None:
+                    return waited
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Suspender todas as chamadas (Retry-After) e recomeçar sem rajada"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+
+class SpotifyClient:
+    def __init__(
+        self,
+        token: TokenSource,
+        base_url: str = settings.SPOTIFY_API_URL,
+        concurrency: int = settings.SPOTIFY_CONCURRENCY,
+        rate: Optional[float] = settings.SPOTIFY_RATE_LIMIT,
+        burst: int = settings.SPOTIFY_RATE_BURST,
+        timeout: float = 20.0,
+        max_retries: int = 5,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = TokenBucket(rate, burst)
+        self.stats = {"requests": 0, "retries": 0, "coalesced": 0, "limiter_wait_seconds": 0.0}
+        self._token_source = token
+        self._token: Optional[str] = None
+        self._token_lock = asyncio.Lock()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @property
+    def requests_sent(self) -> int:
+        return self.stats["requests"]
+
+    async def __aenter__(self) -> "SpotifyClient":
+        self._http = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=self._limits)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._http.aclose()
+        self._http = None
+
+    async def _access_token(self, rejected: Optional[str] = None) -> str:
+        """Token atual, obtido na primeira chamada ou renovado após um 401"""
+        async with self._token_lock:
+            if self._token is None or self._token == rejected:
+                if callable(self._token_source):
+                    if rejected is not None and hasattr(self._token_source, "invalidate"):
+                        self._token_source.invalidate()
+                    # SpotifyOAuth é síncrono e pode renovar o token pela rede
+                    self._token = await asyncio.to_thread(self._token_source)
+                else:
+                    self._token = self._token_source
+            return self._token
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """GET coalescido com as requisições idênticas em andamento
+
+        O mesmo dicionário de resposta é entregue a todos que coalesceram;
+        trate-o como somente leitura.
+        """
+        key = (path, tuple(sorted((params or {}).items())))
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            spotify_coalesced_total.inc(endpoint=path)
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self._request(path, params))
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._inflight.pop(key, None))
+        # shield: cancelar quem espera não cancela a requisição compartilhada
+        return await asyncio.shield(future)
+
+    async def _request(self, path: str, params: Optional[Dict[str, Any]]) -> Dict:
+        """GET com nova tentativa em 429 (Retry-After), 5xx, falha de rede e 401"""
+        token = await self._access_token()
+        for attempt in range(self.max_retries + 1):
+            waited = await self.limiter.acquire()
+            if waited:
+                self.stats["limiter_wait_seconds"] += waited
+                spotify_rate_limit_wait_seconds_total.inc(waited)
+
+            start = time.perf_counter()
+            try:
+                async with self._semaphore:
+                    self.stats["requests"] += 1
+                    response = await self._http.get(
+                        path, params=params, headers={"Authorization": f"Bearer {token}"}
+                    )
+            except httpx.TransportError as e:
+                spotify_requests_total.inc(endpoint=path, status="error")
+                if attempt == self.max_retries:
+                    raise
+                await self._retry("transport", 0.5 * 2 ** attempt, f"{type(e).__name__}: {e}")
+                continue
+            spotify_request_duration_seconds.observe(time.perf_counter() - start, endpoint=path)
+            spotify_requests_total.inc(endpoint=path, status=str(response.status_code))
+
+            if attempt < self.max_retries:
+                if response.status_code == 429:
+                    delay = retry_after_seconds(response.headers.get("Retry-After"))
+                    # A janela de limite é do app inteiro: pausar todas as chamadas
+                    self.limiter.pause(delay)
+                    await self._retry("rate_limit", 0.0, f"429 em {path}; pausando {delay}s")
+                    continue
+                if response.status_code in RETRYABLE_STATUS:
+                    await self._retry("server_error", 0.5 * 2 ** attempt, f"{response.status_code} em {path}")
+                    continue
+                if response.status_code == 401 and attempt == 0 and callable(self._token_source):
+                    token = await self._access_token(rejected=token)
+                    await self._retry("unauthorized", 0.0, f"401 em {path}; token renovado")
+                    continue
+            if response.status_code >= 400:
+                raise SpotifyAPIError(response.status_code, response.text[:200])
+            return response.json()
+
+    async def _retry(self, reason: str, delay: float, message: str) -> None:
+        self.stats["retries"] += 1
+        spotify_retries_total.inc(reason=reason)
+        logger.warning(f"Nova tentativa ao Spotify ({reason}): {message}")
+        if delay:
+            await asyncio.sleep(delay)
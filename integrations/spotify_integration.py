@@ -1,13 +1,81 @@
-import spotipy as spo
-from spotipy.oauth2 import SpotifyOAuth
+"""Ingestão da biblioteca de faixas salvas do Spotify
 
+Uso:
+
+    python -m integrations.spotify_integration                 # OAuth (variáveis SPOTIPY_*)
+    python -m integrations.spotify_integration --base-url http://127.0.0.1:8766/v1 --token stub
+    python -m integrations.spotify_integration --incremental   # só o que mudou desde a última execução
+"""
+import argparse
+import asyncio
+import logging
+
+from config import settings
+from integrations.spotify_auth import LazySpotifyOAuth
+from integrations.spotify_client import SpotifyClient
+from integrations.spotify_library import LibraryIngestion
+from integrations.spotify_store import LibraryStore
+
+logger = logging.getLogger(__name__)
 
 scope = "user-library-read"
 
 
-sp = spo.Spotify(auth_manager=SpotifyOAuth(scope=scope))
+async def ingest_library(
+    token,
+    db_path: str = settings.SPOTIFY_LIBRARY_DB,
+    refresh: bool = False,
+    incremental: bool = False,
+    reconcile_interval: float = settings.SPOTIFY_RECONCILE_INTERVAL,
+    **client_options
+) -> dict:
+    """Ingerir a biblioteca do usuário para o SQLite local (inteira ou incremental)"""
+    store = LibraryStore(db_path)
+    try:
+        async with SpotifyClient(token, **client_options) as client:
+            ingestion = LibraryIngestion(
+                client, store, refresh=refresh, reconcile_interval=reconcile_interval
+            )
+            summary = await (ingestion.sync() if incremental else ingestion.ingest())
+            return {**summary, "client": dict(client.stats)}
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=settings.SPOTIFY_API_URL)
+    parser.add_argument("--token", help="access token fixo (padrão: SpotifyOAuth)")
+    parser.add_argument("--db", default=settings.SPOTIFY_LIBRARY_DB, help="arquivo SQLite local")
+    parser.add_argument("--concurrency", type=int, default=settings.SPOTIFY_CONCURRENCY)
+    parser.add_argument(
+        "--rate", type=float, default=settings.SPOTIFY_RATE_LIMIT,
+        help="requisições por segundo (token bucket)"
+    )
+    parser.add_argument("--refresh", action="store_true", help="buscar de novo features e artistas já salvos")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="buscar só as faixas salvas depois da última sincronização"
+    )
+    parser.add_argument(
+        "--reconcile-days", type=float, default=settings.SPOTIFY_RECONCILE_INTERVAL / 86400,
+        help="com --incremental, dias entre listagens completas para detectar remoções"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    summary = asyncio.run(ingest_library(
+        args.token or LazySpotifyOAuth(scope),
+        db_path=args.db,
+        refresh=args.refresh,
+        incremental=args.incremental,
+        reconcile_interval=args.reconcile_days * 86400,
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        rate=args.rate,
+    ))
+    logger.info(f"Resumo: {summary}")
 
-results = sp.current_user_saved_tracks()
-for idx, item in enumerate(results['items']):
-    track = item['track']
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Ingestão completa da biblioteca de faixas salvas de um usuário
+
+1. Primeira página de /me/tracks (50 itens) para descobrir o total.
+2. Demais páginas buscadas em paralelo (limitadas pela concorrência do cliente).
+3. Audio features (100 ids por requisição) e artistas (50 ids) em lotes paralelos,
+   só para o que ainda não está no armazenamento local.
+4. Tudo gravado no SQLite local.
+
+A sincronização incremental (`sync`) parte da marca d'água do usuário (maior
+`added_at` já salvo): pagina /me/tracks da faixa mais recente para a mais
+antiga e para na primeira faixa mais antiga que a marca, normalmente na
+primeira página. Remoções são detectadas comparando o `total` da API com o
+esperado (sem custo extra) e reconciliadas com uma listagem completa quando
+o total diverge ou a cada `reconcile_interval`.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+from config import settings
+from integrations.spotify_client import (
+    ARTISTS_BATCH,
+    AUDIO_FEATURES_BATCH,
+    SAVED_TRACKS_PAGE_LIMIT,
+    SpotifyAPIError,
+    SpotifyClient,
+)
+from integrations.spotify_store import LibraryStore
+
+logger = logging.getLogger(__name__)
+
+
+def _batches(ids: Sequence[str], size: int) -> List[Sequence[str]]:
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+def dedupe_items(items: List[Dict]) -> Tuple[List[Dict], int]:
+    """Remover faixas locais (sem id) e repetidas, mantendo a primeira ocorrência
+
+    Repetições acontecem quando a biblioteca muda enquanto as páginas são
+    buscadas em paralelo (os offsets deslocam).
+    """
+    seen = set()
+    unique = []
+    for item in items:
+        track_id = (item.get("track") or {}).get("id")
+        if track_id and track_id not in seen:
+            seen.add(track_id)
+            unique.append(item)
+    return unique, len(items) - len(unique)
+
+
+async def fetch_saved_tracks(client: SpotifyClient) -> Tuple[List[Dict], int]:
+    """Todas as faixas salvas, da mais recente para a mais antiga, e o total remoto"""
+    first = await client.get("/me/tracks", {"limit": SAVED_TRACKS_PAGE_LIMIT, "offset": 0})
+    offsets = range(SAVED_TRACKS_PAGE_LIMIT, first["total"], SAVED_TRACKS_PAGE_LIMIT)
+    pages = await asyncio.gather(*(
+        client.get("/me/tracks", {"limit": SAVED_TRACKS_PAGE_LIMIT, "offset": offset})
+        for offset in offsets
+    ))
+    items = list(first["items"])
+    for page in pages:
+        items.extend(page["items"])
+    return items, first["total"]
+
+
+def newest_added_at(items: List[Dict], default: Optional[str] = None) -> Optional[str]:
+    """Marca d'água: maior `added_at`, contando também faixas locais (sem id)"""
+    return max((item["added_at"] for item in items), default=default)
+
+
+async def fetch_by_ids(
+    client: SpotifyClient, path: str, key: str, ids: Sequence[str], batch_size: int
+) -> List[Dict]:
+    """Buscar objetos por id em lotes do tamanho máximo da API (nulos descartados)"""
+    responses = await asyncio.gather(*(
+        client.get(path, {"ids": ",".join(batch)}) for batch in _batches(ids, batch_size)
+    ))
+    return [obj for response in responses for obj in response[key] if obj]
+
+
+async def fetch_new_saved_tracks(
+    client: SpotifyClient, watermark: Optional[str], known_ids: set
+) -> Tuple[List[Dict], int, int]:
+    """Faixas salvas depois da marca d'água; devolve (itens novos, total remoto, páginas)
+
+    Itens com o mesmo `added_at` da marca só contam como novos se ainda não
+    são conhecidos (várias faixas podem ser salvas no mesmo segundo).
+    """
+    def is_new(item: Dict) -> bool:
+        if watermark is None or item["added_at"] > watermark:
+            return True
+        track_id = (item.get("track") or {}).get("id")
+        return track_id is not None and track_id not in known_ids
+
+    new_items = []
+    offset = 0
+    pages = 0
+    total = 0
+    while True:
+        page = await client.get("/me/tracks", {"limit": SAVED_TRACKS_PAGE_LIMIT, "offset": offset})
+        pages += 1
+        if pages == 1:
+            total = page["total"]
+        reached_seen = False
+        for item in page["items"]:
+            if watermark is not None and item["added_at"] < watermark:
+                reached_seen = True
+                break
+            if is_new(item):
+                new_items.append(item)
+        if reached_seen or not page.get("next"):
+            return new_items, total, pages
+        offset += SAVED_TRACKS_PAGE_LIMIT
+
+
+class LibraryIngestion:
+    def __init__(
+        self,
+        client: SpotifyClient,
+        store: LibraryStore,
+        refresh: bool = False,
+        reconcile_interval: float = settings.SPOTIFY_RECONCILE_INTERVAL,
+    ):
+        self.client = client
+        self.store = store
+        # refresh=True busca de novo features e artistas já salvos
+        self.refresh = refresh
+        self.reconcile_interval = reconcile_interval
+
+    async def ingest(self) -> Dict:
+        """Ingerir a biblioteca inteira do usuário autenticado"""
+        start = time.perf_counter()
+        requests_before = self.client.requests_sent
+        user = await self.client.get("/me")
+        summary = await self._full(user["id"])
+        return self._summary(summary, "full", start, requests_before)
+
+    async def sync(self) -> Dict:
+        """Sincronização incremental; cai na ingestão completa sem estado ou na reconciliação"""
+        start = time.perf_counter()
+        requests_before = self.client.requests_sent
+        user = await self.client.get("/me")
+        user_id = user["id"]
+
+        state = self.store.sync_state(user_id)
+        if state is None:
+            return self._summary(await self._full(user_id), "full", start, requests_before)
+        if time.time() - state["reconciled_at"] >= self.reconcile_interval:
+            return self._summary(await self._full(user_id), "reconcile", start, requests_before)
+
+        raw_items, total, pages = await fetch_new_saved_tracks(
+            self.client, state["watermark"], self.store.saved_track_ids(user_id)
+        )
+        # Sem remoções, o total remoto cresce exatamente com as faixas novas
+        if total != state["remote_total"] + len(raw_items):
+            logger.info(
+                f"Total remoto de {user_id} divergiu ({total} != "
+                f"{state['remote_total']} + {len(raw_items)}); reconciliando"
+            )
+            return self._summary(await self._full(user_id), "reconcile", start, requests_before)
+
+        items, skipped = dedupe_items(raw_items)
+        tracks = [item["track"] for item in items]
+        self.store.add_saved(user_id, items)
+        self.store.upsert_tracks(tracks)
+        features, artists = await self.enrich(tracks)
+        self.store.save_sync_state(
+            user_id, newest_added_at(raw_items, state["watermark"]), total, reconciled=False
+        )
+        summary = {
+            "user_id": user_id,
+            "tracks": len(items),
+            "skipped": skipped,
+            "audio_features": features,
+            "artists": artists,
+            "pages": pages,
+        }
+        return self._summary(summary, "incremental", start, requests_before)
+
+    async def _full(self, user_id: str) -> Dict:
+        raw_items, total = await fetch_saved_tracks(self.client)
+        items, skipped = dedupe_items(raw_items)
+        tracks = [item["track"] for item in items]
+        self.store.replace_library(user_id, items)
+        self.store.upsert_tracks(tracks)
+
+        features, artists = await self.enrich(tracks)
+        self.store.save_sync_state(user_id, newest_added_at(raw_items), total, reconciled=True)
+        return {
+            "user_id": user_id,
+            "tracks": len(items),
+            "skipped": skipped,
+            "audio_features": features,
+            "artists": artists,
+        }
+
+    def _summary(self, summary: Dict, mode: str, start: float, requests_before: int) -> Dict:
+        return {
+            "mode": mode,
+            **summary,
+            "requests": self.client.requests_sent - requests_before,
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+    async def enrich(self, tracks: List[Dict]) -> Tuple[int, int]:
+        """Buscar e gravar audio features e artistas das faixas; devolve as contagens"""
+        track_ids = [track["id"] for track in tracks]
+        artist_ids = list(dict.fromkeys(
+            artist["id"] for track in tracks for artist in track.get("artists", []) if artist.get("id")
+        ))
+        if not self.refresh:
+            track_ids = self.store.missing("audio_features", "track_id", track_ids)
+            artist_ids = self.store.missing("artists", "id", artist_ids)
+
+        features_task = fetch_by_ids(
+            self.client, "/audio-features", "audio_features", track_ids, AUDIO_FEATURES_BATCH
+        )
+        artists_task = fetch_by_ids(self.client, "/artists", "artists", artist_ids, ARTISTS_BATCH)
+        features, artists = await asyncio.gather(features_task, artists_task, return_exceptions=True)
+
+        # Audio features não estão disponíveis para todo app; a biblioteca vale mesmo sem elas
+        if isinstance(features, SpotifyAPIError):
+            logger.warning(f"Erro ao buscar audio features: {features}")
+            features = []
+        elif isinstance(features, BaseException):
+            raise features
+        if isinstance(artists, BaseException):
+            raise artists
+
+        self.store.upsert_audio_features(features)
+        self.store.upsert_artists(artists)
+        return len(features), len(artists)
@@ -0,0 +1,184 @@
+"""Armazenamento local da biblioteca do Spotify (SQLite)"""
+from typing import Dict, Iterable, List, Optional, Set
+import json
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_tracks (
+    user_id TEXT NOT NULL,
+    track_id TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    PRIMARY KEY (user_id, track_id)
+);
+CREATE INDEX IF NOT EXISTS idx_saved_tracks_added ON saved_tracks (user_id, added_at);
+
+CREATE TABLE IF NOT EXISTS tracks (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    album TEXT,
+    duration_ms INTEGER,
+    popularity INTEGER,
+    explicit INTEGER,
+    artist_ids TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS audio_features (
+    track_id TEXT PRIMARY KEY,
+    danceability REAL,
+    energy REAL,
+    valence REAL,
+    tempo REAL,
+    acousticness REAL,
+    instrumentalness REAL,
+    liveness REAL,
+    speechiness REAL,
+    loudness REAL,
+    mode INTEGER,
+    key INTEGER,
+    time_signature INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    user_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    remote_total INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    reconciled_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS artists (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    genres TEXT NOT NULL,
+    popularity INTEGER,
+    followers INTEGER
+);
+"""
+
+AUDIO_FEATURE_COLUMNS = (
+    "danceability", "energy", "valence", "tempo", "acousticness", "instrumentalness",
+    "liveness", "speechiness", "loudness", "mode", "key", "time_signature",
+)
+
+
+class LibraryStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def replace_library(self, user_id: str, items: Iterable[Dict]) -> int:
+        """Substituir a lista de faixas salvas do usuário por `items` (/me/tracks)"""
+        rows = [(user_id, item["track"]["id"], item["added_at"]) for item in items]
+        with self.conn:
+            self.conn.execute("DELETE FROM saved_tracks WHERE user_id = ?", (user_id,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO saved_tracks (user_id, track_id, added_at) VALUES (?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def add_saved(self, user_id: str, items: Iterable[Dict]) -> int:
+        """Acrescentar faixas salvas sem mexer nas existentes"""
+        rows = [(user_id, item["track"]["id"], item["added_at"]) for item in items]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO saved_tracks (user_id, track_id, added_at) VALUES (?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def sync_state(self, user_id: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT watermark, remote_total, synced_at, reconciled_at FROM sync_state WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("watermark", "remote_total", "synced_at", "reconciled_at"), row))
+
+    def save_sync_state(
+        self, user_id: str, watermark: Optional[str], remote_total: int, reconciled: bool
+    ) -> Dict:
+        """Gravar a marca d'água (maior added_at visto) depois de uma sincronização"""
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO sync_state (user_id, watermark, remote_total, synced_at, reconciled_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    watermark = excluded.watermark,
+                    remote_total = excluded.remote_total,
+                    synced_at = excluded.synced_at,
+                    reconciled_at = CASE WHEN ? THEN excluded.reconciled_at ELSE sync_state.reconciled_at END
+                """,
+                (user_id, watermark, remote_total, now, now, reconciled)
+            )
+        return self.sync_state(user_id)
+
+    def upsert_tracks(self, tracks: Iterable[Dict]) -> None:
+        rows = [
+            (
+                track["id"], track["name"], (track.get("album") or {}).get("name"),
+                track.get("duration_ms"), track.get("popularity"), int(bool(track.get("explicit"))),
+                json.dumps([artist["id"] for artist in track.get("artists", []) if artist.get("id")]),
+            )
+            for track in tracks
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO tracks (id, name, album, duration_ms, popularity, explicit, artist_ids)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+
+    def upsert_audio_features(self, features: Iterable[Dict]) -> None:
+        columns = ", ".join(AUDIO_FEATURE_COLUMNS)
+        placeholders = ", ".join("?" for _ in AUDIO_FEATURE_COLUMNS)
+        rows = [
+            (feature["id"], *(feature.get(column) for column in AUDIO_FEATURE_COLUMNS))
+            for feature in features
+        ]
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO audio_features (track_id, {columns}) VALUES (?, {placeholders})",
+                rows
+            )
+
+    def upsert_artists(self, artists: Iterable[Dict]) -> None:
+        rows = [
+            (
+                artist["id"], artist["name"], json.dumps(artist.get("genres", [])),
+                artist.get("popularity"), (artist.get("followers") or {}).get("total"),
+            )
+            for artist in artists
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO artists (id, name, genres, popularity, followers) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def saved_track_ids(self, user_id: str) -> Set[str]:
+        rows = self.conn.execute("SELECT track_id FROM saved_tracks WHERE user_id = ?", (user_id,))
+        return {row[0] for row in rows}
+
+    def missing(self, table: str, key: str, ids: Iterable[str]) -> List[str]:
+        """Ids ainda sem linha em `table` (evita buscar de novo o que já está salvo)"""
+        known = {row[0] for row in self.conn.execute(f"SELECT {key} FROM {table}")}
+        return [item_id for item_id in ids if item_id not in known]
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("saved_tracks", "tracks", "audio_features", "artists")
+        }
+
+    def close(self) -> None:
+        self.conn.close()
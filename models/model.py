@@ -25,3 +25,23 @@ class ArtigoResponse(ArtigoBase):
 
 class ArtigoWithAuthors(ArtigoResponse):
     autores: list[dict] = []
+
+class ArtigoSuggestion(BaseModel):
+    id_artigo: int
+    titulo: str
+    DOI: Optional[str] = None
+
+class ArtigoBatchRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1)
+
+class BulkImportError(BaseModel):
+    index: int
+    error: str
+
+class BulkImportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: list[BulkImportError] = []
+    elapsed_seconds: float
+    rows_per_second: float
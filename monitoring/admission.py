@@ -0,0 +1,170 @@
+"""Controle de admissão: limites de concorrência por classe de rota e descarte de carga
+
+Cada requisição é classificada pelo método e caminho (a classificação é feita
+antes do roteamento) em uma classe com prioridade, limite de concorrência,
+fila limitada e espera máxima. Além do limite de cada classe há um limite
+global. Quando uma vaga abre, ela vai para a classe de maior prioridade com
+fila, em ordem de chegada dentro da classe. Leituras baratas passam à frente
+de buscas e cargas em lote.
+
+Fila cheia ou espera esgotada resultam em um 503 imediato com `Retry-After`,
+em vez de deixar as requisições se acumularem esperando conexões do pool.
+Rotas sem classe (/metrics, documentação, estatísticas) não passam pelo
+controle.
+"""
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+import asyncio
+import logging
+import math
+import re
+import time
+
+from fastapi.responses import JSONResponse
+
+from monitoring.metrics import admission_shed_total, admission_wait_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class RouteClass:
+    def __init__(self, name: str, priority: int, concurrency: int, queue: int, timeout: float):
+        self.name = name
+        self.priority = priority
+        self.concurrency = concurrency
+        self.queue_size = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.timeout))
+
+
+class AdmissionController:
+    def __init__(self, classes: Iterable[RouteClass], max_concurrency: int):
+        self.classes = {route_class.name: route_class for route_class in classes}
+        # Ordem de atendimento quando uma vaga abre
+        self._by_priority = sorted(self.classes.values(), key=lambda route_class: route_class.priority)
+        self.max_concurrency = max_concurrency
+        self.active = 0
+
+    async def acquire(self, route_class: RouteClass) -> Optional[str]:
+        """Ocupar uma vaga; devolve o motivo do descarte ou None se admitida"""
+        if not route_class.waiters and self._has_room(route_class):
+            self._grant(route_class)
+            return None
+        if len(route_class.waiters) >= route_class.queue_size:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        route_class.waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), route_class.timeout)
+            return None
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # A vaga chegou junto com o fim do prazo: aproveitar
+                return None
+            waiter.cancel()
+            return "timeout"
+        except BaseException:
+            # Cliente desconectou enquanto esperava: devolver a vaga se já tinha sido concedida
+            if waiter.done() and not waiter.cancelled():
+                self.release(route_class)
+            waiter.cancel()
+            raise
+        finally:
+            admission_wait_seconds.observe(time.perf_counter() - start, route_class=route_class.name)
+            if waiter in route_class.waiters:
+                route_class.waiters.remove(waiter)
+
+    def release(self, route_class: RouteClass) -> None:
+        route_class.active -= 1
+        self.active -= 1
+        self._dispatch()
+
+    def _has_room(self, route_class: RouteClass) -> bool:
+        return self.active < self.max_concurrency and route_class.active < route_class.concurrency
+
+    def _grant(self, route_class: RouteClass) -> None:
+        route_class.active += 1
+        self.active += 1
+
+    def _dispatch(self) -> None:
+        for route_class in self._by_priority:
+            while route_class.waiters and self._has_room(route_class):
+                waiter = route_class.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._grant(route_class)
+                waiter.set_result(None)
+            if self.active >= self.max_concurrency:
+                return
+
+    def queue_depths(self) -> Dict[Tuple[str], int]:
+        return {(name,): len(route_class.waiters) for name, route_class in self.classes.items()}
+
+    def active_counts(self) -> Dict[Tuple[str], int]:
+        return {(name,): route_class.active for name, route_class in self.classes.items()}
+
+
+RouteRule = Tuple[Optional[Sequence[str]], Pattern, str]
+
+
+def default_rules(prefix: str) -> List[RouteRule]:
+    """Classes das rotas de artigos; a primeira regra que casar vale"""
+    artigos = re.escape(prefix)
+    return [
+        (None, re.compile(rf"^{artigos}/(bulk|export)/?$"), "bulk"),
+        (("GET",), re.compile(rf"^{artigos}/(search|pesquisar)/"), "search"),
+        (("GET", "POST"), re.compile(rf"^{artigos}/batch/?$"), "read"),
+        (("GET", "HEAD"), re.compile(rf"^{artigos}(/.*)?$"), "read"),
+        (("POST", "PUT", "PATCH", "DELETE"), re.compile(rf"^{artigos}(/.*)?$"), "write"),
+    ]
+
+
+class AdmissionMiddleware:
+    """Middleware ASGI que aplica o AdmissionController às rotas classificadas"""
+
+    def __init__(self, app, controller: AdmissionController, rules: Sequence[RouteRule]):
+        self.app = app
+        self.controller = controller
+        self.rules = rules
+
+    def classify(self, method: str, path: str) -> Optional[RouteClass]:
+        for methods, pattern, name in self.rules:
+            if (methods is None or method in methods) and pattern.match(path):
+                return self.controller.classes.get(name)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await self.controller.acquire(route_class)
+        if reason is not None:
+            admission_shed_total.inc(route_class=route_class.name, reason=reason)
+            logger.warning(
+                f"Requisição descartada ({route_class.name}, {reason}): {scope['method']} {scope['path']}"
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Servidor sobrecarregado, tente novamente"},
+                headers={"Retry-After": str(route_class.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            # A vaga fica ocupada até o fim da resposta, inclusive em streaming
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
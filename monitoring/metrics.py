@@ -0,0 +1,298 @@
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import re
+import threading
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class CallbackGauge(Metric):
+    """Gauge cujo valor é lido no momento da coleta"""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = ()
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self.callback().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self) -> Iterable[str]:
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica já registrada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """Exposição no formato texto do Prometheus"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests_total = registry.register(Counter(
+    "soundmood_http_requests_total",
+    "Requisições HTTP atendidas",
+    ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "soundmood_http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "soundmood_http_requests_in_flight",
+    "Requisições HTTP em andamento"
+))
+
+# Banco de dados
+db_query_duration_seconds = registry.register(Histogram(
+    "soundmood_db_query_duration_seconds",
+    "Tempo de execução das consultas por instrução",
+    ("statement",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+))
+db_query_rows_total = registry.register(Counter(
+    "soundmood_db_query_rows_total",
+    "Linhas retornadas ou afetadas por instrução",
+    ("statement",)
+))
+db_query_errors_total = registry.register(Counter(
+    "soundmood_db_query_errors_total",
+    "Consultas que terminaram em erro",
+    ("statement",)
+))
+
+startup_duration_seconds = registry.register(Gauge(
+    "soundmood_startup_duration_seconds",
+    "Duração de cada fase da inicialização da aplicação",
+    ("phase",)
+))
+
+view_refreshes_total = registry.register(Counter(
+    "soundmood_view_refreshes_total",
+    "Atualizações de materialized views por resultado",
+    ("view", "status")
+))
+view_refresh_duration_seconds = registry.register(Histogram(
+    "soundmood_view_refresh_duration_seconds",
+    "Duração das atualizações de materialized views",
+    ("view",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+))
+
+singleflight_calls_total = registry.register(Counter(
+    "soundmood_singleflight_calls_total",
+    "Leituras por método: executadas (leader) ou coalescidas com uma idêntica em andamento",
+    ("method", "role")
+))
+singleflight_superseded_total = registry.register(Counter(
+    "soundmood_singleflight_superseded_total",
+    "Leituras em andamento descartadas por uma escrita",
+    ("method",)
+))
+
+# Controle de admissão
+admission_shed_total = registry.register(Counter(
+    "soundmood_admission_shed_total",
+    "Requisições recusadas com 503 por classe de rota e motivo (queue_full, timeout)",
+    ("route_class", "reason")
+))
+admission_wait_seconds = registry.register(Histogram(
+    "soundmood_admission_wait_seconds",
+    "Tempo na fila de admissão das requisições que precisaram esperar",
+    ("route_class",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+))
+
+_WHITESPACE = re.compile(r"\s+")
+_MAX_STATEMENT_LENGTH = 120
+_slowest: Dict[str, float] = {}
+
+
+def normalize_statement(query) -> str:
+    """Rótulo estável para uma instrução SQL (espaços colapsados e truncada)"""
+    if not isinstance(query, str):
+        query = getattr(query, "as_string", lambda ctx: str(query))(None)
+    text = _WHITESPACE.sub(" ", query).strip()
+    return text[:_MAX_STATEMENT_LENGTH]
+
+
+def observe_query(query, duration: float, rows: int, failed: bool = False) -> None:
+    statement = normalize_statement(query)
+    db_query_duration_seconds.observe(duration, statement=statement)
+    if rows > 0:
+        db_query_rows_total.inc(rows, statement=statement)
+    if failed:
+        db_query_errors_total.inc(statement=statement)
+    if duration > _slowest.get(statement, 0.0):
+        _slowest[statement] = duration
+
+
+def slowest_statements(limit: int = 10) -> List[Tuple[str, float]]:
+    """Instruções com a maior duração observada"""
+    return sorted(_slowest.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+registry.register(CallbackGauge(
+    "soundmood_db_query_max_seconds",
+    "Maior duração observada das instruções mais lentas",
+    lambda: {(statement,): duration for statement, duration in slowest_statements()},
+    ("statement",)
+))
+
+# Spotify
+spotify_requests_total = registry.register(Counter(
+    "soundmood_spotify_requests_total",
+    "Requisições enviadas à Web API do Spotify",
+    ("endpoint", "status")
+))
+spotify_request_duration_seconds = registry.register(Histogram(
+    "soundmood_spotify_request_duration_seconds",
+    "Latência das requisições à Web API do Spotify",
+    ("endpoint",)
+))
+spotify_retries_total = registry.register(Counter(
+    "soundmood_spotify_retries_total",
+    "Novas tentativas de requisições ao Spotify por motivo",
+    ("reason",)
+))
+spotify_coalesced_total = registry.register(Counter(
+    "soundmood_spotify_coalesced_total",
+    "Chamadas atendidas por uma requisição idêntica já em andamento",
+    ("endpoint",)
+))
+spotify_rate_limit_wait_seconds_total = registry.register(Counter(
+    "soundmood_spotify_rate_limit_wait_seconds_total",
+    "Tempo total aguardando o limitador (token bucket e Retry-After)"
+))
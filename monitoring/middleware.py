@@ -0,0 +1,62 @@
+from typing import Optional
+import logging
+import time
+
+from monitoring.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def route_template(scope) -> str:
+    """Caminho da rota com os parâmetros no lugar dos valores, ex.: /api/v1/artigos/{artigo_id}
+
+    Vem da rota casada, nunca do caminho da requisição: o número de séries
+    fica limitado ao número de rotas.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "<unmatched>"
+    return getattr(route, "path_format", None) or getattr(route, "path", "<unmatched>")
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede latência, status e concorrência por rota"""
+
+    def __init__(self, app, slow_request_threshold: Optional[float] = None):
+        self.app = app
+        self.slow_request_threshold = slow_request_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            http_requests_in_flight.dec()
+
+            method = scope["method"]
+            route = route_template(scope)
+            http_request_duration_seconds.observe(duration, method=method, route=route)
+            http_requests_total.inc(method=method, route=route, status=str(status))
+
+            if self.slow_request_threshold is not None and duration >= self.slow_request_threshold:
+                logger.warning(
+                    f"Requisição lenta: {method} {scope['path']} -> {status} em {duration * 1000:.1f}ms"
+                )
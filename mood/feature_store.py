@@ -0,0 +1,266 @@
+"""Armazenamento vetorizado de audio features e classificação de humor
+
+Um diretório com arrays NumPy abertos por memory-map, linhas ordenadas por
+id da faixa:
+
+    ids.npy        ids das faixas (bytes de largura fixa, ordenados)
+    features.npy   features brutas (float32, n x len(FEATURE_COLUMNS))
+    vectors.npy    features padronizadas para similaridade (float32)
+    norms.npy      norma ao quadrado de cada vetor (float32)
+    meta.json      colunas, médias e desvios usados na padronização
+
+Nada é carregado para a memória do processo ao abrir; classificação e
+vizinhos mais próximos percorrem o arquivo em blocos.
+
+Uso:
+
+    python -m mood.feature_store build --library spotify_library.sqlite --out spotify_features
+    python -m mood.feature_store moods --store spotify_features
+    python -m mood.feature_store similar <track_id> --store spotify_features -k 10
+"""
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import argparse
+import json
+import sqlite3
+
+import numpy as np
+
+from config import settings
+
+FEATURE_COLUMNS = (
+    "valence", "energy", "danceability", "tempo", "acousticness",
+    "instrumentalness", "speechiness", "liveness", "loudness",
+)
+ID_DTYPE = "S22"  # ids do Spotify têm 22 caracteres base62
+DEFAULT_CHUNK_SIZE = 65_536
+
+# Quadrantes de valência x energia (modelo circumplexo de Russell)
+MOODS = ("feliz", "tenso", "triste", "calmo")
+UNKNOWN_MOOD = -1
+MOOD_THRESHOLD = 0.5
+
+_VALENCE = FEATURE_COLUMNS.index("valence")
+_ENERGY = FEATURE_COLUMNS.index("energy")
+
+
+def classify_moods(valence: np.ndarray, energy: np.ndarray) -> np.ndarray:
+    """Código de humor (índice em MOODS, -1 sem dados) para cada faixa"""
+    positive = valence >= MOOD_THRESHOLD
+    intense = energy >= MOOD_THRESHOLD
+    codes = np.where(
+        intense,
+        np.where(positive, 0, 1),
+        np.where(positive, 3, 2),
+    ).astype(np.int8)
+    codes[np.isnan(valence) | np.isnan(energy)] = UNKNOWN_MOOD
+    return codes
+
+
+def write_feature_store(
+    directory: Union[str, Path],
+    count: int,
+    rows: Iterable[Tuple[str, Sequence[Optional[float]]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> "FeatureStore":
+    """Gravar `count` linhas (id, features) já ordenadas por id"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    width = len(FEATURE_COLUMNS)
+    ids = np.lib.format.open_memmap(directory / "ids.npy", mode="w+", dtype=ID_DTYPE, shape=(count,))
+    raw = np.lib.format.open_memmap(
+        directory / "features.npy", mode="w+", dtype=np.float32, shape=(count, width)
+    )
+
+    written = 0
+    rows = iter(rows)
+    while written < count:
+        batch = list(islice(rows, min(chunk_size, count - written)))
+        if not batch:
+            break
+        end = written + len(batch)
+        ids[written:end] = [track_id.encode("ascii") for track_id, values in batch]
+        # None (feature ausente) vira NaN
+        raw[written:end] = np.array([values for track_id, values in batch], dtype=np.float64)
+        written = end
+    if written != count:
+        raise ValueError(f"Esperadas {count} linhas, recebidas {written}")
+    if count > 1 and np.any(ids[1:] < ids[:-1]):
+        raise ValueError("As linhas precisam estar ordenadas por id")
+
+    # Média e desvio em blocos, em float64, ignorando valores ausentes
+    total = np.zeros(width)
+    squares = np.zeros(width)
+    present = np.zeros(width)
+    for start in range(0, count, chunk_size):
+        block = raw[start:start + chunk_size].astype(np.float64)
+        mask = ~np.isnan(block)
+        block[~mask] = 0.0
+        total += block.sum(axis=0)
+        squares += (block * block).sum(axis=0)
+        present += mask.sum(axis=0)
+    mean = np.divide(total, present, out=np.zeros(width), where=present > 0)
+    variance = np.divide(squares, present, out=np.zeros(width), where=present > 0) - mean ** 2
+    scale = np.sqrt(np.maximum(variance, 0.0))
+    scale[scale == 0] = 1.0
+
+    vectors = np.lib.format.open_memmap(
+        directory / "vectors.npy", mode="w+", dtype=np.float32, shape=(count, width)
+    )
+    norms = np.lib.format.open_memmap(directory / "norms.npy", mode="w+", dtype=np.float32, shape=(count,))
+    for start in range(0, count, chunk_size):
+        block = (raw[start:start + chunk_size] - mean) / scale
+        # Ausente = média da coluna (zero depois da padronização)
+        block = np.nan_to_num(block, nan=0.0).astype(np.float32)
+        vectors[start:start + len(block)] = block
+        norms[start:start + len(block)] = np.einsum("ij,ij->i", block, block)
+
+    for array in (ids, raw, vectors, norms):
+        array.flush()
+    del ids, raw, vectors, norms
+    meta = {"columns": list(FEATURE_COLUMNS), "count": count, "mean": mean.tolist(), "scale": scale.tolist()}
+    (directory / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return FeatureStore(directory)
+
+
+def build_from_library(
+    library_db: str, directory: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> "FeatureStore":
+    """Montar o armazenamento a partir do SQLite da ingestão do Spotify"""
+    conn = sqlite3.connect(library_db)
+    try:
+        count = conn.execute("SELECT COUNT(*) FROM audio_features").fetchone()[0]
+        cursor = conn.execute(
+            f"SELECT track_id, {', '.join(FEATURE_COLUMNS)} FROM audio_features ORDER BY track_id"
+        )
+        rows = (
+            (row[0], row[1:])
+            for batch in iter(lambda: cursor.fetchmany(chunk_size), [])
+            for row in batch
+        )
+        return write_feature_store(directory, count, rows, chunk_size)
+    finally:
+        conn.close()
+
+
+class FeatureStore:
+    def __init__(self, directory: Union[str, Path], mmap: bool = True):
+        self.directory = Path(directory)
+        mode = "r" if mmap else None
+        self.meta = json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+        self.ids = np.load(self.directory / "ids.npy", mmap_mode=mode)
+        self.features = np.load(self.directory / "features.npy", mmap_mode=mode)
+        self.vectors = np.load(self.directory / "vectors.npy", mmap_mode=mode)
+        self.norms = np.load(self.directory / "norms.npy", mmap_mode=mode)
+        self.mean = np.asarray(self.meta["mean"], dtype=np.float32)
+        self.scale = np.asarray(self.meta["scale"], dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, track_id: str) -> int:
+        """Posição da faixa (busca binária nos ids ordenados); KeyError se ausente"""
+        key = np.array(track_id.encode("ascii"), dtype=ID_DTYPE)
+        index = int(np.searchsorted(self.ids, key))
+        if index >= len(self.ids) or self.ids[index] != key:
+            raise KeyError(track_id)
+        return index
+
+    def column(self, name: str) -> np.ndarray:
+        return self.features[:, FEATURE_COLUMNS.index(name)]
+
+    def moods(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """Código de humor de todas as faixas (int8, uma posição por faixa)"""
+        codes = np.empty(len(self), dtype=np.int8)
+        for start in range(0, len(self), chunk_size):
+            block = self.features[start:start + chunk_size]
+            codes[start:start + len(block)] = classify_moods(block[:, _VALENCE], block[:, _ENERGY])
+        return codes
+
+    def mood_counts(self) -> Dict[str, int]:
+        codes = self.moods()
+        counts = np.bincount(codes[codes != UNKNOWN_MOOD], minlength=len(MOODS))
+        result = {mood: int(count) for mood, count in zip(MOODS, counts)}
+        result["desconhecido"] = int(np.count_nonzero(codes == UNKNOWN_MOOD))
+        return result
+
+    def standardize(self, features: Sequence[float]) -> np.ndarray:
+        """Vetor de consulta a partir de features brutas (na ordem de FEATURE_COLUMNS)"""
+        vector = (np.asarray(features, dtype=np.float32) - self.mean) / self.scale
+        return np.nan_to_num(vector, nan=0.0)
+
+    def nearest_indices(
+        self, queries: np.ndarray, k: int = 10, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """k vizinhos (distância euclidiana) para cada linha de `queries`, em blocos
+
+        Devolve (índices, distâncias), ambos (len(queries), k), do mais próximo
+        para o mais distante.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self))
+        query_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+        best_dist = np.full((len(queries), 0), np.inf, dtype=np.float32)
+        best_index = np.empty((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, len(self), chunk_size):
+            block = self.vectors[start:start + chunk_size]
+            # |x - q|^2 = |x|^2 - 2 x.q + |q|^2
+            dist = self.norms[start:start + len(block)][None, :] - 2.0 * (queries @ block.T) + query_norms
+            if dist.shape[1] > k:
+                # Só os k melhores do bloco entram na disputa com os anteriores
+                local = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                dist = np.take_along_axis(dist, local, axis=1)
+            else:
+                local = np.broadcast_to(np.arange(len(block)), dist.shape)
+            candidates = np.concatenate([best_dist, dist], axis=1)
+            indices = np.concatenate([best_index, local + start], axis=1)
+            if candidates.shape[1] > k:
+                keep = np.argpartition(candidates, k - 1, axis=1)[:, :k]
+                candidates = np.take_along_axis(candidates, keep, axis=1)
+                indices = np.take_along_axis(indices, keep, axis=1)
+            best_dist, best_index = candidates, indices
+
+        order = np.argsort(best_dist, axis=1)
+        best_dist = np.take_along_axis(best_dist, order, axis=1)
+        best_index = np.take_along_axis(best_index, order, axis=1)
+        return best_index, np.sqrt(np.maximum(best_dist, 0.0))
+
+    def similar(self, track_id: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Faixas que "soam como" `track_id` (a própria faixa fica de fora)"""
+        index = self.index_of(track_id)
+        indices, distances = self.nearest_indices(self.vectors[index], k + 1)
+        return [
+            (self.ids[i].decode("ascii"), float(distance))
+            for i, distance in zip(indices[0], distances[0])
+            if i != index
+        ][:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="montar a partir do SQLite da ingestão")
+    build.add_argument("--library", default=settings.SPOTIFY_LIBRARY_DB)
+    build.add_argument("--out", default=settings.SPOTIFY_FEATURE_STORE)
+    moods = commands.add_parser("moods", help="contagem de faixas por humor")
+    moods.add_argument("--store", default=settings.SPOTIFY_FEATURE_STORE)
+    similar = commands.add_parser("similar", help="faixas parecidas com uma faixa")
+    similar.add_argument("track_id")
+    similar.add_argument("--store", default=settings.SPOTIFY_FEATURE_STORE)
+    similar.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        store = build_from_library(args.library, args.out)
+        print(f"{len(store)} faixas gravadas em {store.directory}")
+    elif args.command == "moods":
+        print(json.dumps(FeatureStore(args.store).mood_counts(), ensure_ascii=False, indent=2))
+    else:
+        for track_id, distance in FeatureStore(args.store).similar(args.track_id, args.k):
+            print(f"{track_id}\t{distance:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Índice de prefixos em memória para autocompletar títulos e DOIs
+
+Um array ordenado de chaves normalizadas (sem acentos, minúsculas, espaços
+colapsados), uma para o título e outra para o DOI de cada artigo. Cada chave
+termina em "\\x00<id>", o que a torna única e mantém juntas as chaves iguais.
+Um prefixo corresponde a um trecho contíguo do array, achado por busca
+binária. As k primeiras sugestões saem em ordem alfabética, sem varrer o
+resto do trecho.
+
+Inserções e remoções usam bisect (O(log n) para achar a posição e um memmove
+da lista de ponteiros). São baratas perto do ritmo de escrita do catálogo.
+
+As escritas deste processo atualizam o índice na hora. As que ele não vê
+(outros workers, migrações, psql) chegam pelo `AutocompleteRefresher`, que
+a cada intervalo compara uma impressão digital da tabela (contagem, soma das
+versões e maior id) e recarrega o índice do banco quando ela muda. Um UPDATE
+feito direto no banco sem incrementar `versao` não muda a impressão digital.
+"""
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+import re
+import unicodedata
+
+from config import settings
+from database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+_SEPARATOR = "\x00"
+# Blocos de diacríticos combinantes que o NFKD separa das letras base
+_COMBINING = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+_DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+LOAD_QUERY = """
+    SELECT id_artigo, titulo, DOI
+    FROM Artigos
+"""
+
+# Muda a cada inclusão, exclusão ou atualização feita pela API (versao + 1)
+FINGERPRINT_QUERY = """
+    SELECT count(*) AS total, coalesce(sum(versao), 0) AS versoes, coalesce(max(id_artigo), 0) AS ultimo
+    FROM Artigos
+"""
+
+
+def normalize(text: str) -> str:
+    """Forma de comparação: sem acentos, casefold e espaços colapsados"""
+    if not text.isascii():
+        text = _COMBINING.sub("", unicodedata.normalize("NFKD", text))
+    return " ".join(text.casefold().split())
+
+
+def normalize_query(text: str) -> str:
+    """Normalizar o texto digitado; URLs e o prefixo "doi:" viram o DOI puro"""
+    return normalize(_DOI_PREFIX.sub("", text.strip()).replace(_SEPARATOR, ""))
+
+
+class AutocompleteIndex:
+    def __init__(self):
+        self._keys: List[str] = []
+        # id -> (título, DOI) exibidos nas sugestões
+        self._entries: Dict[int, Tuple[str, Optional[str]]] = {}
+        # Escritas feitas durante uma recarga, reaplicadas no índice novo
+        self._journal: Optional[List[Tuple[int, Optional[str], Optional[str]]]] = None
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, str, Optional[str]]]) -> "AutocompleteIndex":
+        """Montar o índice de uma vez (uma ordenação, sem inserções uma a uma)"""
+        index = cls()
+        for artigo_id, titulo, doi in rows:
+            index._entries[artigo_id] = (titulo, doi)
+            index._keys.extend(_keys_for(artigo_id, titulo, doi))
+        index._keys.sort()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def upsert(self, artigo_id: int, titulo: str, doi: Optional[str]) -> None:
+        """Incluir ou atualizar um artigo"""
+        if self._journal is not None:
+            self._journal.append((artigo_id, titulo, doi))
+        self._remove(artigo_id)
+        self._entries[artigo_id] = (titulo, doi)
+        for key in _keys_for(artigo_id, titulo, doi):
+            insort(self._keys, key)
+
+    def remove(self, artigo_id: int) -> bool:
+        if self._journal is not None:
+            self._journal.append((artigo_id, None, None))
+        return self._remove(artigo_id)
+
+    def begin_reload(self) -> None:
+        """Passar a registrar as escritas; chamar antes de ler o banco"""
+        self._journal = []
+
+    def finish_reload(self, fresh: "AutocompleteIndex") -> None:
+        """Adotar o conteúdo de `fresh`, reaplicando as escritas feitas durante a carga"""
+        journal, self._journal = self._journal or [], None
+        for artigo_id, titulo, doi in journal:
+            if titulo is None:
+                fresh._remove(artigo_id)
+            else:
+                fresh.upsert(artigo_id, titulo, doi)
+        self._keys, self._entries = fresh._keys, fresh._entries
+
+    def abort_reload(self) -> None:
+        self._journal = None
+
+    def _remove(self, artigo_id: int) -> bool:
+        entry = self._entries.pop(artigo_id, None)
+        if entry is None:
+            return False
+        for key in _keys_for(artigo_id, *entry):
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+        return True
+
+    def complete(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Até k artigos cujo título ou DOI começa com `text`, em ordem alfabética"""
+        prefix = normalize_query(text)
+        if not prefix:
+            return []
+        suggestions = []
+        seen = set()
+        keys = self._keys
+        for position in range(bisect_left(keys, prefix), len(keys)):
+            key = keys[position]
+            if not key.startswith(prefix):
+                break
+            artigo_id = int(key[key.rindex(_SEPARATOR) + 1:])
+            if artigo_id in seen:
+                continue
+            seen.add(artigo_id)
+            titulo, doi = self._entries[artigo_id]
+            suggestions.append({"id_artigo": artigo_id, "titulo": titulo, "DOI": doi})
+            if len(suggestions) == k:
+                break
+        return suggestions
+
+    def stats(self) -> Dict[str, Any]:
+        return {"artigos": len(self._entries), "keys": len(self._keys)}
+
+
+def _keys_for(artigo_id: int, titulo: str, doi: Optional[str]) -> List[str]:
+    keys = [f"{normalize(titulo)}{_SEPARATOR}{artigo_id}"]
+    if doi:
+        keys.append(f"{normalize_query(doi)}{_SEPARATOR}{artigo_id}")
+    return keys
+
+
+async def autocomplete_fingerprint(db: Database) -> Tuple[int, int, int]:
+    async with db.cursor() as cursor:
+        await cursor.execute(FINGERPRINT_QUERY, prepare=True)
+        row = await cursor.fetchone()
+    return row["total"], row["versoes"], row["ultimo"]
+
+
+async def load_autocomplete_index(db: Database) -> AutocompleteIndex:
+    """Carregar o índice com todos os artigos, em lotes por um cursor do servidor"""
+    rows = []
+    async with db.cursor(name="load_autocomplete") as cursor:
+        try:
+            cursor.itersize = settings.ARTIGO_EXPORT_BATCH_SIZE
+            await cursor.execute(LOAD_QUERY)
+            async for row in cursor:
+                rows.append((row["id_artigo"], row["titulo"], row["doi"]))
+        except Exception as e:
+            logger.error(f"Erro ao carregar o índice de autocompletar: {e}")
+            raise
+    # A ordenação leva segundos em catálogos grandes: fora do event loop
+    return await asyncio.to_thread(AutocompleteIndex.build, rows)
+
+
+class AutocompleteRefresher:
+    """Recarrega o índice do banco quando a tabela muda fora deste processo
+
+    Uma escrita de outro processo aparece nas sugestões em até `interval`
+    mais a duração de uma recarga.
+    """
+
+    def __init__(
+        self,
+        index: AutocompleteIndex,
+        db: Database,
+        interval: float,
+        fingerprint: Optional[Tuple[int, int, int]] = None
+    ):
+        self.index = index
+        self.db = db
+        self.interval = interval
+        self.fingerprint = fingerprint
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.last_duration: Optional[float] = None
+        self.last_reloaded_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Erro ao recarregar o índice de autocompletar: {e}")
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Recarregar se a tabela mudou desde a última carga; True se recarregou"""
+        fingerprint = await autocomplete_fingerprint(self.db)
+        if not force and fingerprint == self.fingerprint:
+            self.unchanged += 1
+            return False
+
+        start = time.perf_counter()
+        self.index.begin_reload()
+        try:
+            fresh = await load_autocomplete_index(self.db)
+        except BaseException:
+            self.index.abort_reload()
+            raise
+        self.index.finish_reload(fresh)
+        self.fingerprint = fingerprint
+        self.reloads += 1
+        self.last_duration = time.perf_counter() - start
+        self.last_reloaded_at = time.time()
+        logger.info(
+            f"Índice de autocompletar recarregado com {len(self.index)} artigos em {self.last_duration:.2f}s"
+        )
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "reloads": self.reloads,
+            "unchanged": self.unchanged,
+            "failures": self.failures,
+            "last_reload_duration_seconds": self.last_duration,
+            "last_reloaded_at": self.last_reloaded_at,
+        }
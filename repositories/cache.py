@@ -0,0 +1,263 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import json
+import logging
+import time
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def artigo_key(artigo_id: int) -> str:
+    return f"artigo:{artigo_id}"
+
+
+def artigo_autores_key(artigo_id: int) -> str:
+    return f"artigo_autores:{artigo_id}"
+
+
+class CacheBackend:
+    """Interface dos backends de cache; os valores são dicts serializáveis em JSON"""
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class LRUCacheBackend(CacheBackend):
+    """Cache em memória do processo, limitado por tamanho (LRU) e por TTL"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache compartilhado entre workers; expiração e despejo ficam a cargo do Redis"""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "soundmood:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("ARTIGO_CACHE_REDIS_URL requer o pacote 'redis'")
+
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.client.set(
+            self.prefix + key, json.dumps(value, default=str), ex=max(1, int(self.ttl))
+        )
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "ttl": self.ttl}
+
+
+class ValidatorCache:
+    """ETags recentes por chave: responde If-None-Match sem ler o cache de artigos nem o banco"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.backend = LRUCacheBackend(max_size, ttl)
+        self.hits = 0
+        self.misses = 0
+        # Mesmo papel do epoch do ArtigoCache: não gravar um ETag lido antes de uma escrita
+        self.epoch = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        etag = await self.backend.get(key)
+        if etag is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return etag
+
+    async def set(self, key: str, etag: str, epoch: int) -> None:
+        if epoch == self.epoch:
+            await self.backend.set(key, etag)
+
+    async def invalidate(self, *keys: str) -> None:
+        self.epoch += 1
+        await self.backend.delete(*keys)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            **self.backend.stats(),
+        }
+
+
+class ArtigoCache:
+    """Cache read-through para as consultas de artigo por ID"""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Incrementado a cada invalidação: uma leitura iniciada antes de uma
+        # escrita não grava no cache um valor que já pode estar obsoleto
+        self._epoch = 0
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Falha ao ler do cache {key}: {e}")
+            value = None
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        epoch = self._epoch
+        value = await loader()
+        if value is not None and epoch == self._epoch:
+            try:
+                await self.backend.set(key, value)
+            except Exception as e:
+                logger.warning(f"Falha ao gravar no cache {key}: {e}")
+        return value
+
+    async def get_many_or_load(
+        self,
+        keys: Dict[Hashable, str],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Dict[str, Any]]]]
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """Versão em lote de get_or_load: uma única carga para todas as ausências"""
+        found = {}
+        missing = []
+        for ident, key in keys.items():
+            try:
+                value = await self.backend.get(key)
+            except Exception as e:
+                logger.warning(f"Falha ao ler do cache {key}: {e}")
+                value = None
+
+            if value is not None:
+                found[ident] = value
+            else:
+                missing.append(ident)
+
+        self.hits += len(found)
+        self.misses += len(missing)
+        if not missing:
+            return found
+
+        epoch = self._epoch
+        loaded = await loader(missing)
+        if epoch == self._epoch:
+            for ident, value in loaded.items():
+                try:
+                    await self.backend.set(keys[ident], value)
+                except Exception as e:
+                    logger.warning(f"Falha ao gravar no cache {keys[ident]}: {e}")
+        found.update(loaded)
+        return found
+
+    async def invalidate_artigo(self, artigo_id: int) -> None:
+        """Remover todas as entradas derivadas de um artigo"""
+        self._epoch += 1
+        self.invalidations += 1
+        try:
+            await self.backend.delete(artigo_key(artigo_id), artigo_autores_key(artigo_id))
+        except Exception as e:
+            # A escrita já foi confirmada; a entrada expira pelo TTL
+            logger.error(f"Falha ao invalidar cache do artigo {artigo_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+            **self.backend.stats(),
+        }
+
+
+def local_cache_sees_all_writes() -> bool:
+    """Um único worker sem Redis: toda escrita passa por este processo"""
+    return not settings.ARTIGO_CACHE_REDIS_URL and settings.WEB_CONCURRENCY <= 1
+
+
+def build_validator_cache() -> ValidatorCache:
+    """Criar o cache de ETags; desativado quando outro processo pode escrever
+
+    Uma escrita em outro worker não invalida os ETags guardados aqui, e o
+    cache responderia 304 para a versão antiga até o TTL.
+    """
+    size = settings.ARTIGO_VALIDATOR_CACHE_SIZE if local_cache_sees_all_writes() else 0
+    return ValidatorCache(size, settings.ARTIGO_CACHE_TTL)
+
+
+def build_artigo_cache() -> ArtigoCache:
+    """Criar o cache de artigos conforme as configurações"""
+    if settings.ARTIGO_CACHE_REDIS_URL:
+        backend = RedisCacheBackend(settings.ARTIGO_CACHE_REDIS_URL, settings.ARTIGO_CACHE_TTL)
+    else:
+        backend = LRUCacheBackend(settings.ARTIGO_CACHE_MAX_SIZE, settings.ARTIGO_CACHE_TTL)
+    return ArtigoCache(backend)
@@ -0,0 +1,22 @@
+"""Cursor opaco da paginação keyset da listagem de artigos"""
+from typing import Tuple
+import base64
+import json
+
+
+def encode_cursor(titulo: str, id_artigo: int) -> str:
+    """Gerar cursor opaco a partir da última linha da página"""
+    raw = json.dumps([titulo, id_artigo], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Recuperar (titulo, id_artigo) de um cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        titulo, id_artigo = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(titulo, str) or not isinstance(id_artigo, int):
+            raise TypeError
+        return titulo, id_artigo
+    except (ValueError, TypeError):
+        raise ValueError("Cursor de paginação inválido")
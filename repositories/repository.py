@@ -1,246 +1,673 @@
-from typing import List, Optional
-from app.database.connection import Database
-from app.database.connection import get_db_cursor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+from datetime import date
+from pydantic import ValidationError
+import psycopg
+from config import settings
+from database.connection import Database, get_database
+from database.view_refresh import ViewRefresher
+from repositories.cache import ArtigoCache, artigo_autores_key, artigo_key, build_artigo_cache, build_validator_cache
+from repositories.autocomplete import AutocompleteIndex
+from repositories.singleflight import SingleFlight
+from repositories.pagination import decode_cursor, encode_cursor
+from repositories.search import DOI_QUERY, PREFIX_QUERY, TEXT_QUERY, ArtigoSearch
 from app.schemas.artigo import ArtigoCreate, ArtigoUpdate, ArtigoResponse, ArtigoWithAuthors
+from app.schemas.artigo import BulkImportError, BulkImportResult
+import hashlib
+import json
 import logging
+import time
 
 from app.schemas.schemas import Artigo
 from app.services import estoque_service
 
 logger = logging.getLogger(__name__)
 
+# Consultas fixas: executadas com prepare=True, cada conexão as planeja uma única vez
+CREATE_TITULO_QUERY = """
+    INSERT INTO Titulo (tipo_midia) 
+    VALUES ('artigo') 
+    RETURNING id_titulo
+"""
+
+CREATE_ARTIGO_QUERY = """
+    INSERT INTO Artigos (id_artigo, titulo, DOI, publicadora, data_publicacao)
+    VALUES (%s, %s, %s, %s, %s)
+    RETURNING id_artigo, titulo, DOI, publicadora, data_publicacao, versao
+"""
+
+BULK_TITULO_QUERY = """
+    INSERT INTO Titulo (tipo_midia)
+    SELECT 'artigo' FROM generate_series(1, %s)
+    RETURNING id_titulo
+"""
+
+BULK_ARTIGO_QUERY = """
+    INSERT INTO Artigos (id_artigo, titulo, DOI, publicadora, data_publicacao)
+    SELECT * FROM unnest(%s::integer[], %s::text[], %s::text[], %s::text[], %s::date[])
+"""
+
+ARTIGO_BY_ID_QUERY = """
+    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao, versao
+    FROM Artigos 
+    WHERE id_artigo = %s
+"""
+
+# Keyset: custo constante independente da profundidade da página
+ARTIGOS_KEYSET_QUERY = """
+    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao, versao
+    FROM Artigos 
+    WHERE (titulo, id_artigo) > (%s, %s)
+    ORDER BY titulo, id_artigo
+    LIMIT %s
+"""
+
+ARTIGOS_OFFSET_QUERY = """
+    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao, versao
+    FROM Artigos 
+    ORDER BY titulo, id_artigo
+    LIMIT %s OFFSET %s
+"""
+
+ESTOQUE_COUNT_QUERY = """
+    SELECT COUNT(*) AS counter 
+    FROM Estoque e
+    INNER JOIN Titulo t ON e.id_titulo = t.id_titulo
+    WHERE t.id_titulo = %s
+"""
+
+DELETE_ARTIGO_QUERY = "DELETE FROM Artigos WHERE id_artigo = %s"
+DELETE_TITULO_QUERY = "DELETE FROM Titulo WHERE id_titulo = %s"
+
+# Autores agregados no servidor: uma linha por artigo, em uma única ida ao banco
+ARTIGOS_WITH_AUTHORS_QUERY = """
+    SELECT a.id_artigo, a.titulo, a.DOI AS "DOI", a.publicadora, a.data_publicacao, a.versao,
+        COALESCE(
+            json_agg(
+                json_build_object('id_autor', au.id_autor, 'nome', au.nome)
+                ORDER BY au.nome
+            ) FILTER (WHERE au.id_autor IS NOT NULL),
+            '[]'::json
+        ) AS autores
+    FROM Artigos a
+    LEFT JOIN Autorias aut ON a.id_artigo = aut.id_titulo
+    LEFT JOIN Autores au ON aut.id_autor = au.id_autor
+    WHERE a.id_artigo = ANY(%s)
+    GROUP BY a.id_artigo
+"""
+
+
+def artigo_response(row: Dict[str, Any]) -> ArtigoResponse:
+    """ArtigoResponse de uma linha do banco (o Postgres devolve DOI como "doi")"""
+    return ArtigoResponse(**{**row, "DOI": row["doi"]})
+
+
+def artigo_etag(row: Dict[str, Any]) -> str:
+    """ETag forte de um artigo: id e versão da linha"""
+    return f'"{row["id_artigo"]}.{row.get("versao", 0)}"'
+
+
+def autores_etag(entry: Dict[str, Any]) -> str:
+    """ETag do artigo com autores; as autorias mudam sem alterar a versão do artigo"""
+    autores = json.dumps(entry.get("autores", []), sort_keys=True, separators=(",", ":"))
+    digest = hashlib.blake2b(autores.encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{entry["id_artigo"]}.{entry.get("versao", 0)}.{digest}"'
+
+
+def page_etag(rows: List[Dict[str, Any]]) -> str:
+    """ETag de uma página da listagem: ids e versões, na ordem da página"""
+    digest = hashlib.blake2b(digest_size=12)
+    for row in rows:
+        digest.update(f"{row['id_artigo']}.{row.get('versao', 0)};".encode("ascii"))
+    return f'"p{digest.hexdigest()}"'
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'registro'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+async def _aiter(records: Union[Iterable[Any], AsyncIterable[Any]]):
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
 class ArtigoService:
-    def __init__(self):
-        self.db = Database()
+    def __init__(
+        self,
+        db: Optional[Database] = None,
+        cache: Optional[ArtigoCache] = None,
+        estoque_view: Optional[ViewRefresher] = None,
+        autocomplete: Optional[AutocompleteIndex] = None
+    ):
+        self.db = db or get_database()
+        self.cache = cache or build_artigo_cache()
+        self.search = ArtigoSearch(self.db)
+        self.validators = build_validator_cache()
+        # Vários workers sem Redis: o cache em memória não vê as escritas dos
+        # outros processos, então o ETag comparado com If-None-Match vem do banco.
+        # Com Redis ele sai do cache compartilhado, invalidado por quem escreve.
+        self.validate_from_db = not settings.ARTIGO_CACHE_REDIS_URL and settings.WEB_CONCURRENCY > 1
+        # Leituras idênticas simultâneas compartilham uma única consulta
+        self.flights = SingleFlight(settings.ARTIGO_SINGLE_FLIGHT)
+        # Atualiza a view do estoque em segundo plano depois das escritas
+        self.estoque_view = estoque_view
+        # Índice de autocompletar, mantido em dia pelas escritas deste serviço
+        self.autocomplete = autocomplete
+
+    async def _invalidate(self, artigo_id: int) -> None:
+        """Descartar entradas de cache e ETags do artigo depois de uma escrita"""
+        # Antes do primeiro await: enquanto o delete vai ao Redis, uma leitura
+        # nova não pode se juntar a uma carga iniciada antes da escrita
+        self._cancel_reads(artigo_id)
+        await self.cache.invalidate_artigo(artigo_id)
+        await self.validators.invalidate(artigo_key(artigo_id), artigo_autores_key(artigo_id))
+
+    def _cancel_reads(self, artigo_id: Optional[int] = None) -> None:
+        """Descartar leituras coalescidas em andamento que a escrita pode ter alterado"""
+        if artigo_id is not None:
+            self.flights.cancel(("artigo", artigo_id), ("artigo_autores", artigo_id))
+        # Qualquer escrita pode mudar páginas da listagem e resultados de busca
+        self.flights.cancel_method("list", "search")
+
+    def _estoque_changed(self) -> None:
+        if self.estoque_view is not None:
+            self.estoque_view.mark_dirty()
+
+    def _index_artigo(self, row: Dict[str, Any]) -> None:
+        if self.autocomplete is not None:
+            self.autocomplete.upsert(row['id_artigo'], row['titulo'], row['doi'])
+
+    def _unindex_artigo(self, artigo_id: int) -> None:
+        if self.autocomplete is not None:
+            self.autocomplete.remove(artigo_id)
+
+    async def warmup(self, cache_size: int = settings.ARTIGO_WARMUP_CACHE_SIZE) -> Dict[str, Any]:
+        """Preparar as consultas de leitura no pool e pré-carregar o cache
+
+        Os primeiros artigos da listagem entram no cache (por ID e com autores)
+        e um deles serve de parâmetro para preparar as consultas por ID.
+        """
+        start = time.perf_counter()
+        rows = []
+        if cache_size > 0:
+            async with self.db.cursor() as cursor:
+                await cursor.execute(ARTIGOS_OFFSET_QUERY, (cache_size, 0), prepare=True)
+                rows = await cursor.fetchall()
+
+        # Parâmetros com os mesmos tipos das requisições reais: o prepared
+        # statement é reaproveitado só quando os tipos coincidem
+        sample = rows[-1] if rows else {"id_artigo": 1, "titulo": ""}
+        connections = await self.db.prime([
+            (ARTIGOS_OFFSET_QUERY, (100, 0)),
+            (ARTIGOS_KEYSET_QUERY, (sample["titulo"], sample["id_artigo"], 100)),
+            (ARTIGO_BY_ID_QUERY, (sample["id_artigo"],)),
+            (ARTIGOS_WITH_AUTHORS_QUERY, ([sample["id_artigo"]],)),
+            (DOI_QUERY, ("10.0000/warmup",)),
+            (TEXT_QUERY, ("warmup", "warmup", 20, 0)),
+            (PREFIX_QUERY, ("warmup:*", "warmup:*", 20, 0)),
+        ])
+
+        if rows:
+            by_id = {row["id_artigo"]: row for row in rows}
+
+            async def loader(ids: List[int]) -> Dict[int, dict]:
+                return {artigo_id: by_id[artigo_id] for artigo_id in ids}
+
+            await self.cache.get_many_or_load(
+                {artigo_id: artigo_key(artigo_id) for artigo_id in by_id}, loader
+            )
+            await self.get_artigos_with_authors(list(by_id))
+
+        return {
+            "connections": connections,
+            "cached_artigos": len(rows),
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
 
     async def create_artigo(self, artigo_data: ArtigoCreate) -> ArtigoResponse:
         """Criar um novo artigo"""
-        with get_db_cursor() as cursor:
+        async with self.db.cursor() as cursor:
             try:
                 # Primeiro inserir na tabela Titulo
-                titulo_query = """
-                    INSERT INTO Titulo (tipo_midia) 
-                    VALUES ('artigo') 
-                    RETURNING id_titulo
-                """
-                cursor.execute(titulo_query)
-                id_titulo = cursor.fetchone()['id_titulo']
+                await cursor.execute(CREATE_TITULO_QUERY, prepare=True)
+                id_titulo = (await cursor.fetchone())['id_titulo']
                 
                 # Depois inserir na tabela Artigos
-                artigo_query = """
-                    INSERT INTO Artigos (id_artigo, titulo, DOI, publicadora, data_publicacao)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id_artigo, titulo, DOI, publicadora, data_publicacao
-                """
-                cursor.execute(artigo_query, (
+                await cursor.execute(CREATE_ARTIGO_QUERY, (
                     id_titulo,
                     artigo_data.titulo,
                     artigo_data.DOI,
                     artigo_data.publicadora,
                     artigo_data.data_publicacao
-                ))
+                ), prepare=True)
                 
-                result = cursor.fetchone()
-                # estoque_service.reload_materialized_view()  
-                return ArtigoResponse(**result)
+                result = await cursor.fetchone()
                 
             except Exception as e:
                 logger.error(f"Erro ao criar artigo: {e}")
                 raise
+
+        await self._invalidate(result['id_artigo'])
+        self._estoque_changed()
+        self._index_artigo(result)
+        return artigo_response(result)
             
 
+    async def bulk_create_artigos(
+        self, records: Union[Iterable[Any], AsyncIterable[Any]]
+    ) -> BulkImportResult:
+        """Importar artigos em lote, uma transação por bloco
+
+        Cada registro pode ser um dict ou uma linha JSON ainda não decodificada.
+        Registros inválidos são reportados sem interromper a importação.
+        """
+        start = time.perf_counter()
+        received = 0
+        inserted = 0
+        errors: List[BulkImportError] = []
+        chunk = []
+
+        async for record in _aiter(records):
+            chunk.append((received, record))
+            received += 1
+            if len(chunk) >= settings.ARTIGO_BULK_CHUNK_SIZE:
+                inserted += await self._import_committed_chunk(chunk, errors)
+                chunk = []
+        if chunk:
+            inserted += await self._import_committed_chunk(chunk, errors)
+
+        # Ids recém-alocados nunca estiveram no cache; não há o que invalidar
+        elapsed = time.perf_counter() - start
+        return BulkImportResult(
+            received=received,
+            inserted=inserted,
+            failed=len(errors),
+            errors=errors,
+            elapsed_seconds=elapsed,
+            rows_per_second=inserted / elapsed if elapsed > 0 else 0.0
+        )
+
+    async def _import_committed_chunk(
+        self, chunk: List[Tuple[int, Any]], errors: List[BulkImportError]
+    ) -> int:
+        added: List[Tuple[int, ArtigoCreate]] = []
+        inserted = await self._import_chunk(chunk, errors, added)
+        # Cada bloco já foi confirmado; view e autocompletar acompanham cargas longas
+        if inserted:
+            self._estoque_changed()
+            self._cancel_reads()
+        for artigo_id, artigo in added:
+            self._index_artigo({'id_artigo': artigo_id, 'titulo': artigo.titulo, 'doi': artigo.DOI})
+        return inserted
+
+    async def _import_chunk(
+        self,
+        chunk: List[Tuple[int, Any]],
+        errors: List[BulkImportError],
+        added: List[Tuple[int, ArtigoCreate]]
+    ) -> int:
+        valid = []
+        for index, record in chunk:
+            try:
+                if isinstance(record, (str, bytes)):
+                    valid.append((index, ArtigoCreate.model_validate_json(record)))
+                else:
+                    valid.append((index, ArtigoCreate.model_validate(record)))
+            except ValidationError as e:
+                errors.append(BulkImportError(index=index, error=_format_validation_error(e)))
+
+        if not valid:
+            return 0
+
+        async with self.db.cursor() as cursor:
+            async with cursor.connection.transaction():
+                try:
+                    artigos = [artigo for _, artigo in valid]
+                    async with cursor.connection.transaction():
+                        ids = await self._insert_artigos(cursor, artigos)
+                    added.extend(zip(ids, artigos))
+                    return len(valid)
+                except psycopg.Error as e:
+                    logger.warning(f"Erro ao inserir bloco, reprocessando linha a linha: {e}")
+
+                # Savepoint por linha para isolar as que violam restrições do banco
+                inserted = 0
+                for index, artigo in valid:
+                    try:
+                        async with cursor.connection.transaction():
+                            ids = await self._insert_artigos(cursor, [artigo])
+                        added.extend(zip(ids, [artigo]))
+                        inserted += 1
+                    except psycopg.Error as e:
+                        errors.append(BulkImportError(index=index, error=str(e).strip()))
+                return inserted
+
+    async def _insert_artigos(self, cursor, artigos: List[ArtigoCreate]) -> List[int]:
+        # Alocar todos os ids de Titulo em uma única instrução
+        await cursor.execute(BULK_TITULO_QUERY, (len(artigos),), prepare=True)
+        ids = [row['id_titulo'] for row in await cursor.fetchall()]
+
+        await cursor.execute(BULK_ARTIGO_QUERY, (
+            ids,
+            [artigo.titulo for artigo in artigos],
+            [artigo.DOI for artigo in artigos],
+            [artigo.publicadora for artigo in artigos],
+            [artigo.data_publicacao for artigo in artigos]
+        ), prepare=True)
+        return ids
+
     async def get_artigo_by_id(self, artigo_id: int) -> Optional[ArtigoResponse]:
         """Buscar artigo por ID"""
-        with get_db_cursor() as cursor:
-            try:
-                query = """
-                    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
-                    FROM Artigos 
-                    WHERE id_artigo = %s
-                """
-                cursor.execute(query, (artigo_id,))
-                result = cursor.fetchone()
-                
-                if result:
-                    return ArtigoResponse(**result)
+        result = await self.cache.get_or_load(
+            artigo_key(artigo_id), lambda: self._fetch_artigo_by_id(artigo_id)
+        )
+        if result:
+            return artigo_response(result)
+        return None
+
+    async def artigo_etag(self, artigo_id: int) -> Optional[str]:
+        """ETag atual do artigo; do cache de validadores quando possível"""
+        key = artigo_key(artigo_id)
+        etag = await self.validators.get(key)
+        if etag is None:
+            epoch = self.validators.epoch
+            if self.validate_from_db:
+                row = await self._fetch_artigo_by_id(artigo_id)
+            else:
+                row = await self.cache.get_or_load(key, lambda: self._fetch_artigo_by_id(artigo_id))
+            if row is None:
                 return None
+            etag = artigo_etag(row)
+            await self.validators.set(key, etag, epoch)
+        return etag
+
+    async def get_artigo_and_etag(self, artigo_id: int) -> Tuple[Optional[ArtigoResponse], Optional[str]]:
+        """Buscar artigo por ID junto com o ETag da mesma versão"""
+        key = artigo_key(artigo_id)
+        epoch = self.validators.epoch
+        row = await self.cache.get_or_load(key, lambda: self._fetch_artigo_by_id(artigo_id))
+        if not row:
+            return None, None
+        etag = artigo_etag(row)
+        await self.validators.set(key, etag, epoch)
+        return artigo_response(row), etag
+
+    async def _fetch_artigo_by_id(self, artigo_id: int) -> Optional[dict]:
+        return await self.flights.do(("artigo", artigo_id), lambda: self._query_artigo_by_id(artigo_id))
+
+    async def _query_artigo_by_id(self, artigo_id: int) -> Optional[dict]:
+        async with self.db.cursor() as cursor:
+            try:
+                await cursor.execute(ARTIGO_BY_ID_QUERY, (artigo_id,), prepare=True)
+                return await cursor.fetchone()
                 
             except Exception as e:
-                print(f"Erro ao buscar artigo {artigo_id}: {e}")
                 logger.error(f"Erro ao buscar artigo {artigo_id}: {e}")
                 raise
         
 
-    async def get_artigos(self, skip: int = 0, limit: int = 100) -> List[ArtigoResponse]:
-        """Listar artigos com paginação"""
-        with get_db_cursor() as cursor:
+    async def get_artigos(
+        self, skip: int = 0, limit: int = 100, page_cursor: Optional[str] = None
+    ) -> List[ArtigoResponse]:
+        """Listar artigos com paginação por offset ou por cursor (keyset)"""
+        rows = await self.get_artigo_rows(skip=skip, limit=limit, page_cursor=page_cursor)
+        return [Artigo(**row) for row in rows]
+
+    async def get_artigo_rows(
+        self, skip: int = 0, limit: int = 100, page_cursor: Optional[str] = None
+    ) -> List[dict]:
+        """Linhas da listagem como vieram do banco, para serialização direta em JSON"""
+        # O cursor é validado antes de ocupar uma conexão do pool
+        after = decode_cursor(page_cursor) if page_cursor else None
+        return await self.flights.do(
+            ("list", skip, limit, page_cursor), lambda: self._query_artigo_rows(skip, limit, after)
+        )
+
+    async def _query_artigo_rows(
+        self, skip: int, limit: int, after: Optional[Tuple[str, int]]
+    ) -> List[dict]:
+        async with self.db.cursor() as cursor:
             try:
-                query = """
-                    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
-                    FROM Artigos 
-                    ORDER BY titulo
-                    LIMIT %s OFFSET %s
-                """
-                cursor.execute(query, (limit, skip))
-                results = cursor.fetchall()
-                print(results)
-                
-                return [Artigo(**row) for row in results]
+                if after:
+                    await cursor.execute(ARTIGOS_KEYSET_QUERY, (*after, limit), prepare=True)
+                else:
+                    await cursor.execute(ARTIGOS_OFFSET_QUERY, (limit, skip), prepare=True)
+                return await cursor.fetchall()
                 
             except Exception as e:
                 logger.error(f"Erro ao listar artigos: {e}")
                 raise
         
 
+    async def export_artigos(
+        self,
+        publicadora: Optional[str] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> AsyncIterator[dict]:
+        """Percorrer o catálogo com um cursor do servidor, em lotes"""
+        conditions = []
+        params = []
+        if publicadora is not None:
+            conditions.append("publicadora = %s")
+            params.append(publicadora)
+        if data_inicio is not None:
+            conditions.append("data_publicacao >= %s")
+            params.append(data_inicio)
+        if data_fim is not None:
+            conditions.append("data_publicacao <= %s")
+            params.append(data_fim)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+            SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
+            FROM Artigos
+            {where}
+            ORDER BY id_artigo
+        """
+        async with self.db.cursor(name="export_artigos") as cursor:
+            try:
+                cursor.itersize = settings.ARTIGO_EXPORT_BATCH_SIZE
+                await cursor.execute(query, params)
+                async for row in cursor:
+                    yield row
+                    
+            except Exception as e:
+                logger.error(f"Erro ao exportar artigos: {e}")
+                raise
+        
+
     async def update_artigo(self, artigo_id: int, artigo_data: ArtigoUpdate) -> Optional[Artigo]:
         """Atualizar artigo"""
-        with get_db_cursor() as cursor:
+        # Construir query dinamicamente baseado nos campos fornecidos
+        fields = []
+        values = []
+        
+        if artigo_data.titulo is not None:
+            fields.append("titulo = %s")
+            values.append(artigo_data.titulo)
+        if artigo_data.DOI is not None:
+            fields.append("DOI = %s")
+            values.append(artigo_data.DOI)
+        if artigo_data.publicadora is not None:
+            fields.append("publicadora = %s")
+            values.append(artigo_data.publicadora)
+        if artigo_data.data_publicacao is not None:
+            fields.append("data_publicacao = %s")
+            values.append(artigo_data.data_publicacao)
+        
+        # Antes de abrir o cursor: get_artigo_by_id pega a sua própria conexão do pool
+        if not fields:
+            return await self.get_artigo_by_id(artigo_id)
+        
+        values.append(artigo_id)
+        # A versão muda a cada escrita e com ela o ETag do artigo
+        fields.append("versao = versao + 1")
+        query = f"""
+            UPDATE Artigos 
+            SET {', '.join(fields)}
+            WHERE id_artigo = %s
+            RETURNING id_artigo, titulo, DOI, publicadora, data_publicacao, versao
+        """
+        
+        async with self.db.cursor() as cursor:
             try:
-                # Construir query dinamicamente baseado nos campos fornecidos
-                fields = []
-                values = []
-                
-                if artigo_data.titulo is not None:
-                    fields.append("titulo = %s")
-                    values.append(artigo_data.titulo)
-                if artigo_data.DOI is not None:
-                    fields.append("DOI = %s")
-                    values.append(artigo_data.DOI)
-                if artigo_data.publicadora is not None:
-                    fields.append("publicadora = %s")
-                    values.append(artigo_data.publicadora)
-                if artigo_data.data_publicacao is not None:
-                    fields.append("data_publicacao = %s")
-                    values.append(artigo_data.data_publicacao)
-                
-                if not fields:
-                    return await self.get_artigo_by_id(artigo_id)
-                
-                values.append(artigo_id)
-                query = f"""
-                    UPDATE Artigos 
-                    SET {', '.join(fields)}
-                    WHERE id_artigo = %s
-                    RETURNING id_artigo, titulo, DOI, publicadora, data_publicacao
-                """
-                
-                cursor.execute(query, values)
-                result = cursor.fetchone()
-                
-                if result:
-                    return ArtigoResponse(**result)
-                return None
+                await cursor.execute(query, values)
+                result = await cursor.fetchone()
                 
             except Exception as e:
                 logger.error(f"Erro ao atualizar artigo {artigo_id}: {e}")
                 raise
+
+        # Invalidar só depois do commit, para não recarregar o valor antigo
+        await self._invalidate(artigo_id)
+        if result:
+            self._estoque_changed()
+            self._index_artigo(result)
+            return artigo_response(result)
+        return None
             
 
     async def delete_artigo(self, artigo_id: int) -> bool:
         """Excluir artigo"""
-        with get_db_cursor() as cursor:
+        async with self.db.cursor() as cursor:
             try:
                 # Verificar se existe no estoque
-                check_query = """
-                    SELECT COUNT(*) AS counter 
-                    FROM Estoque e
-                    INNER JOIN Titulo t ON e.id_titulo = t.id_titulo
-                    WHERE t.id_titulo = %s
-                """
-                cursor.execute(check_query, (artigo_id,))
-                count = cursor.fetchone()['counter']
+                await cursor.execute(ESTOQUE_COUNT_QUERY, (artigo_id,), prepare=True)
+                count = (await cursor.fetchone())['counter']
                 
                 if count > 0:
                     raise ValueError("Não é possível excluir artigo que possui exemplares no estoque")
                 
                 # Excluir artigo
-                delete_artigo_query = "DELETE FROM Artigos WHERE id_artigo = %s"
-                cursor.execute(delete_artigo_query, (artigo_id,))
+                await cursor.execute(DELETE_ARTIGO_QUERY, (artigo_id,), prepare=True)
                 
                 # Excluir da tabela Titulo
-                delete_titulo_query = "DELETE FROM Titulo WHERE id_titulo = %s"
-                cursor.execute(delete_titulo_query, (artigo_id,))
+                await cursor.execute(DELETE_TITULO_QUERY, (artigo_id,), prepare=True)
                 
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
                 
             except Exception as e:
                 logger.error(f"Erro ao excluir artigo {artigo_id}: {e}")
                 raise
+
+        await self._invalidate(artigo_id)
+        if deleted:
+            self._estoque_changed()
+            self._unindex_artigo(artigo_id)
+        return deleted
             
 
-    async def search_artigos(self, query: str) -> List[ArtigoResponse]:
-        """Buscar artigos por título, DOI ou publicadora"""
-        with get_db_cursor() as cursor:
-            try:
-                search_query = """
-                    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
-                    FROM Artigos 
-                    WHERE titulo ILIKE %s OR DOI ILIKE %s OR publicadora ILIKE %s
-                    ORDER BY titulo
-                """
-                search_param = f"%{query}%"
-                cursor.execute(search_query, (search_param, search_param, search_param))
-                results = cursor.fetchall()
-                
-                return [
-                    ArtigoResponse(**row)
-                    for row in results
-                ]
-                
-            except Exception as e:
-                logger.error(f"Erro ao buscar artigos: {e}")
-                raise
+    async def search_artigos(self, query: str, skip: int = 0, limit: int = 20) -> List[ArtigoResponse]:
+        """Buscar artigos por título, DOI ou publicadora, ordenados por relevância"""
+        results = await self.search_artigo_rows(query, skip=skip, limit=limit)
+        return [
+            artigo_response(row)
+            for row in results
+        ]
+
+    async def search_artigo_rows(self, query: str, skip: int = 0, limit: int = 20) -> List[dict]:
+        """Resultados da busca como vieram do banco, para serialização direta em JSON"""
+        try:
+            return await self.flights.do(
+                ("search", query, skip, limit), lambda: self.search.search(query, skip=skip, limit=limit)
+            )
+            
+        except Exception as e:
+            logger.error(f"Erro ao buscar artigos: {e}")
+            raise
         
 
+    async def autocomplete_artigos(self, text: str, limit: int = 10) -> List[dict]:
+        """Sugestões por prefixo de título ou DOI; sem o índice, cai na busca textual"""
+        if self.autocomplete is not None:
+            return self.autocomplete.complete(text, limit)
+        rows = await self.search_artigo_rows(text, limit=limit)
+        return [{"id_artigo": row["id_artigo"], "titulo": row["titulo"], "DOI": row["doi"]} for row in rows]
+
     async def get_artigo_with_authors(self, artigo_id: int) -> Optional[ArtigoWithAuthors]:
         """Buscar artigo com seus autores"""
-        with get_db_cursor() as cursor:
+        result = await self.cache.get_or_load(
+            artigo_autores_key(artigo_id), lambda: self._fetch_artigo_with_authors(artigo_id)
+        )
+        if result:
+            return ArtigoWithAuthors(**result)
+        return None
+
+    async def artigo_with_authors_etag(self, artigo_id: int) -> Optional[str]:
+        """ETag atual do artigo com autores; do cache de validadores quando possível"""
+        key = artigo_autores_key(artigo_id)
+        etag = await self.validators.get(key)
+        if etag is None:
+            epoch = self.validators.epoch
+            if self.validate_from_db:
+                entry = await self._fetch_artigo_with_authors(artigo_id)
+            else:
+                entry = await self.cache.get_or_load(key, lambda: self._fetch_artigo_with_authors(artigo_id))
+            if entry is None:
+                return None
+            etag = autores_etag(entry)
+            await self.validators.set(key, etag, epoch)
+        return etag
+
+    async def get_artigo_with_authors_and_etag(
+        self, artigo_id: int
+    ) -> Tuple[Optional[ArtigoWithAuthors], Optional[str]]:
+        """Buscar artigo com seus autores junto com o ETag da mesma versão"""
+        key = artigo_autores_key(artigo_id)
+        epoch = self.validators.epoch
+        entry = await self.cache.get_or_load(key, lambda: self._fetch_artigo_with_authors(artigo_id))
+        if not entry:
+            return None, None
+        etag = autores_etag(entry)
+        await self.validators.set(key, etag, epoch)
+        return ArtigoWithAuthors(**entry), etag
+
+    async def get_artigos_with_authors(self, artigo_ids: List[int]) -> List[ArtigoWithAuthors]:
+        """Buscar vários artigos com seus autores em uma única consulta
+
+        A ordem dos IDs é preservada; IDs inexistentes são omitidos.
+        """
+        artigo_ids = list(dict.fromkeys(artigo_ids))
+        results = await self.cache.get_many_or_load(
+            {artigo_id: artigo_autores_key(artigo_id) for artigo_id in artigo_ids},
+            self._fetch_artigos_with_authors
+        )
+        return [
+            ArtigoWithAuthors(**results[artigo_id])
+            for artigo_id in artigo_ids
+            if artigo_id in results
+        ]
+
+    async def _fetch_artigo_with_authors(self, artigo_id: int) -> Optional[dict]:
+        return await self.flights.do(
+            ("artigo_autores", artigo_id), lambda: self._query_artigo_with_authors(artigo_id)
+        )
+
+    async def _query_artigo_with_authors(self, artigo_id: int) -> Optional[dict]:
+        results = await self._fetch_artigos_with_authors([artigo_id])
+        return results.get(artigo_id)
+
+    async def _fetch_artigos_with_authors(self, artigo_ids: List[int]) -> Dict[int, dict]:
+        async with self.db.cursor() as cursor:
             try:
-                query = """
-                    SELECT a.id_artigo, a.titulo, a.DOI, a.publicadora, a.data_publicacao,
-                        au.id_autor, au.nome as autor_nome
-                    FROM Artigos a
-                    LEFT JOIN Autorias aut ON a.id_artigo = aut.id_titulo
-                    LEFT JOIN Autores au ON aut.id_autor = au.id_autor
-                    WHERE a.id_artigo = %s
-                """
-                cursor.execute(query, (artigo_id,))
-                results = cursor.fetchall()
-                
-                if not results:
-                    return None
-                
-                # Primeira linha contém dados do artigo
-                first_row = results[0]
-                artigo = ArtigoWithAuthors(
-                    autores=[],
-                    **first_row
-                )
+                await cursor.execute(ARTIGOS_WITH_AUTHORS_QUERY, (artigo_ids,), prepare=True)
+                results = await cursor.fetchall()
                 
-                # Adicionar autores se existirem
-                for row in results:
-                    if row[5]:  # Se tem autor
-                        artigo.autores.append({
-                            "id_autor": row[5],
-                            "nome": row[6]
-                        })
-                
-                return artigo
+                # A versão fica junto da entrada em cache para derivar o ETag
+                return {
+                    row['id_artigo']: {
+                        **ArtigoWithAuthors(**row).model_dump(mode="json"), "versao": row['versao']
+                    }
+                    for row in results
+                }
                 
             except Exception as e:
-                logger.error(f"Erro ao buscar artigo com autores {artigo_id}: {e}")
+                logger.error(f"Erro ao buscar artigos com autores {artigo_ids}: {e}")
                 raise
-        
-    async def search_artigos(self, q: str):
-        with get_db_cursor() as cursor:
-            query = """
-                SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
-                FROM Artigos
-                WHERE titulo ILIKE %s OR DOI ILIKE %s
-                ORDER BY titulo
-                LIMIT 200 
-            """
-            param = f"%{q}%"
-            cursor.execute(query, tuple([param for _ in range(2)]))
-            results = cursor.fetchall()
-            return [Artigo(**row) for row in results]
@@ -0,0 +1,97 @@
+from typing import List, Optional, Tuple
+import logging
+import re
+
+from database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+# 10.<registrante>/<sufixo>, aceitando os prefixos usuais de URL/"doi:"
+DOI_PATTERN = re.compile(
+    r"^\s*(?:https?://(?:dx\.)?doi\.org/|doi:\s*)?(10\.\d{4,9}/\S+)\s*$",
+    re.IGNORECASE
+)
+
+DOI_QUERY = """
+    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
+    FROM Artigos
+    WHERE lower(DOI) = lower(%s)
+    ORDER BY titulo, id_artigo
+"""
+
+# Operadores da sintaxe web: "frase", -exclusão e OR
+WEBSEARCH_OPERATORS = re.compile(r'"|(?:^|\s)-\w|\bor\b', re.IGNORECASE)
+# Caracteres com significado na sintaxe do to_tsquery
+TSQUERY_SYNTAX = re.compile(r"[&|!():*<>'\\]")
+WORD = re.compile(r"\w")
+
+# search_vector é mantido pelo Postgres (ver 002_artigos_full_text_search.sql)
+TEXT_QUERY = """
+    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
+    FROM Artigos,
+        websearch_to_tsquery('portuguese', f_unaccent(%s))
+            || websearch_to_tsquery('simple', f_unaccent(%s)) AS q
+    WHERE search_vector @@ q
+    ORDER BY ts_rank_cd(search_vector, q) DESC, titulo, id_artigo
+    LIMIT %s OFFSET %s
+"""
+
+# Todas as palavras, a última como prefixo ("redes neur" acha "redes neurais"),
+# como o ILIKE '%q%' fazia enquanto o usuário digitava
+PREFIX_QUERY = """
+    SELECT id_artigo, titulo, DOI, publicadora, data_publicacao
+    FROM Artigos,
+        to_tsquery('portuguese', f_unaccent(%s))
+            || to_tsquery('simple', f_unaccent(%s)) AS q
+    WHERE search_vector @@ q
+    ORDER BY ts_rank_cd(search_vector, q) DESC, titulo, id_artigo
+    LIMIT %s OFFSET %s
+"""
+
+
+def prefix_tsquery(text: str) -> Optional[str]:
+    """tsquery "a & b & c:*" com as palavras do texto, ou None se ele usar operadores"""
+    if WEBSEARCH_OPERATORS.search(text):
+        return None
+    # Pontuação solta ("redes - neurais") não vira operando vazio
+    words = [word for word in TSQUERY_SYNTAX.sub(" ", text).split() if WORD.search(word)]
+    if not words:
+        return None
+    return " & ".join(words) + ":*"
+
+
+def text_query(text: str, skip: int, limit: int) -> Tuple[str, tuple]:
+    """Consulta e parâmetros da busca textual"""
+    prefix = prefix_tsquery(text)
+    if prefix:
+        return PREFIX_QUERY, (prefix, prefix, limit, skip)
+    return TEXT_QUERY, (text, text, limit, skip)
+
+
+def normalize_doi(text: str) -> Optional[str]:
+    """Extrair o DOI se o texto for um DOI completo"""
+    match = DOI_PATTERN.match(text)
+    return match.group(1) if match else None
+
+
+class ArtigoSearch:
+    """Busca textual ranqueada sobre titulo, publicadora e DOI"""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def search(self, text: str, skip: int = 0, limit: int = 20) -> List[dict]:
+        """Buscar artigos ordenados por relevância"""
+        async with self.db.cursor() as cursor:
+            # Primeiro o caminho rápido por DOI exato
+            doi = normalize_doi(text)
+            if doi:
+                await cursor.execute(DOI_QUERY, (doi,), prepare=True)
+                results = await cursor.fetchall()
+                if results:
+                    return results[skip:skip + limit]
+
+            # Depois a busca textual, sem acentos e com stemming em português
+            query, params = text_query(text, skip, limit)
+            await cursor.execute(query, params, prepare=True)
+            return await cursor.fetchall()
@@ -0,0 +1,113 @@
+"""Coalescência de leituras idênticas simultâneas (single-flight)
+
+Chamadas com a mesma chave (método e argumentos) enquanto uma leitura está em
+andamento esperam por ela em vez de repetir a consulta, e todas recebem o
+mesmo resultado: trate-o como somente leitura.
+
+Escritas descartam as leituras em andamento das chaves que alteram
+(`cancel`, `cancel_method`). Quem estava esperando refaz a leitura e vê o
+dado novo. A consulta descartada não é interrompida: cancelar um execute no
+meio obrigaria o pool a descartar a conexão. Ela termina sozinha e seu
+resultado é ignorado.
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+
+from monitoring.metrics import singleflight_calls_total, singleflight_superseded_total
+
+FlightKey = Tuple[Hashable, ...]  # (método, *argumentos)
+
+
+class _Superseded(Exception):
+    """A leitura em andamento foi descartada por uma escrita"""
+
+
+class _Flight:
+    __slots__ = ("future", "task")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.leaders = 0
+        self.coalesced = 0
+        self.superseded = 0
+        self._inflight: Dict[FlightKey, _Flight] = {}
+
+    async def do(self, key: FlightKey, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Resultado de `load()`, compartilhado com as chamadas simultâneas de mesma chave"""
+        if not self.enabled:
+            return await load()
+        retry = False
+        while True:
+            flight = self._inflight.get(key)
+            if flight is None:
+                # Cada consulta executada conta como leader, inclusive as refeitas
+                flight = self._start(key, load)
+                self.leaders += 1
+                singleflight_calls_total.inc(method=str(key[0]), role="leader")
+            elif not retry:
+                self.coalesced += 1
+                singleflight_calls_total.inc(method=str(key[0]), role="coalesced")
+            try:
+                # shield: cancelar quem espera não cancela a leitura compartilhada
+                return await asyncio.shield(flight.future)
+            except _Superseded:
+                retry = True
+
+    def _start(self, key: FlightKey, load: Callable[[], Awaitable[Any]]) -> _Flight:
+        flight = _Flight(asyncio.get_running_loop().create_future())
+        # Sem ninguém esperando, a exceção não deve virar aviso de "never retrieved"
+        flight.future.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+        async def run() -> None:
+            try:
+                result = await load()
+            except BaseException as e:
+                if not flight.future.done():
+                    flight.future.set_exception(e)
+                if not isinstance(e, Exception):
+                    raise
+            else:
+                if not flight.future.done():
+                    flight.future.set_result(result)
+            finally:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+        self._inflight[key] = flight
+        flight.task = asyncio.ensure_future(run())
+        return flight
+
+    def cancel(self, *keys: FlightKey) -> None:
+        """Descartar as leituras em andamento destas chaves"""
+        for key in keys:
+            self._supersede(key)
+
+    def cancel_method(self, *methods: Hashable) -> None:
+        """Descartar as leituras em andamento de métodos inteiros (listagens, buscas)"""
+        for key in [key for key in self._inflight if key[0] in methods]:
+            self._supersede(key)
+
+    def _supersede(self, key: FlightKey) -> None:
+        flight = self._inflight.pop(key, None)
+        if flight is None:
+            return
+        self.superseded += 1
+        singleflight_superseded_total.inc(method=str(key[0]))
+        if not flight.future.done():
+            flight.future.set_exception(_Superseded())
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_rate": self.coalesced / calls if calls else 0.0,
+            "superseded": self.superseded,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,81 @@
+"""Respostas JSON diretas para as rotas de leitura de artigos
+
+As linhas do banco são codificadas em bytes de uma vez (orjson, se instalado),
+sem criar um modelo Pydantic por linha nem validar de novo contra o
+`response_model`. As rotas continuam declarando `response_model`, que só
+descreve o schema no OpenAPI: o FastAPI não reprocessa uma `Response` devolvida
+diretamente.
+
+Também ficam aqui os auxiliares de GET condicional (ETag, If-None-Match e 304).
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import json
+
+from fastapi.responses import Response
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:  # cai no json da biblioteca padrão
+    orjson = None
+
+# Campo do ArtigoResponse -> coluna da linha (o Postgres devolve DOI como "doi")
+ARTIGO_FIELDS = (
+    ("titulo", "titulo"),
+    ("DOI", "doi"),
+    ("publicadora", "publicadora"),
+    ("data_publicacao", "data_publicacao"),
+    ("id_artigo", "id_artigo"),
+)
+
+
+def artigo_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Linha do banco com os nomes e a ordem de campos do ArtigoResponse"""
+    return {field: row[column] for field, column in ARTIGO_FIELDS}
+
+
+def artigo_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [artigo_row(row) for row in rows]
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match com comparação fraca (W/ ignorado), como pede o RFC 9110"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": settings.ARTIGO_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """304 sem corpo: o cliente reaproveita a representação que já tem"""
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+class FastJSONResponse(Response):
+    """JSON já no formato do response_model, codificado sem validação"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ArtigoListResponse(Response):
+    """Lista de artigos serializada a partir das linhas do banco"""
+
+    media_type = "application/json"
+
+    def render(self, content: Iterable[Dict[str, Any]]) -> bytes:
+        return dumps(artigo_rows(content))
@@ -1,13 +1,53 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Annotated, AsyncIterator, List, Optional
+from datetime import date
+import csv
+import io
+import json
+from config import settings
 from app.schemas.artigo import ArtigoCreate, ArtigoUpdate, ArtigoResponse, ArtigoWithAuthors
+from app.schemas.artigo import ArtigoBatchRequest, ArtigoSuggestion, BulkImportResult
 from app.services.artigo_service import ArtigoService
+from repositories.pagination import encode_cursor
+from repositories.repository import page_etag
+from routes.responses import (
+    ArtigoListResponse,
+    FastJSONResponse,
+    artigo_row,
+    cache_headers,
+    etag_matches,
+    not_modified,
+)
 
 router = APIRouter()
-artigo_service = ArtigoService()
+
+
+def get_artigo_service(request: Request) -> ArtigoService:
+    """Serviço criado no lifespan da aplicação"""
+    return request.app.state.artigo_service
+
+
+ArtigoServiceDep = Annotated[ArtigoService, Depends(get_artigo_service)]
+
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonlines")
+
+
+async def _iter_ndjson_lines(request: Request):
+    """Entregar as linhas não vazias do corpo à medida que chegam"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
 
 @router.post("/", response_model=ArtigoResponse, status_code=201)
-async def create_artigo(artigo: ArtigoCreate):
+async def create_artigo(artigo: ArtigoCreate, artigo_service: ArtigoServiceDep):
     """Criar um novo artigo"""
     try:
         return await artigo_service.create_artigo(artigo)
@@ -15,25 +55,167 @@ async def create_artigo(artigo: ArtigoCreate):
         print(e)
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_create_artigos(request: Request, artigo_service: ArtigoServiceDep):
+    """Importar artigos em lote a partir de um array JSON ou de um corpo NDJSON"""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        records = _iter_ndjson_lines(request)
+    else:
+        try:
+            records = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Corpo JSON inválido")
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Esperado um array JSON de artigos")
+
+    return await artigo_service.bulk_create_artigos(records)
+
+# Mesmos nomes de campo das demais rotas (ArtigoResponse)
+EXPORT_COLUMNS = ["id_artigo", "titulo", "DOI", "publicadora", "data_publicacao"]
+
+
+async def _ndjson_export(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps(artigo_row(row), default=str, ensure_ascii=False))
+        if len(lines) >= settings.ARTIGO_EXPORT_BATCH_SIZE:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def _csv_export(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    pending = 0
+    async for row in rows:
+        writer.writerow(artigo_row(row))
+        pending += 1
+        if pending >= settings.ARTIGO_EXPORT_BATCH_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+@router.get("/export")
+async def export_artigos(
+    artigo_service: ArtigoServiceDep,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    publicadora: Optional[str] = Query(None),
+    data_inicio: Optional[date] = Query(None, description="Data de publicação mínima"),
+    data_fim: Optional[date] = Query(None, description="Data de publicação máxima")
+):
+    """Exportar o catálogo completo em NDJSON ou CSV, sem paginação"""
+    rows = artigo_service.export_artigos(
+        publicadora=publicadora, data_inicio=data_inicio, data_fim=data_fim
+    )
+    if fmt == "csv":
+        return StreamingResponse(
+            _csv_export(rows),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="artigos.csv"'}
+        )
+    return StreamingResponse(_ndjson_export(rows), media_type="application/x-ndjson")
+
+def _check_batch_size(ids: List[int]) -> None:
+    if len(ids) > settings.ARTIGO_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No máximo {settings.ARTIGO_BATCH_MAX_IDS} IDs por requisição"
+        )
+
+@router.get("/autocomplete", response_model=List[ArtigoSuggestion])
+async def autocomplete_artigos(
+    artigo_service: ArtigoServiceDep,
+    q: str = Query(..., min_length=1, description="Início do título ou do DOI"),
+    limit: int = Query(10, ge=1, le=settings.ARTIGO_AUTOCOMPLETE_MAX_LIMIT)
+):
+    """Sugerir artigos enquanto o usuário digita, a partir do índice em memória"""
+    return FastJSONResponse(await artigo_service.autocomplete_artigos(q, limit=limit))
+
+@router.get("/batch", response_model=List[ArtigoWithAuthors])
+async def get_artigos_batch(
+    artigo_service: ArtigoServiceDep,
+    ids: str = Query(..., description="IDs separados por vírgula, ex.: 1,2,3")
+):
+    """Buscar vários artigos com seus autores"""
+    try:
+        artigo_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="IDs devem ser inteiros separados por vírgula")
+    if not artigo_ids:
+        raise HTTPException(status_code=400, detail="Informe ao menos um ID")
+    _check_batch_size(artigo_ids)
+    return await artigo_service.get_artigos_with_authors(artigo_ids)
+
+@router.post("/batch", response_model=List[ArtigoWithAuthors])
+async def post_artigos_batch(batch: ArtigoBatchRequest, artigo_service: ArtigoServiceDep):
+    """Buscar vários artigos com seus autores (IDs no corpo)"""
+    _check_batch_size(batch.ids)
+    return await artigo_service.get_artigos_with_authors(batch.ids)
+
 @router.get("/{artigo_id}", response_model=ArtigoResponse)
-async def get_artigo(artigo_id: int):
-    """Buscar artigo por ID"""
-    artigo = await artigo_service.get_artigo_by_id(artigo_id)
+async def get_artigo(
+    artigo_id: int, request: Request, response: Response, artigo_service: ArtigoServiceDep
+):
+    """Buscar artigo por ID
+
+    Com If-None-Match igual ao ETag atual, responde 304 sem corpo.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = await artigo_service.artigo_etag(artigo_id)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    artigo, etag = await artigo_service.get_artigo_and_etag(artigo_id)
     if not artigo:
         raise HTTPException(status_code=404, detail="Artigo não encontrado")
     
+    response.headers.update(cache_headers(etag))
     return artigo
 
 @router.get("/", response_model=List[ArtigoResponse])
 async def list_artigos(
+    artigo_service: ArtigoServiceDep,
+    request: Request,
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100)
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em X-Next-Cursor; substitui skip")
 ):
-    """Listar artigos com paginação"""
-    return await artigo_service.get_artigos(skip=skip, limit=limit)
+    """Listar artigos com paginação
+
+    A próxima página é indicada nos cabeçalhos X-Next-Cursor e Link (rel="next").
+    O ETag deriva dos ids e versões da página; If-None-Match igual responde 304
+    sem serializar.
+    """
+    try:
+        rows = await artigo_service.get_artigo_rows(skip=skip, limit=limit, page_cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = page_etag(rows)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    response = ArtigoListResponse(rows, headers=cache_headers(etag))
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last["titulo"], last["id_artigo"])
+        next_url = request.url.remove_query_params("skip").include_query_params(
+            cursor=next_cursor, limit=limit
+        )
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
 
 @router.put("/{artigo_id}", response_model=ArtigoResponse)
-async def update_artigo(artigo_id: int, artigo: ArtigoUpdate):
+async def update_artigo(artigo_id: int, artigo: ArtigoUpdate, artigo_service: ArtigoServiceDep):
     """Atualizar artigo"""
     try:
         updated_artigo = await artigo_service.update_artigo(artigo_id, artigo)
@@ -44,7 +226,7 @@ async def update_artigo(artigo_id: int, artigo: ArtigoUpdate):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{artigo_id}")
-async def delete_artigo(artigo_id: int):
+async def delete_artigo(artigo_id: int, artigo_service: ArtigoServiceDep):
     """Excluir artigo"""
     try:
         deleted = await artigo_service.delete_artigo(artigo_id)
@@ -57,24 +239,48 @@ async def delete_artigo(artigo_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/search/", response_model=List[ArtigoResponse])
-async def search_artigos(q: str = Query(..., min_length=1)):
-    """Buscar artigos por título, DOI ou publicadora"""
-    return await artigo_service.search_artigos(q)
+async def search_artigos(
+    artigo_service: ArtigoServiceDep,
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Buscar artigos por título, DOI ou publicadora, ordenados por relevância
+
+    A última palavra vale como prefixo ("redes neur" acha "redes neurais").
+    Com aspas, -exclusão ou OR vale a sintaxe web, só com palavras inteiras.
+    """
+    return ArtigoListResponse(await artigo_service.search_artigo_rows(q, skip=skip, limit=limit))
 
 @router.get("/{artigo_id}/autores", response_model=ArtigoWithAuthors)
-async def get_artigo_with_authors(artigo_id: int):
-    """Buscar artigo com seus autores"""
-    artigo = await artigo_service.get_artigo_with_authors(artigo_id)
+async def get_artigo_with_authors(
+    artigo_id: int, request: Request, response: Response, artigo_service: ArtigoServiceDep
+):
+    """Buscar artigo com seus autores
+
+    Com If-None-Match igual ao ETag atual, responde 304 sem corpo.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = await artigo_service.artigo_with_authors_etag(artigo_id)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    artigo, etag = await artigo_service.get_artigo_with_authors_and_etag(artigo_id)
     if not artigo:
         raise HTTPException(status_code=404, detail="Artigo não encontrado")
+    response.headers.update(cache_headers(etag))
     return artigo
 
 
 @router.get("/pesquisar/artigos", response_model=List[ArtigoResponse])
-async def search_artigos(
-    title: Optional[str] = Query(None, description="Título do item a ser pesquisado")
+async def search_artigos_por_titulo(
+    artigo_service: ArtigoServiceDep,
+    title: Optional[str] = Query(None, description="Título do item a ser pesquisado"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=200)
 ):
     """Buscar itens do estoque a partir do ID do estoque ou da biblioteca"""
     if not title:
         raise HTTPException(status_code=400, detail="Título é obrigatório para busca")
-    return await artigo_service.search_artigos(title)
\ No newline at end of file
+    return ArtigoListResponse(await artigo_service.search_artigo_rows(title, skip=skip, limit=limit))
\ No newline at end of file
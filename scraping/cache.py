@@ -0,0 +1,196 @@
+"""Cache persistente de extrações com revalidação condicional
+
+Guarda, por URL normalizada, o resultado extraído (name/brand/price), o hash
+do conteúdo e os validadores HTTP (ETag / Last-Modified). Em uma nova
+execução a página é pedida com If-None-Match / If-Modified-Since; um 304 ou
+um corpo com o mesmo hash reaproveita o resultado sem novo parse.
+"""
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import hashlib
+import json
+import sqlite3
+import time
+
+# Parâmetros que só servem para rastreamento e não mudam a página
+TRACKING_PARAMS = {"gclid", "fbclid", "ref", "ref_", "_encoding", "content-id", "psc"}
+TRACKING_PREFIXES = ("utm_", "pd_rd_", "pf_rd_")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Forma canônica da URL usada como chave do cache"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class ExtractionCache:
+    """Cache em SQLite com expiração (TTL) e despejo LRU por número de entradas"""
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = {
+            "not_modified": 0,
+            "unchanged": 0,
+            "changed": 0,
+            "new": 0,
+            "expired": 0,
+            "evictions": 0,
+        }
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extractions (
+                url TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extractions_accessed ON extractions (accessed_at)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Entrada ainda válida para a URL, ou None"""
+        key = normalize_url(url)
+        row = self._conn.execute(
+            "SELECT result, content_hash, etag, last_modified, stored_at FROM extractions WHERE url = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        result, digest, etag, last_modified, stored_at = row
+        if time.time() - stored_at > self.ttl:
+            self._conn.execute("DELETE FROM extractions WHERE url = ?", (key,))
+            self._conn.commit()
+            self._size -= 1
+            self.stats["expired"] += 1
+            return None
+
+        return {
+            "result": json.loads(result),
+            "content_hash": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Cabeçalhos de revalidação para uma entrada existente"""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(
+        self,
+        url: str,
+        result: Dict,
+        digest: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        previous: Optional[Dict] = None,
+    ) -> None:
+        """Gravar uma extração nova (`previous` é a entrada que ela substitui)"""
+        self.stats["changed" if previous is not None else "new"] += 1
+        now = time.time()
+        self._conn.execute(
+            """
+            INSERT INTO extractions (url, result, content_hash, etag, last_modified, stored_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (url) DO UPDATE SET
+                result = excluded.result,
+                content_hash = excluded.content_hash,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                stored_at = excluded.stored_at,
+                accessed_at = excluded.accessed_at
+            """,
+            (normalize_url(url), json.dumps(result, default=str), digest, etag, last_modified, now, now)
+        )
+        if previous is None:
+            self._size += 1
+        self._evict()
+        self._conn.commit()
+
+    def revalidated(
+        self,
+        url: str,
+        reason: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Registrar que a entrada continua válida (`not_modified` ou `unchanged`)"""
+        self.stats[reason] += 1
+        now = time.time()
+        self._conn.execute(
+            """
+            UPDATE extractions
+            SET stored_at = ?, accessed_at = ?,
+                etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+            WHERE url = ?
+            """,
+            (now, now, etag, last_modified, normalize_url(url))
+        )
+        self._conn.commit()
+
+    def _evict(self) -> None:
+        if self._size <= self.max_entries:
+            return
+        # O contador em memória pode divergir (URLs repetidas em paralelo); recontar
+        self._size = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        excess = self._size - self.max_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            """
+            DELETE FROM extractions WHERE url IN (
+                SELECT url FROM extractions ORDER BY accessed_at LIMIT ?
+            )
+            """,
+            (excess,)
+        )
+        self._size -= excess
+        self.stats["evictions"] += excess
+
+    def summary(self) -> Dict:
+        hits = self.stats["not_modified"] + self.stats["unchanged"]
+        misses = self.stats["changed"] + self.stats["new"]
+        total = hits + misses
+        return {
+            **self.stats,
+            "entries": self._size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,311 @@
+"""Motor de extração rápido para páginas de produto
+
+Mesmo resultado e mesma precedência de `go.extract_product_info`
+(JSON-LD > microdata > heurística), mas com o parser do lxml e uma única
+travessia da árvore que coleta todos os candidatos de uma vez.
+"""
+from typing import Dict, List, Optional, Tuple, Union
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from go import (
+    BRAND_CLASSES,
+    NAME_CLASSES,
+    PRICE_CLASSES,
+    PRICE_REGEX,
+    PRODUCT_ITEMTYPE,
+    _product_from_json_ld,
+)
+
+# Texto já decodificado é reenviado como UTF-8; bytes usam a detecção do lxml
+_UTF8_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+_MICRODATA_PROPS = ("name", "brand", "price")
+
+# Origem de um valor heurístico: (XPath, modo de leitura); ver scraping.profiles
+Source = Optional[Tuple[str, str]]
+
+
+def _class_xpath(class_name: str, position: int) -> str:
+    return (
+        f"(//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')])"
+        f"[{position}]"
+    )
+
+
+# O get_text do BeautifulSoup ignora o conteúdo de script, style e template (e comentários)
+_VISIBLE_TEXT = etree.XPath(
+    "descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]",
+    smart_strings=False,
+)
+
+
+def _text(elem) -> str:
+    """Equivalente a get_text(strip=True) do BeautifulSoup"""
+    return "".join(part.strip() for part in _VISIBLE_TEXT(elem))
+
+
+def _microdata_result(props: Dict[str, object]) -> Dict[str, str]:
+    microdata = {}
+    name_elem = props.get("name")
+    if name_elem is not None:
+        microdata['name'] = _text(name_elem)
+    brand_elem = props.get("brand")
+    if brand_elem is not None:
+        microdata['brand'] = _text(brand_elem)
+    price_elem = props.get("price")
+    if price_elem is not None:
+        microdata['price'] = price_elem.get('content') or _text(price_elem)
+    return microdata
+
+
+def microdata_from_element(product) -> Dict[str, str]:
+    """Microdata de um elemento Product já completo (primeiro descendente de cada itemprop)"""
+    props = {}
+    for elem in product.iterdescendants():
+        itemprop = elem.get("itemprop") if isinstance(elem.tag, str) else None
+        if itemprop in _MICRODATA_PROPS and itemprop not in props:
+            props[itemprop] = elem
+    return _microdata_result(props)
+
+
+class _Candidates:
+    """Tudo o que as três estratégias consultam, coletado em uma travessia"""
+
+    def __init__(self):
+        self.json_ld: List[Optional[str]] = []
+        self.product = None
+        self._inside_product = False
+        self.product_props: Dict[str, object] = {}
+        self.title = None
+        self.h1: List[object] = []
+        self.og_title = None
+        self.name_classes: Dict[str, List[object]] = {name: [] for name in NAME_CLASSES}
+        self.brand_itemprop = None
+        self.brand_class = None
+        self.brand_id = None
+        self.brand_tag = None
+        self.logo_alt: Optional[str] = None
+        self.price_classes: Dict[str, List[object]] = {name: [] for name in PRICE_CLASSES}
+        self.price_meta = None
+        self.price_text: Optional[str] = None
+        self.price_text_owner = None
+
+    def _text_node(self, text: Optional[str], owner) -> None:
+        # Primeiro texto do documento que casa com o padrão de preço
+        if text and self.price_text is None:
+            match = PRICE_REGEX.search(text)
+            if match:
+                self.price_text = match.group().strip()
+                self.price_text_owner = owner
+
+    def collect(self, root) -> None:
+        open_elements = []
+        for elem in root.iter():
+            # Fechar os elementos que não são ancestrais deste, emitindo seus "tails"
+            parent = elem.getparent()
+            while open_elements and open_elements[-1] is not parent:
+                closed = open_elements.pop()
+                if closed is self.product:
+                    self._inside_product = False
+                self._text_node(closed.tail, closed.getparent())
+
+            self._text_node(elem.text, elem)
+            open_elements.append(elem)
+
+            tag = elem.tag
+            if not isinstance(tag, str):
+                # Comentários e instruções de processamento só contribuem com texto
+                continue
+            self._element(elem, tag)
+
+        while open_elements:
+            closed = open_elements.pop()
+            self._text_node(closed.tail, closed.getparent())
+
+    def _element(self, elem, tag: str) -> None:
+        attrib = elem.attrib
+
+        if tag == "script" and attrib.get("type") == "application/ld+json":
+            self.json_ld.append(elem.text)
+        elif tag == "title":
+            if self.title is None:
+                self.title = elem
+        elif tag == "h1":
+            self.h1.append(elem)
+        elif tag == "meta":
+            prop = attrib.get("property")
+            if prop == "og:title" and self.og_title is None:
+                self.og_title = elem
+            elif prop == "product:price:amount" and self.price_meta is None:
+                self.price_meta = elem
+        elif tag == "img":
+            alt = attrib.get("alt")
+            if alt is not None and self.logo_alt is None and "logo" in alt.lower():
+                self.logo_alt = alt
+        elif tag == "brand" and self.brand_tag is None:
+            self.brand_tag = elem
+
+        itemprop = attrib.get("itemprop")
+        if itemprop is not None:
+            if itemprop == "brand" and self.brand_itemprop is None:
+                self.brand_itemprop = elem
+            # Propriedades de microdata só contam dentro do Product (descendentes)
+            if (
+                self._inside_product
+                and itemprop in _MICRODATA_PROPS
+                and itemprop not in self.product_props
+            ):
+                self.product_props[itemprop] = elem
+
+        if attrib.get("itemtype") == PRODUCT_ITEMTYPE and self.product is None:
+            self.product = elem
+            self._inside_product = True
+
+        if attrib.get("id") == "brand" and self.brand_id is None:
+            self.brand_id = elem
+
+        classes = attrib.get("class")
+        if classes:
+            for class_name in classes.split():
+                if class_name in self.name_classes:
+                    self.name_classes[class_name].append(elem)
+                if class_name in self.price_classes:
+                    self.price_classes[class_name].append(elem)
+            if self.brand_class is None and any(
+                class_name in BRAND_CLASSES for class_name in classes.split()
+            ):
+                self.brand_class = elem
+
+    # Estratégias, na mesma ordem de go.py
+
+    def microdata(self) -> Optional[Dict[str, str]]:
+        if self.product is None:
+            return None
+
+        return _microdata_result(self.product_props)
+
+    # Cada estratégia também informa de onde tirou o valor, para os perfis por domínio
+
+    def name_source(self) -> Tuple[Optional[str], Source]:
+        candidates = []
+        if self.title is not None and len(self.title) == 0 and self.title.text:
+            candidates.append((self.title.text.strip(), ("(//title)[1]", "text")))
+        for position, h1 in enumerate(self.h1, 1):
+            text = _text(h1)
+            if text:
+                candidates.append((text, (f"(//h1)[{position}]", "text")))
+        if self.og_title is not None and self.og_title.get('content'):
+            candidates.append((
+                self.og_title.get('content').strip(),
+                ("(//meta[@property='og:title'])[1]/@content", "text"),
+            ))
+        for class_name in NAME_CLASSES:
+            for position, elem in enumerate(self.name_classes[class_name], 1):
+                text = _text(elem)
+                if text:
+                    candidates.append((text, (_class_xpath(class_name, position), "text")))
+
+        if candidates:
+            return max(candidates, key=lambda candidate: len(candidate[0]))
+        return None, None
+
+    def brand_source(self) -> Tuple[Optional[str], Source]:
+        sources = (
+            (self.brand_itemprop, lambda elem: "(//*[@itemprop='brand'])[1]"),
+            (self.brand_class, lambda elem: _class_xpath(
+                next(name for name in elem.get("class").split() if name in BRAND_CLASSES), 1
+            )),
+            (self.brand_id, lambda elem: "(//*[@id='brand'])[1]"),
+            (self.brand_tag, lambda elem: "(//brand)[1]"),
+        )
+        for elem, xpath in sources:
+            if elem is not None:
+                text = _text(elem)
+                if text:
+                    return text, (xpath(elem), "text")
+
+        if self.logo_alt is not None:
+            return (
+                self.logo_alt.lower().replace('logo', '').strip(),
+                ("(//img[contains(translate(@alt, 'LOGO', 'logo'), 'logo')])[1]/@alt", "logo"),
+            )
+        return None, None
+
+    def price_source(self) -> Tuple[Optional[str], Source]:
+        for class_name in PRICE_CLASSES:
+            for position, elem in enumerate(self.price_classes[class_name], 1):
+                match = PRICE_REGEX.search(_text(elem))
+                if match:
+                    return match.group().strip(), (_class_xpath(class_name, position), "price")
+
+        if self.price_meta is not None and self.price_meta.get('content'):
+            return (
+                self.price_meta.get('content').strip(),
+                ("(//meta[@property='product:price:amount'])[1]/@content", "text"),
+            )
+
+        if self.price_text_owner is not None:
+            path = self.price_text_owner.getroottree().getpath(self.price_text_owner)
+            return self.price_text, (path, "price_text")
+        return self.price_text, None
+
+    def name(self) -> Optional[str]:
+        return self.name_source()[0]
+
+    def brand(self) -> Optional[str]:
+        return self.brand_source()[0]
+
+    def price(self) -> Optional[str]:
+        return self.price_source()[0]
+
+
+def parse_html(html_content: Union[str, bytes]):
+    """Árvore lxml do documento, ou None se estiver vazio"""
+    parser = None
+    if isinstance(html_content, str):
+        html_content = html_content.encode("utf-8", errors="surrogatepass")
+        parser = _UTF8_PARSER
+    if not html_content.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html_content, parser=parser)
+    except etree.ParserError:
+        return None
+
+
+def extract_with_strategy(root) -> Tuple[Dict[str, Optional[str]], Optional[str], Optional[_Candidates]]:
+    """Resultado, estratégia vencedora e candidatos coletados (para aprender perfis)"""
+    result = {
+        'name': None,
+        'brand': None,
+        'price': None
+    }
+    if root is None:
+        return result, None, None
+
+    candidates = _Candidates()
+    candidates.collect(root)
+
+    json_ld = _product_from_json_ld(candidates.json_ld)
+    if json_ld:
+        return json_ld, "json_ld", candidates
+
+    microdata = candidates.microdata()
+    if microdata:
+        return microdata, "microdata", candidates
+
+    result['name'] = candidates.name()
+    result['brand'] = candidates.brand()
+    result['price'] = candidates.price()
+    return result, "heuristic", candidates
+
+
+def extract_from_tree(root) -> Dict[str, Optional[str]]:
+    """Aplicar as estratégias de go.py a uma árvore já construída"""
+    return extract_with_strategy(root)[0]
+
+
+def extract_product_info(html_content: Union[str, bytes]) -> Dict[str, Optional[str]]:
+    """Versão rápida de go.extract_product_info"""
+    return extract_from_tree(parse_html(html_content))
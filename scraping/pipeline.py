@@ -0,0 +1,387 @@
+"""Pipeline de extração em lote para catálogos de URLs de produto
+
+Busca as páginas com um cliente HTTP assíncrono (conexões keep-alive
+reaproveitadas), respeitando limites de concorrência e de taxa por host,
+entrega o parse a um pool de processos e grava cada resultado em NDJSON
+assim que fica pronto.
+
+Com `--cache`, cada extração fica guardada em disco e as execuções
+seguintes revalidam as páginas com requisições condicionais, sem novo parse
+quando a resposta é 304 ou o conteúdo não mudou.
+
+Uso:
+
+    python -m scraping.pipeline urls.txt -o produtos.ndjson --per-host 4 --rate 2
+    python -m scraping.pipeline urls.txt -o produtos.ndjson --cache extracoes.sqlite
+    python -m scraping.pipeline urls.txt -o produtos.ndjson --save-profiles perfis.json
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, TextIO
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+import httpx
+
+import go
+from scraping import fast_extract
+from scraping.cache import ExtractionCache, content_hash
+from scraping.profiles import ProfileRegistry, extract_with_profile
+from scraping.streaming import fetch_product_info
+
+logger = logging.getLogger(__name__)
+
+ENGINES: Dict[str, Callable] = {
+    "fast": fast_extract.extract_product_info,
+    "soup": go.extract_product_info,
+}
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; soundmood-scraper/1.0)",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+}
+
+
+class HostLimiter:
+    """Concorrência máxima e intervalo mínimo entre requisições de um host"""
+
+    def __init__(self, concurrency: int, rate: Optional[float]):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait_turn(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        await asyncio.sleep(slot - now)
+
+
+class ScrapePipeline:
+    def __init__(
+        self,
+        concurrency: int = 64,
+        per_host_concurrency: int = 4,
+        per_host_rate: Optional[float] = None,
+        timeout: float = 20.0,
+        engine: str = "fast",
+        executor: Optional[Executor] = None,
+        headers: Optional[Dict[str, str]] = None,
+        streaming: bool = False,
+        stop_on_microdata: bool = True,
+        cache: Optional[ExtractionCache] = None,
+        profiles: Optional[ProfileRegistry] = None,
+    ):
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.timeout = timeout
+        self.extract = ENGINES[engine]
+        self.executor = executor
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.streaming = streaming
+        self.stop_on_microdata = stop_on_microdata
+        self.cache = cache
+        # Perfis por domínio usam o motor lxml e valem fora do modo streaming
+        self.profiles = profiles
+        self._hosts: Dict[str, HostLimiter] = {}
+        self.stats = {"ok": 0, "http_error": 0, "fetch_error": 0, "parse_error": 0}
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = HostLimiter(self.per_host_concurrency, self.per_host_rate)
+        return self._hosts[host]
+
+    async def _fetch(
+        self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        limiter = self._limiter(url)
+        async with limiter.semaphore:
+            await limiter.wait_turn()
+            return await client.get(url, headers=headers)
+
+    def _from_cache(
+        self, record: dict, entry: Dict, reason: str, validators: Dict[str, Optional[str]]
+    ) -> dict:
+        self.cache.revalidated(record["url"], reason, **validators)
+        record.update(entry["result"])
+        record["cache"] = reason
+        self.stats["ok"] += 1
+        return record
+
+    def _store(
+        self,
+        record: dict,
+        info: Dict,
+        digest: Optional[str],
+        validators: Dict[str, Optional[str]],
+        entry: Optional[Dict],
+    ) -> None:
+        if self.cache is None:
+            return
+        self.cache.put(record["url"], info, digest, previous=entry, **validators)
+        record["cache"] = "changed" if entry is not None else "new"
+
+    async def process(self, client: httpx.AsyncClient, url: str) -> dict:
+        """Buscar e extrair uma URL; erros viram campos do resultado"""
+        start = time.perf_counter()
+        record = {"url": url, "status": None, "name": None, "brand": None, "price": None}
+        entry = self.cache.get(url) if self.cache is not None else None
+        headers = self.cache.conditional_headers(entry) if entry is not None else None
+        if self.streaming:
+            return await self._process_streaming(client, url, record, start, entry, headers)
+
+        try:
+            response = await self._fetch(client, url, headers)
+            record["status"] = response.status_code
+            if response.status_code == 304 and entry is not None:
+                return self._from_cache(record, entry, "not_modified", _validators(response))
+            if response.status_code != 200:
+                self.stats["http_error"] += 1
+                record["error"] = f"HTTP {response.status_code}"
+                return record
+        except httpx.HTTPError as e:
+            self.stats["fetch_error"] += 1
+            record["error"] = f"{type(e).__name__}: {e}"
+            return record
+        finally:
+            record["fetch_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        digest = None
+        if self.cache is not None:
+            digest = content_hash(response.content)
+            if entry is not None and entry["content_hash"] == digest:
+                record = self._from_cache(record, entry, "unchanged", _validators(response))
+                record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+                return record
+
+        try:
+            loop = asyncio.get_running_loop()
+            if self.profiles is not None:
+                info, learned, outcome = await loop.run_in_executor(
+                    self.executor, extract_with_profile, response.text, self.profiles.profile_for(url)
+                )
+                self.profiles.record(url, outcome, learned)
+                record["profile"] = outcome
+            else:
+                info = await loop.run_in_executor(self.executor, self.extract, response.text)
+            record.update(info)
+            self._store(record, info, digest, _validators(response), entry)
+            self.stats["ok"] += 1
+        except Exception as e:
+            self.stats["parse_error"] += 1
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return record
+
+    async def _process_streaming(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        record: dict,
+        start: float,
+        entry: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> dict:
+        # A conexão fica ocupada durante toda a leitura, então o limite do host também
+        limiter = self._limiter(url)
+        try:
+            async with limiter.semaphore:
+                await limiter.wait_turn()
+                status, info, stream_stats = await fetch_product_info(
+                    client,
+                    url,
+                    headers=headers,
+                    executor=self.executor,
+                    extract=self.extract,
+                    stop_on_microdata=self.stop_on_microdata,
+                )
+        except httpx.HTTPError as e:
+            self.stats["fetch_error"] += 1
+            record["error"] = f"{type(e).__name__}: {e}"
+            return record
+        except Exception as e:
+            self.stats["parse_error"] += 1
+            record["error"] = f"{type(e).__name__}: {e}"
+            return record
+        finally:
+            record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        record["status"] = status
+        validators = {
+            "etag": stream_stats.pop("etag", None),
+            "last_modified": stream_stats.pop("last_modified", None),
+        }
+        if status == 304 and entry is not None:
+            return self._from_cache(record, entry, "not_modified", validators)
+        if status != 200:
+            self.stats["http_error"] += 1
+            record["error"] = f"HTTP {status}"
+            return record
+
+        record.update(info)
+        record.update(stream_stats)
+        # Com parada antecipada o corpo não é lido inteiro, então não há hash
+        self._store(record, info, None, validators, entry)
+        self.stats["ok"] += 1
+        return record
+
+    async def run(self, urls: Iterable[str], output: TextIO) -> dict:
+        """Processar todas as URLs, gravando uma linha NDJSON por resultado"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        start = time.perf_counter()
+        written = 0
+
+        async with httpx.AsyncClient(
+            headers=self.headers, timeout=self.timeout, limits=limits, follow_redirects=True
+        ) as client:
+
+            async def worker():
+                nonlocal written
+                while True:
+                    url = await queue.get()
+                    try:
+                        if url is None:
+                            return
+                        record = await self.process(client, url)
+                        output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                        output.flush()
+                        written += 1
+                    finally:
+                        queue.task_done()
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            try:
+                for url in urls:
+                    url = url.strip()
+                    if url and not url.startswith("#"):
+                        await queue.put(url)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            **self.stats,
+            "total": written,
+            "elapsed_seconds": round(elapsed, 3),
+            "urls_per_second": round(written / elapsed, 2) if elapsed else 0.0,
+        }
+        if self.cache is not None:
+            summary["cache"] = self.cache.summary()
+        if self.profiles is not None:
+            summary["profiles"] = {**self.profiles.stats, "domains": len(self.profiles.to_dict())}
+        return summary
+
+
+def _validators(response: httpx.Response) -> Dict[str, Optional[str]]:
+    return {
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+    }
+
+
+def run_pipeline(
+    urls: Iterable[str], output: TextIO, workers: Optional[int] = None, **options
+) -> dict:
+    """Executar o pipeline com um pool de processos para o parse"""
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        pipeline = ScrapePipeline(executor=executor, **options)
+        return asyncio.run(pipeline.run(urls, output))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="?", help="arquivo com uma URL por linha (padrão: stdin)")
+    parser.add_argument("-o", "--output", help="arquivo NDJSON de saída (padrão: stdout)")
+    parser.add_argument("--concurrency", type=int, default=64, help="requisições simultâneas no total")
+    parser.add_argument("--per-host", type=int, default=4, help="requisições simultâneas por host")
+    parser.add_argument("--rate", type=float, help="requisições por segundo por host")
+    parser.add_argument("--timeout", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, help="processos de parse (padrão: núcleos)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="fast")
+    parser.add_argument(
+        "--streaming", action="store_true",
+        help="ler em blocos e parar no primeiro Product estruturado completo"
+    )
+    parser.add_argument(
+        "--strict-precedence", action="store_true",
+        help="com --streaming, não parar na microdata (JSON-LD posterior ainda vence)"
+    )
+    parser.add_argument("--cache", help="arquivo SQLite do cache de extrações")
+    parser.add_argument(
+        "--cache-max-entries", type=int, default=100_000,
+        help="entradas mantidas no cache (as menos usadas saem primeiro)"
+    )
+    parser.add_argument(
+        "--cache-ttl", type=float, default=7 * 24 * 3600,
+        help="segundos até uma entrada não revalidada expirar"
+    )
+    parser.add_argument("--profiles", help="JSON com perfis de extração declarados por domínio")
+    parser.add_argument(
+        "--save-profiles", help="gravar os perfis (declarados + aprendidos) neste JSON ao final"
+    )
+    parser.add_argument(
+        "--no-learn", action="store_true", help="usar só os perfis declarados, sem aprender novos"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    profiles = None
+    if args.profiles or args.save_profiles:
+        profiles = (
+            ProfileRegistry.from_file(args.profiles, learn=not args.no_learn)
+            if args.profiles else ProfileRegistry(learn=not args.no_learn)
+        )
+    cache = (
+        ExtractionCache(args.cache, max_entries=args.cache_max_entries, ttl=args.cache_ttl)
+        if args.cache else None
+    )
+    source = open(args.urls, encoding="utf-8") if args.urls else sys.stdin
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        summary = run_pipeline(
+            source,
+            output,
+            workers=args.workers,
+            concurrency=args.concurrency,
+            per_host_concurrency=args.per_host,
+            per_host_rate=args.rate,
+            timeout=args.timeout,
+            engine=args.engine,
+            streaming=args.streaming,
+            stop_on_microdata=not args.strict_precedence,
+            cache=cache,
+            profiles=profiles,
+        )
+        if args.save_profiles:
+            profiles.save(args.save_profiles)
+    finally:
+        if cache is not None:
+            cache.close()
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    logger.info(f"Resumo: {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Perfis de extração por domínio
+
+Para domínios com marcação estável, um perfil guarda onde cada campo foi
+encontrado (XPath compilado + modo de leitura) e qual estratégia venceu
+(JSON-LD, microdata ou heurística). Páginas de um domínio com perfil vão
+direto a essas poucas consultas em vez de varrer a árvore inteira.
+
+Perfis podem ser declarados (arquivo JSON) ou aprendidos da primeira
+extração completa bem-sucedida. Quando um perfil deixa de casar (campo sem
+valor, ou a página passou a ter dados estruturados), a página é extraída
+do jeito completo e o perfil aprendido é descartado e reaprendido.
+
+Formato (declarado ou aprendido):
+
+    {
+        "www.loja.com.br": {
+            "strategy": "heuristic",
+            "fields": {
+                "name": ["//h1[@id='titulo']", "text"],
+                "brand": ["(//*[@itemprop='brand'])[1]", "text"],
+                "price": ["//span[@class='preco']", "price"]
+            }
+        }
+    }
+
+Modos: `text` (texto do elemento ou valor do atributo), `price` (padrão de
+preço sobre o texto do elemento), `price_text` (padrão de preço sobre os
+nós de texto diretos) e `logo` (alt de um logotipo). Um campo com `null`
+fica ausente no perfil (a página de aprendizado não o tinha).
+
+`price_text` guarda o caminho absoluto do elemento, que aponta para outro
+texto quando o template muda. O PRICE_REGEX aceita qualquer número, então o
+valor só vale se tiver símbolo de moeda ou se o elemento (ou um ancestral
+próximo) indicar preço na classe, id ou itemprop. Sem isso o perfil não
+casa, e a página volta à extração completa. Um preço da varredura geral que
+não passa nessa verificação também não vira perfil.
+
+Observação: na heurística de nome, go.py escolhe o candidato mais longo; o
+perfil fixa a origem que venceu na página de aprendizado.
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import json
+import logging
+
+from lxml import etree
+
+from go import PRICE_REGEX, PRODUCT_ITEMTYPE, _product_from_json_ld
+from scraping import fast_extract
+
+logger = logging.getLogger(__name__)
+
+# Indícios de preço nos atributos do elemento ou de um ancestral próximo
+PRICE_HINTS = ("price", "preco", "preço", "valor")
+PRICE_CONTEXT_DEPTH = 3
+
+STRATEGIES = ("json_ld", "microdata", "heuristic")
+FIELDS = ("name", "brand", "price")
+MODES = ("text", "price", "price_text", "logo")
+
+_JSON_LD_SCRIPTS = etree.XPath("//script[@type='application/ld+json']")
+_MICRODATA_PRODUCT = etree.XPath("(//*[@itemtype=$itemtype])[1]")
+
+# Resultado de extract_with_profile: "hit" (perfil casou), "miss" (perfil
+# inválido, extração completa), "learned" (sem perfil, extração completa)
+Outcome = str
+
+
+@lru_cache(maxsize=1024)
+def _compiled(xpath: str) -> etree.XPath:
+    return etree.XPath(xpath)
+
+
+def _price_context(node) -> bool:
+    """O elemento ou um dos ancestrais próximos indica preço (classe, id ou itemprop)"""
+    elem = node if isinstance(node.tag, str) else node.getparent()
+    for _ in range(PRICE_CONTEXT_DEPTH):
+        if elem is None:
+            return False
+        attributes = " ".join(elem.get(name, "") for name in ("class", "id", "itemprop")).lower()
+        if any(hint in attributes for hint in PRICE_HINTS):
+            return True
+        elem = elem.getparent()
+    return False
+
+
+def _read(node, mode: str) -> Optional[str]:
+    if isinstance(node, str):
+        value = node.strip()
+        if mode == "logo":
+            value = node.lower().replace('logo', '').strip()
+        return value or None
+
+    if mode == "price_text":
+        texts = node.xpath("text()") if isinstance(node.tag, str) else [node.text]
+        in_price_context = None
+        for text in texts:
+            match = PRICE_REGEX.search(text or "")
+            if match is None:
+                continue
+            # Sem moeda, só vale dentro de um elemento de preço
+            if match.group(1) is None:
+                if in_price_context is None:
+                    in_price_context = _price_context(node)
+                if not in_price_context:
+                    continue
+            return match.group().strip()
+        return None
+
+    text = fast_extract._text(node)
+    if mode == "price":
+        match = PRICE_REGEX.search(text)
+        return match.group().strip() if match else None
+    return text or None
+
+
+def _lookup(root, source) -> Optional[str]:
+    xpath, mode = source
+    found = _compiled(xpath)(root)
+    if isinstance(found, list):
+        found = found[0] if found else None
+    # count(), boolean() e afins devolvem números e booleanos, que não são nós
+    if not isinstance(found, (etree._Element, str)):
+        return None
+    return _read(found, mode)
+
+
+def apply_profile(root, profile: Dict) -> Optional[Dict[str, Optional[str]]]:
+    """Extrair só com as consultas do perfil; None se ele não casar mais"""
+    json_ld = _product_from_json_ld([script.text for script in _JSON_LD_SCRIPTS(root)])
+    strategy = profile.get("strategy", "heuristic")
+    if strategy == "json_ld":
+        return json_ld or None
+    if json_ld:
+        return None
+
+    products = _MICRODATA_PRODUCT(root, itemtype=PRODUCT_ITEMTYPE)
+    microdata = fast_extract.microdata_from_element(products[0]) if products else None
+    if strategy == "microdata":
+        return microdata or None
+    if microdata:
+        return None
+
+    result = {}
+    for field in FIELDS:
+        source = profile["fields"].get(field)
+        if source is None:
+            result[field] = None
+            continue
+        value = _lookup(root, source)
+        if value is None:
+            return None
+        result[field] = value
+    return result
+
+
+def learn_profile(strategy: Optional[str], candidates) -> Optional[Dict]:
+    """Perfil a partir de uma extração completa (None se não houver o que aprender)"""
+    if strategy in ("json_ld", "microdata"):
+        return {"strategy": strategy}
+    if strategy != "heuristic":
+        return None
+
+    fields = {
+        "name": candidates.name_source(),
+        "brand": candidates.brand_source(),
+        "price": candidates.price_source(),
+    }
+    if all(value is None for value, source in fields.values()):
+        return None
+    if any(value is not None and source is None for value, source in fields.values()):
+        return None
+    price_source = fields["price"][1]
+    if price_source is not None and price_source[1] == "price_text":
+        # O primeiro número da página nem sempre é o preço: não fixar um que não se confirma
+        if _read(candidates.price_text_owner, "price_text") is None:
+            return None
+    return {
+        "strategy": "heuristic",
+        "fields": {field: list(source) if source else None for field, (value, source) in fields.items()},
+    }
+
+
+def extract_with_profile(
+    html_content: Union[str, bytes], profile: Optional[Dict] = None
+) -> Tuple[Dict[str, Optional[str]], Optional[Dict], Outcome]:
+    """Extração guiada por perfil; devolve (resultado, perfil aprendido, desfecho)
+
+    Função pura e serializável, para rodar em um pool de processos; quem
+    mantém o registro aplica o desfecho com `ProfileRegistry.record`.
+    """
+    root = fast_extract.parse_html(html_content)
+    if root is not None and profile is not None:
+        result = apply_profile(root, profile)
+        if result is not None:
+            return result, None, "hit"
+
+    result, strategy, candidates = fast_extract.extract_with_strategy(root)
+    learned = learn_profile(strategy, candidates) if candidates is not None else None
+    return result, learned, "learned" if profile is None else "miss"
+
+
+def domain_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+class ProfileRegistry:
+    """Perfis por domínio, declarados ou aprendidos"""
+
+    def __init__(self, declared: Optional[Dict[str, Dict]] = None, learn: bool = True):
+        self.declared = {domain.lower(): _normalized(profile) for domain, profile in (declared or {}).items()}
+        self.learned: Dict[str, Dict] = {}
+        self.learn = learn
+        self.stats = {"hits": 0, "misses": 0, "learned": 0, "invalidated": 0, "full_scans": 0}
+
+    @classmethod
+    def from_file(cls, path: str, **options) -> "ProfileRegistry":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **options)
+
+    def profile_for(self, url: str) -> Optional[Dict]:
+        domain = domain_of(url)
+        return self.learned.get(domain) or self.declared.get(domain)
+
+    def record(self, url: str, outcome: Outcome, learned: Optional[Dict]) -> None:
+        """Aplicar o desfecho de `extract_with_profile` ao registro"""
+        domain = domain_of(url)
+        if outcome == "hit":
+            self.stats["hits"] += 1
+            return
+
+        self.stats["full_scans"] += 1
+        if outcome == "miss":
+            self.stats["misses"] += 1
+            if self.learned.pop(domain, None) is not None:
+                self.stats["invalidated"] += 1
+                logger.info(f"Perfil aprendido de {domain} deixou de casar e foi descartado")
+            elif domain in self.declared:
+                logger.warning(f"Perfil declarado de {domain} não casou com {url}")
+
+        if self.learn and learned is not None and domain not in self.learned:
+            self.learned[domain] = learned
+            self.stats["learned"] += 1
+
+    def extract(self, url: str, html_content: Union[str, bytes]) -> Dict[str, Optional[str]]:
+        """Extrair no próprio processo, atualizando o registro"""
+        result, learned, outcome = extract_with_profile(html_content, self.profile_for(url))
+        self.record(url, outcome, learned)
+        return result
+
+    def to_dict(self) -> Dict[str, Dict]:
+        return {**self.declared, **self.learned}
+
+    def save(self, path: str) -> None:
+        """Gravar declarados + aprendidos (o arquivo pode ser carregado como declarado)"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def _normalized(profile: Dict) -> Dict:
+    """Aceitar campos declarados como string XPath (modo `text`)"""
+    strategy = profile.get("strategy", "heuristic")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estratégia de perfil inválida: {strategy}")
+    fields = {}
+    for field, source in profile.get("fields", {}).items():
+        if field not in FIELDS:
+            raise ValueError(f"Campo de perfil inválido: {field}")
+        if isinstance(source, str):
+            source = [source, "price" if field == "price" else "text"]
+        if source is not None:
+            _validate_source(field, source)
+        fields[field] = source
+    return {"strategy": strategy, "fields": fields}
+
+
+def _validate_source(field: str, source) -> None:
+    """Falhar ao carregar o perfil, e não no meio da extração"""
+    if not isinstance(source, (list, tuple)) or len(source) != 2:
+        raise ValueError(f"Origem inválida no campo {field}: esperado [xpath, modo]")
+    xpath, mode = source
+    if mode not in MODES:
+        raise ValueError(f"Modo de perfil inválido no campo {field}: {mode}")
+    try:
+        _compiled(xpath)
+    except (etree.XPathError, TypeError) as e:
+        raise ValueError(f"XPath inválido no campo {field}: {xpath}") from e
@@ -0,0 +1,129 @@
+"""Extração incremental com parada antecipada
+
+Alimenta o parser à medida que os blocos da resposta chegam e para de ler
+assim que um bloco JSON-LD de Product (ou um item de microdata Product)
+fica completo. Só quando a página termina sem dados estruturados é que as
+estratégias heurísticas completas são aplicadas, sobre a árvore já montada.
+
+Observação de precedência: em `go.extract_product_info` o JSON-LD vence a
+microdata mesmo que apareça depois dela. Com `stop_on_microdata=True` a
+leitura para no primeiro item de microdata; use False para manter a
+precedência exata ao custo de ler a página inteira nesses casos.
+"""
+from concurrent.futures import Executor
+from typing import Callable, Dict, Optional, Tuple
+import asyncio
+
+import httpx
+from lxml import etree
+
+from go import PRODUCT_ITEMTYPE, _product_from_json_ld
+from scraping import fast_extract
+
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+
+class StreamingExtractor:
+    """Parser incremental que para no primeiro Product estruturado completo"""
+
+    def __init__(self, encoding: Optional[str] = None, stop_on_microdata: bool = True):
+        self.stop_on_microdata = stop_on_microdata
+        self.result: Optional[Dict[str, Optional[str]]] = None
+        self.source: Optional[str] = None
+        self.bytes_fed = 0
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self._product = None
+
+    def feed(self, chunk: bytes) -> Optional[Dict[str, Optional[str]]]:
+        """Processar um bloco; devolve o resultado quando for possível parar"""
+        self.bytes_fed += len(chunk)
+        self._parser.feed(chunk)
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._product is None and elem.get("itemtype") == PRODUCT_ITEMTYPE:
+                    self._product = elem
+                continue
+
+            if elem.tag == "script" and elem.get("type") == "application/ld+json":
+                product = _product_from_json_ld([elem.text])
+                if product:
+                    return self._finish(product, "json_ld")
+            elif elem is self._product and self.stop_on_microdata:
+                microdata = fast_extract.microdata_from_element(elem)
+                if microdata:
+                    return self._finish(microdata, "microdata")
+        return None
+
+    def _finish(self, result: Dict[str, Optional[str]], source: str) -> Dict[str, Optional[str]]:
+        self.result = result
+        self.source = source
+        return result
+
+    def close(self) -> Dict[str, Optional[str]]:
+        """Finalizar o documento; sem parada antecipada, aplica todas as estratégias"""
+        if self.result is not None:
+            return self.result
+        try:
+            root = self._parser.close()
+        except etree.Error:
+            root = None
+        self.source = "full"
+        return fast_extract.extract_from_tree(root)
+
+
+async def stream_extract(
+    response: httpx.Response,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    stop_on_microdata: bool = True,
+    executor: Optional[Executor] = None,
+    extract: Callable = fast_extract.extract_product_info,
+) -> Tuple[Dict[str, Optional[str]], Dict[str, object]]:
+    """Extrair de uma resposta aberta com `client.stream(...)`
+
+    Com `executor`, o parse completo do fallback roda fora do event loop
+    (sobre o corpo acumulado); sem ele, reaproveita a árvore incremental.
+    """
+    extractor = StreamingExtractor(response.charset_encoding, stop_on_microdata)
+    chunks = []
+    info = None
+    async for chunk in response.aiter_bytes(chunk_size):
+        if executor is not None:
+            chunks.append(chunk)
+        info = extractor.feed(chunk)
+        if info is not None:
+            break
+
+    if info is None:
+        if executor is not None:
+            text = b"".join(chunks).decode(response.charset_encoding or "utf-8", errors="replace")
+            loop = asyncio.get_running_loop()
+            info = await loop.run_in_executor(executor, extract, text)
+            extractor.source = "full"
+        else:
+            info = extractor.close()
+
+    stats = {
+        "source": extractor.source,
+        "early_exit": extractor.source in ("json_ld", "microdata"),
+        "bytes_read": extractor.bytes_fed,
+    }
+    return info, stats
+
+
+async def fetch_product_info(
+    client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None, **options
+) -> Tuple[int, Optional[Dict[str, Optional[str]]], Dict[str, object]]:
+    """Buscar uma URL em streaming; devolve (status, resultado, estatísticas)
+
+    As estatísticas incluem os validadores (`etag`, `last_modified`) da
+    resposta, para quem mantém um cache de revalidação.
+    """
+    async with client.stream("GET", url, headers=headers) as response:
+        validators = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+        if response.status_code != 200:
+            return response.status_code, None, validators
+        info, stats = await stream_extract(response, **options)
+        return response.status_code, info, {**stats, **validators}
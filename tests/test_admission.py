@@ -0,0 +1,167 @@
+import asyncio
+
+from monitoring.admission import AdmissionController, AdmissionMiddleware, RouteClass, default_rules
+
+
+def classes(concurrency=1, queue=2, timeout=1.0):
+    return [
+        RouteClass("read", priority=0, concurrency=concurrency, queue=queue, timeout=timeout),
+        RouteClass("search", priority=1, concurrency=concurrency, queue=queue, timeout=timeout),
+        RouteClass("bulk", priority=2, concurrency=concurrency, queue=queue, timeout=timeout),
+        RouteClass("write", priority=1, concurrency=concurrency, queue=queue, timeout=timeout),
+    ]
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_grants_immediately_while_there_is_room():
+    async def scenario():
+        controller = AdmissionController(classes(concurrency=2), max_concurrency=10)
+        read = controller.classes["read"]
+        reasons = [await controller.acquire(read) for _ in range(2)]
+        return controller, read, reasons
+
+    controller, read, reasons = asyncio.run(scenario())
+    assert reasons == [None, None]
+    assert (read.active, controller.active) == (2, 2)
+
+
+def test_sheds_when_the_queue_is_full():
+    async def scenario():
+        controller = AdmissionController(classes(queue=1), max_concurrency=10)
+        read = controller.classes["read"]
+        await controller.acquire(read)
+        queued = asyncio.ensure_future(controller.acquire(read))
+        await settle()
+        reason = await controller.acquire(read)
+        controller.release(read)
+        return reason, await queued
+
+    assert asyncio.run(scenario()) == ("queue_full", None)
+
+
+def test_sheds_after_the_wait_timeout_and_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(classes(timeout=0.01), max_concurrency=10)
+        read = controller.classes["read"]
+        await controller.acquire(read)
+        reason = await controller.acquire(read)
+        return reason, len(read.waiters), read.active
+
+    assert asyncio.run(scenario()) == ("timeout", 0, 1)
+
+
+def test_released_slot_goes_to_the_highest_priority_class_first():
+    async def scenario():
+        controller = AdmissionController(classes(concurrency=5), max_concurrency=1)
+        bulk, search, read = (controller.classes[name] for name in ("bulk", "search", "read"))
+        await controller.acquire(bulk)
+        order = []
+
+        async def wait(route_class):
+            await controller.acquire(route_class)
+            order.append(route_class.name)
+
+        tasks = [asyncio.ensure_future(wait(route_class)) for route_class in (bulk, search, read)]
+        await settle()
+        assert order == []
+        holder = bulk
+        for served in range(1, 4):
+            # Uma vaga por vez: quem a recebeu a devolve na rodada seguinte
+            controller.release(holder)
+            await settle()
+            assert len(order) == served
+            holder = controller.classes[order[-1]]
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["read", "search", "bulk"]
+
+
+def test_global_limit_applies_across_classes():
+    async def scenario():
+        controller = AdmissionController(classes(concurrency=5, timeout=0.01), max_concurrency=2)
+        read, search = controller.classes["read"], controller.classes["search"]
+        granted = [await controller.acquire(read), await controller.acquire(search)]
+        return granted, await controller.acquire(read), controller.active
+
+    assert asyncio.run(scenario()) == ([None, None], "timeout", 2)
+
+
+def test_default_rules_classify_artigo_routes():
+    middleware = AdmissionMiddleware(None, AdmissionController(classes(), 10), default_rules("/artigos"))
+
+    def name(method, path):
+        route_class = middleware.classify(method, path)
+        return route_class.name if route_class else None
+
+    assert name("GET", "/artigos/42") == "read"
+    assert name("HEAD", "/artigos/") == "read"
+    assert name("POST", "/artigos/batch") == "read"
+    assert name("GET", "/artigos/search/?q=redes") == "search"
+    assert name("GET", "/artigos/export") == "bulk"
+    assert name("POST", "/artigos/bulk/") == "bulk"
+    assert name("PUT", "/artigos/42") == "write"
+    assert name("GET", "/metrics") is None
+
+
+async def call(middleware, method="GET", path="/artigos/1"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "query_string": b""}
+    await middleware(scope, receive, send)
+    return messages
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def test_middleware_sheds_with_503_and_retry_after():
+    async def scenario():
+        controller = AdmissionController(classes(queue=0, timeout=2.5), max_concurrency=10)
+        middleware = AdmissionMiddleware(ok_app, controller, default_rules("/artigos"))
+        await controller.acquire(controller.classes["read"])
+        return await call(middleware)
+
+    start = asyncio.run(scenario())[0]
+    assert start["status"] == 503
+    assert (b"retry-after", b"3") in start["headers"]
+
+
+def test_middleware_releases_the_slot_after_the_response():
+    async def scenario():
+        controller = AdmissionController(classes(), max_concurrency=10)
+        middleware = AdmissionMiddleware(ok_app, controller, default_rules("/artigos"))
+        statuses = [(await call(middleware))[0]["status"] for _ in range(3)]
+
+        async def failing_app(scope, receive, send):
+            raise RuntimeError("falhou")
+
+        middleware.app = failing_app
+        try:
+            await call(middleware)
+        except RuntimeError:
+            pass
+        return statuses, controller.active
+
+    assert asyncio.run(scenario()) == ([200, 200, 200], 0)
+
+
+def test_unclassified_routes_bypass_admission():
+    async def scenario():
+        controller = AdmissionController(classes(queue=0), max_concurrency=0)
+        middleware = AdmissionMiddleware(ok_app, controller, default_rules("/artigos"))
+        return (await call(middleware, path="/metrics"))[0]["status"]
+
+    assert asyncio.run(scenario()) == 200
@@ -0,0 +1,160 @@
+import asyncio
+
+from repositories import cache as cache_module
+from repositories.cache import ArtigoCache, CacheBackend, LRUCacheBackend, artigo_autores_key, artigo_key
+
+
+class Loader:
+    def __init__(self, value=None):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def make_cache(max_size=100, ttl=60.0) -> ArtigoCache:
+    return ArtigoCache(LRUCacheBackend(max_size, ttl))
+
+
+def test_get_or_load_reads_through_once():
+    async def scenario():
+        cache = make_cache()
+        loader = Loader({"id_artigo": 1})
+        first = await cache.get_or_load(artigo_key(1), loader)
+        second = await cache.get_or_load(artigo_key(1), loader)
+        return cache, loader, first, second
+
+    cache, loader, first, second = asyncio.run(scenario())
+    assert first == second == {"id_artigo": 1}
+    assert loader.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_missing_rows_are_not_cached():
+    async def scenario():
+        cache = make_cache()
+        loader = Loader(None)
+        await cache.get_or_load(artigo_key(1), loader)
+        await cache.get_or_load(artigo_key(1), loader)
+        return loader
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_invalidate_artigo_drops_every_derived_entry():
+    async def scenario():
+        cache = make_cache()
+        await cache.get_or_load(artigo_key(1), Loader({"versao": 1}))
+        await cache.get_or_load(artigo_autores_key(1), Loader({"versao": 1, "autores": []}))
+        await cache.get_or_load(artigo_key(2), Loader({"versao": 1}))
+        await cache.invalidate_artigo(1)
+        return cache
+
+    cache = asyncio.run(scenario())
+    keys = set(cache.backend._data)
+    assert keys == {artigo_key(2)}
+    assert cache.invalidations == 1
+
+
+def test_read_started_before_a_write_is_not_cached():
+    async def scenario():
+        cache = make_cache()
+
+        async def stale_loader():
+            # A escrita termina enquanto a leitura ainda está no banco
+            await cache.invalidate_artigo(1)
+            return {"versao": 1}
+
+        stale = await cache.get_or_load(artigo_key(1), stale_loader)
+        fresh = await cache.get_or_load(artigo_key(1), Loader({"versao": 2}))
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale == {"versao": 1}
+    assert fresh == {"versao": 2}
+
+
+def test_get_many_or_load_loads_only_missing_ids_in_one_call():
+    async def scenario():
+        cache = make_cache()
+        await cache.get_or_load(artigo_key(1), Loader({"id_artigo": 1}))
+        calls = []
+
+        async def loader(ids):
+            calls.append(list(ids))
+            return {artigo_id: {"id_artigo": artigo_id} for artigo_id in ids if artigo_id != 3}
+
+        found = await cache.get_many_or_load({i: artigo_key(i) for i in (1, 2, 3)}, loader)
+        again = await cache.get_many_or_load({i: artigo_key(i) for i in (1, 2)}, loader)
+        return found, again, calls
+
+    found, again, calls = asyncio.run(scenario())
+    assert calls == [[2, 3]]
+    assert set(found) == {1, 2}
+    assert set(again) == {1, 2}
+
+
+def test_get_many_or_load_skips_caching_after_concurrent_invalidation():
+    async def scenario():
+        cache = make_cache()
+
+        async def loader(ids):
+            await cache.invalidate_artigo(5)
+            return {artigo_id: {"id_artigo": artigo_id} for artigo_id in ids}
+
+        await cache.get_many_or_load({1: artigo_key(1)}, loader)
+        return cache
+
+    assert asyncio.run(scenario()).backend._data == {}
+
+
+def test_lru_backend_evicts_least_recently_used():
+    async def scenario():
+        backend = LRUCacheBackend(max_size=2, ttl=60.0)
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+        await backend.get("a")
+        await backend.set("c", 3)
+        return backend, [await backend.get(key) for key in ("a", "b", "c")]
+
+    backend, values = asyncio.run(scenario())
+    assert values == [1, None, 3]
+    assert backend.evictions == 1
+
+
+def test_lru_backend_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+    async def scenario():
+        backend = LRUCacheBackend(max_size=10, ttl=5.0)
+        await backend.set("a", 1)
+        before = await backend.get("a")
+        now[0] += 5.0
+        return backend, before, await backend.get("a")
+
+    backend, before, after = asyncio.run(scenario())
+    assert (before, after) == (1, None)
+    assert backend.expirations == 1
+
+
+def test_backend_failures_fall_back_to_the_loader():
+    class BrokenBackend(CacheBackend):
+        async def get(self, key):
+            raise ConnectionError("redis fora do ar")
+
+        async def set(self, key, value):
+            raise ConnectionError("redis fora do ar")
+
+        async def delete(self, *keys):
+            raise ConnectionError("redis fora do ar")
+
+    async def scenario():
+        cache = ArtigoCache(BrokenBackend())
+        value = await cache.get_or_load(artigo_key(1), Loader({"id_artigo": 1}))
+        await cache.invalidate_artigo(1)
+        return value
+
+    assert asyncio.run(scenario()) == {"id_artigo": 1}
@@ -0,0 +1,94 @@
+from repositories.autocomplete import AutocompleteIndex, normalize, normalize_query
+
+ROWS = [
+    (1, "Redes Neurais Profundas", "10.1590/abc.1"),
+    (2, "Redes de computadores", None),
+    (3, "Educação Pública no Brasil", "10.1000/xyz"),
+]
+
+
+def ids(suggestions):
+    return [suggestion["id_artigo"] for suggestion in suggestions]
+
+
+def test_normalize_folds_accents_case_and_spaces():
+    assert normalize("  Educação   PÚBLICA\t") == "educacao publica"
+    assert normalize("Straße") == "strasse"
+
+
+def test_normalize_query_strips_doi_prefixes():
+    for text in ("10.1590/ABC.1", "doi:10.1590/abc.1", "DOI: 10.1590/abc.1",
+                 "https://doi.org/10.1590/abc.1", "http://dx.doi.org/10.1590/abc.1"):
+        assert normalize_query(text) == "10.1590/abc.1"
+
+
+def test_complete_matches_title_and_doi_prefixes():
+    index = AutocompleteIndex.build(ROWS)
+    assert ids(index.complete("redes")) == [2, 1]
+    assert ids(index.complete("EDUCAÇÃO pub")) == [3]
+    assert index.complete("https://doi.org/10.1590") == [
+        {"id_artigo": 1, "titulo": "Redes Neurais Profundas", "DOI": "10.1590/abc.1"}
+    ]
+    assert index.complete("") == []
+    assert index.complete("quântica") == []
+
+
+def test_complete_limits_and_suggests_each_article_once():
+    # Título e DOI do mesmo artigo casam com o prefixo "10"
+    index = AutocompleteIndex.build([(7, "10 lições de estatística", "10.5555/estat")])
+    assert ids(index.complete("10")) == [7]
+    assert ids(AutocompleteIndex.build(ROWS).complete("r", k=1)) == [2]
+
+
+def test_upsert_replaces_the_old_keys():
+    index = AutocompleteIndex.build(ROWS)
+    index.upsert(1, "Aprendizado de Máquina", None)
+    assert ids(index.complete("redes")) == [2]
+    assert index.complete("10.1590") == []
+    assert ids(index.complete("aprendizado")) == [1]
+    assert index.stats() == {"artigos": 3, "keys": 4}
+
+
+def test_remove():
+    index = AutocompleteIndex.build(ROWS)
+    assert index.remove(3)
+    assert not index.remove(3)
+    assert index.complete("educacao") == []
+    assert index.complete("10.1000") == []
+    assert len(index) == 2
+
+
+def test_writes_during_a_reload_survive_the_swap():
+    index = AutocompleteIndex.build(ROWS)
+    index.begin_reload()
+    # Carga lida do banco antes destas escritas: ainda tem o artigo 3 e não tem o 4
+    fresh = AutocompleteIndex.build(ROWS)
+    index.upsert(4, "Redes Sociais", None)
+    index.upsert(1, "Redes Neurais Rasas", "10.1590/abc.1")
+    index.remove(3)
+    index.finish_reload(fresh)
+
+    assert ids(index.complete("redes")) == [2, 1, 4]
+    assert index.complete("redes neurais")[0]["titulo"] == "Redes Neurais Rasas"
+    assert index.complete("educacao") == []
+    assert len(index) == 3
+    # Depois da troca as escritas não são mais registradas
+    index.upsert(5, "Redes Ópticas", None)
+    assert index._journal is None
+
+
+def test_reload_adopts_rows_written_elsewhere():
+    index = AutocompleteIndex.build(ROWS)
+    index.begin_reload()
+    index.finish_reload(AutocompleteIndex.build(ROWS[:2] + [(9, "Clima na Amazônia", None)]))
+    assert ids(index.complete("clima")) == [9]
+    assert index.complete("educacao") == []
+
+
+def test_aborted_reload_keeps_the_current_index():
+    index = AutocompleteIndex.build(ROWS)
+    index.begin_reload()
+    index.upsert(4, "Redes Sociais", None)
+    index.abort_reload()
+    assert ids(index.complete("redes")) == [2, 1, 4]
+    assert index._journal is None
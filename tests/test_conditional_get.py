@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from config import settings
+from repositories.cache import ValidatorCache, build_validator_cache
+from routes.responses import cache_headers, etag_matches, not_modified
+
+ETAG = '"12.3"'
+
+
+@pytest.mark.parametrize("header", [
+    '"12.3"',
+    'W/"12.3"',
+    '"11.1", "12.3"',
+    ' "10.0" ,W/"12.3" ',
+    "*",
+])
+def test_etag_matches(header):
+    assert etag_matches(header, ETAG)
+
+
+@pytest.mark.parametrize("header", [None, "", '"12.4"', '"12"', "12.3", '"12.3'])
+def test_etag_does_not_match(header):
+    assert not etag_matches(header, ETAG)
+
+
+def test_not_modified_has_no_body_and_keeps_validators():
+    response = not_modified(ETAG)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == settings.ARTIGO_CACHE_CONTROL
+    assert cache_headers(ETAG) == {"ETag": ETAG, "Cache-Control": settings.ARTIGO_CACHE_CONTROL}
+
+
+def test_validator_cache_ignores_etags_read_before_a_write():
+    async def scenario():
+        validators = ValidatorCache(max_size=10, ttl=60.0)
+        epoch = validators.epoch
+        await validators.invalidate("artigo:1")
+        # ETag lido antes da escrita chega depois dela
+        await validators.set("artigo:1", '"1.1"', epoch)
+        stale = await validators.get("artigo:1")
+        await validators.set("artigo:1", '"1.2"', validators.epoch)
+        return stale, await validators.get("artigo:1")
+
+    assert asyncio.run(scenario()) == (None, '"1.2"')
+
+
+def test_validator_cache_invalidate_drops_keys():
+    async def scenario():
+        validators = ValidatorCache(max_size=10, ttl=60.0)
+        await validators.set("artigo:1", '"1.1"', validators.epoch)
+        await validators.invalidate("artigo:1")
+        return await validators.get("artigo:1"), validators.stats()
+
+    etag, stats = asyncio.run(scenario())
+    assert etag is None
+    assert stats["misses"] == 1
+
+
+@pytest.mark.parametrize("redis_url,workers,enabled", [
+    (None, 1, True),
+    ("redis://localhost:6379/0", 1, False),
+    (None, 4, False),
+])
+def test_validators_are_local_only_when_this_process_sees_every_write(monkeypatch, redis_url, workers, enabled):
+    monkeypatch.setattr(settings, "ARTIGO_CACHE_REDIS_URL", redis_url)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", workers)
+    monkeypatch.setattr(settings, "ARTIGO_VALIDATOR_CACHE_SIZE", 100)
+
+    async def scenario():
+        validators = build_validator_cache()
+        await validators.set("artigo:1", '"1.1"', validators.epoch)
+        return await validators.get("artigo:1")
+
+    assert (asyncio.run(scenario()) is not None) == enabled
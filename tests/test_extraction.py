@@ -0,0 +1,49 @@
+import pytest
+
+import go
+from benchmarks.bench_extraction import synthetic_corpus
+from scraping import fast_extract
+
+EDGE_CASES = {
+    "empty": "",
+    "no_product": "<html><head><title>Página inicial</title></head><body><p>Bem-vindo</p></body></html>",
+    "json_ld_list": (
+        '<script type="application/ld+json">[{"@type": "Organization"}, '
+        '{"@type": "Product", "name": "Livro", "brand": "Editora", "offers": [{"price": "59.90"}]}]</script>'
+    ),
+    "broken_json_ld": (
+        '<script type="application/ld+json">{"@type": "Product",</script>'
+        '<h1>Cadeira Gamer</h1><span class="price">R$ 1.199,00</span>'
+    ),
+    "price_in_tail": "<h1>Mesa</h1><div><b>Oferta:</b> R$ 450,00 à vista</div>",
+    "entities_and_nesting": (
+        "<h1>Caf&eacute; <span>Torrado</span> &amp; Mo&iacute;do</h1>"
+        '<div class="brand">Pil&atilde;o</div><div class="price"><span>R$</span> 29,90</div>'
+    ),
+    "script_inside_price": "<div class='price'><script>1</script>R$ 5,00</div>",
+    "hidden_text_in_name_and_brand": (
+        "<h1>Mesa<style>.a{}</style><template><b>rascunho</b></template><!-- x --> Nova</h1>"
+        "<div class='brand'><script>var marca = 1</script>Tok</div>"
+    ),
+    "script_in_microdata": (
+        '<div itemscope itemtype="http://schema.org/Product"><span itemprop="name">'
+        "<script>track()</script>Cadeira</span><span itemprop=\"price\"><noscript></noscript>"
+        "<style>b{}</style>R$ 99,90</span></div>"
+    ),
+}
+
+
+@pytest.mark.parametrize("html", [pytest.param(html, id=name) for name, html in synthetic_corpus()])
+def test_fast_engine_matches_beautifulsoup_on_corpus(html):
+    assert fast_extract.extract_product_info(html) == go.extract_product_info(html)
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_fast_engine_matches_beautifulsoup_on_edge_cases(name):
+    html = EDGE_CASES[name]
+    assert fast_extract.extract_product_info(html) == go.extract_product_info(html)
+
+
+def test_fast_engine_accepts_bytes():
+    html = "<h1>Fone</h1><span class='price'>R$ 99,90</span>"
+    assert fast_extract.extract_product_info(html.encode("utf-8")) == fast_extract.extract_product_info(html)
@@ -0,0 +1,104 @@
+import pytest
+
+from scraping import cache as cache_module
+from scraping.cache import ExtractionCache, content_hash, normalize_url
+
+URL = "https://Loja.com.br:443/produto/1?utm_source=x&b=2&a=1"
+RESULT = {"name": "Mesa", "brand": None, "price": "$ 450,00"}
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "extracoes.sqlite")
+
+
+def test_normalize_url_drops_tracking_params_and_default_port():
+    assert normalize_url(URL) == "https://loja.com.br/produto/1?a=1&b=2"
+    assert normalize_url("http://loja.com.br:8080") == "http://loja.com.br:8080/"
+
+
+def test_entries_survive_reopening_and_expire_after_ttl(path, clock):
+    cache = ExtractionCache(path, ttl=60)
+    cache.put(URL, RESULT, content_hash(b"<html>"), etag='"v1"', last_modified=None)
+    cache.close()
+
+    cache = ExtractionCache(path, ttl=60)
+    clock.now += 59
+    assert cache.get("https://loja.com.br/produto/1?a=1&b=2")["result"] == RESULT
+    clock.now += 2
+    assert cache.get(URL) is None
+    assert cache.summary()["expired"] == 1
+    assert cache.summary()["entries"] == 0
+    cache.close()
+
+
+def test_revalidation_renews_the_ttl_and_keeps_validators(path, clock):
+    cache = ExtractionCache(path, ttl=60)
+    cache.put(URL, RESULT, "hash", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    clock.now += 50
+    # Um 304 pode vir sem Last-Modified: o valor anterior continua valendo
+    cache.revalidated(URL, "not_modified", etag='"v2"')
+    clock.now += 50
+    entry = cache.get(URL)
+    assert (entry["etag"], entry["last_modified"]) == ('"v2"', "Mon, 01 Jan 2024 00:00:00 GMT")
+    assert cache.conditional_headers(entry) == {
+        "If-None-Match": '"v2"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.summary()["not_modified"] == 1
+    cache.close()
+
+
+def test_conditional_headers_only_include_known_validators(path, clock):
+    cache = ExtractionCache(path)
+    cache.put(URL, RESULT, "hash", etag=None, last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    assert cache.conditional_headers(cache.get(URL)) == {"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cache.conditional_headers(None) == {}
+    cache.close()
+
+
+def test_changed_content_replaces_the_entry(path, clock):
+    cache = ExtractionCache(path)
+    cache.put(URL, RESULT, "hash1", etag='"v1"', last_modified=None)
+    previous = cache.get(URL)
+    cache.put(URL, {**RESULT, "price": "$ 399,00"}, "hash2", etag='"v2"', last_modified=None, previous=previous)
+    entry = cache.get(URL)
+    assert (entry["content_hash"], entry["etag"], entry["result"]["price"]) == ("hash2", '"v2"', "$ 399,00")
+    summary = cache.summary()
+    assert (summary["new"], summary["changed"], summary["entries"]) == (1, 1, 1)
+    cache.close()
+
+
+def test_size_limit_evicts_the_least_recently_used(path, clock):
+    cache = ExtractionCache(path, max_entries=2)
+    for number in (1, 2):
+        clock.now += 1
+        cache.put(f"https://loja.com.br/{number}", RESULT, None, None, None)
+    clock.now += 1
+    # Revalidar a página 1 a torna a mais recente; a 2 sai quando a 3 entra
+    cache.revalidated("https://loja.com.br/1", "unchanged")
+    clock.now += 1
+    cache.put("https://loja.com.br/3", RESULT, None, None, None)
+
+    assert cache.get("https://loja.com.br/2") is None
+    assert cache.get("https://loja.com.br/1") is not None
+    assert cache.get("https://loja.com.br/3") is not None
+    summary = cache.summary()
+    assert (summary["evictions"], summary["entries"]) == (1, 2)
+    assert summary["hit_rate"] == pytest.approx(1 / 4)
+    cache.close()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from mood.feature_store import FEATURE_COLUMNS, MOODS, UNKNOWN_MOOD, classify_moods, write_feature_store
+
+
+def synthetic_rows(count: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    values = rng.random((count, len(FEATURE_COLUMNS)))
+    values[:, FEATURE_COLUMNS.index("tempo")] *= 200
+    values[:, FEATURE_COLUMNS.index("loudness")] *= -60
+    rows = [(f"track{index:07d}", list(row)) for index, row in enumerate(values)]
+    # Uma feature ausente vira a média da coluna
+    rows[3][1][FEATURE_COLUMNS.index("danceability")] = None
+    return rows
+
+
+@pytest.fixture
+def store(tmp_path):
+    rows = synthetic_rows(500)
+    return write_feature_store(tmp_path / "features", len(rows), iter(rows), chunk_size=64)
+
+
+def test_classify_moods_quadrants_and_missing_values():
+    valence = np.array([0.9, 0.1, 0.1, 0.9, np.nan], dtype=np.float32)
+    energy = np.array([0.9, 0.9, 0.1, 0.1, 0.5], dtype=np.float32)
+    codes = classify_moods(valence, energy)
+    assert [MOODS[code] if code != UNKNOWN_MOOD else None for code in codes] == [
+        "feliz", "tenso", "triste", "calmo", None
+    ]
+
+
+def test_vectors_are_standardized(store):
+    vectors = np.asarray(store.vectors, dtype=np.float64)
+    assert np.allclose(vectors.mean(axis=0), 0.0, atol=1e-3)
+    assert np.allclose(np.asarray(store.norms), np.einsum("ij,ij->i", vectors, vectors), rtol=1e-4)
+    assert vectors[3, FEATURE_COLUMNS.index("danceability")] == 0.0
+
+
+def test_chunked_knn_matches_brute_force(store):
+    vectors = np.asarray(store.vectors, dtype=np.float64)
+    queries = vectors[[0, 17, 499]] + 0.01
+    indices, distances = store.nearest_indices(queries, k=7, chunk_size=50)
+    expected = np.linalg.norm(vectors[None, :, :] - queries[:, None, :], axis=2)
+    assert np.array_equal(indices, np.argsort(expected, axis=1)[:, :7])
+    assert np.allclose(distances, np.sort(expected, axis=1)[:, :7], atol=1e-3)
+
+
+def test_similar_excludes_the_track_itself(store):
+    neighbours = store.similar("track0000042", k=5)
+    assert len(neighbours) == 5
+    assert "track0000042" not in [track_id for track_id, _ in neighbours]
+    assert [distance for _, distance in neighbours] == sorted(distance for _, distance in neighbours)
+
+
+def test_mood_counts_cover_every_track(store):
+    counts = store.mood_counts()
+    assert sum(counts.values()) == len(store)
+    assert set(counts) == {*MOODS, "desconhecido"}
+
+
+def test_index_of_unknown_track_raises_key_error(store):
+    assert store.index_of("track0000010") == 10
+    with pytest.raises(KeyError):
+        store.index_of("track9999999")
+
+
+def test_write_rejects_unsorted_rows(tmp_path):
+    rows = synthetic_rows(5)[::-1]
+    with pytest.raises(ValueError):
+        write_feature_store(tmp_path / "features", len(rows), iter(rows))
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from monitoring.metrics import Counter, Histogram, MetricsRegistry, http_requests_total, normalize_statement
+from monitoring.middleware import MetricsMiddleware, route_template
+
+
+def test_counter_renders_labels_and_escapes_values():
+    counter = Counter("demo_total", "Exemplo", ("route",))
+    counter.inc(route='/a"b')
+    counter.inc(2, route='/a"b')
+    assert counter.render() == [
+        "# HELP demo_total Exemplo",
+        "# TYPE demo_total counter",
+        'demo_total{route="/a\\"b"} 3',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("demo_seconds", "Exemplo", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    samples = list(histogram.samples())
+    assert samples == [
+        'demo_seconds_bucket{le="0.1"} 1',
+        'demo_seconds_bucket{le="1"} 2',
+        'demo_seconds_bucket{le="+Inf"} 3',
+        "demo_seconds_sum 5.55",
+        "demo_seconds_count 3",
+    ]
+
+
+def test_registry_rejects_duplicate_names():
+    registry = MetricsRegistry()
+    registry.register(Counter("demo_total", "Exemplo"))
+    with pytest.raises(ValueError):
+        registry.register(Counter("demo_total", "Outra"))
+
+
+def test_normalize_statement_collapses_whitespace_and_truncates():
+    assert normalize_statement("SELECT *\n    FROM  Artigos\n") == "SELECT * FROM Artigos"
+    assert len(normalize_statement("SELECT " + "x, " * 100)) == 120
+
+
+def test_route_template_uses_the_matched_route():
+    route = SimpleNamespace(path="/api/v1/artigos/{artigo_id}", path_format="/api/v1/artigos/{artigo_id}")
+    scope = {"path": "/api/v1/artigos/007", "path_params": {"artigo_id": 7}, "route": route}
+    assert route_template(scope) == "/api/v1/artigos/{artigo_id}"
+    assert route_template({"path": "/nao-existe"}) == "<unmatched>"
+
+
+def test_middleware_labels_do_not_grow_with_path_values():
+    route = SimpleNamespace(path_format="/api/v1/artigos/{artigo_id}")
+
+    async def app(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        pass
+
+    async def scenario():
+        middleware = MetricsMiddleware(app)
+        for raw in ("7", "007", "0007", "8"):
+            await middleware({"type": "http", "method": "GET", "path": f"/api/v1/artigos/{raw}"}, None, send)
+
+    before = http_requests_total.value(method="GET", route=route.path_format, status="200")
+    asyncio.run(scenario())
+    assert http_requests_total.value(method="GET", route=route.path_format, status="200") == before + 4
+    assert not [key for key in http_requests_total._values if "/api/v1/artigos/0" in key[1]]
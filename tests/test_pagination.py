@@ -0,0 +1,35 @@
+import base64
+import json
+
+import pytest
+
+from repositories.pagination import decode_cursor, encode_cursor
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("titulo", ["Redes neurais", "Educação & saúde pública", "", "a" * 300, "ü?/+="])
+def test_cursor_round_trip(titulo):
+    assert decode_cursor(encode_cursor(titulo, 42)) == (titulo, 42)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor("Título ~ com ??? >>> caracteres", 7)
+    assert not set(cursor) & set("+/=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "@@@",
+    "não-ascii",
+    _raw_cursor({"titulo": "x", "id_artigo": 1}),
+    _raw_cursor(["x", "1"]),
+    _raw_cursor([1, 2]),
+    _raw_cursor(["x", 1, 2]),
+    _raw_cursor("texto"),
+])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Cursor de paginação inválido"):
+        decode_cursor(cursor)
@@ -0,0 +1,107 @@
+import asyncio
+import io
+import json
+import socket
+
+import pytest
+
+from benchmarks.fixture_server import start_fixture_server
+from scraping.cache import ExtractionCache, content_hash
+from scraping.pipeline import ScrapePipeline
+
+PAGES = {
+    "mesa.html": b"<html><body><h1>Mesa de Jantar</h1><div class='price'>R$ 450,00</div></body></html>",
+    "cadeira.html": (
+        b'<html><body><div itemscope itemtype="http://schema.org/Product">'
+        b'<span itemprop="name">Cadeira</span><span itemprop="brand">Tok</span>'
+        b'<span itemprop="price" content="99.90">R$ 99,90</span></div></body></html>'
+    ),
+}
+
+
+@pytest.fixture
+def server():
+    server = start_fixture_server(dict(PAGES))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "extracoes.sqlite"))
+    yield cache
+    cache.close()
+
+
+def run(urls, **options):
+    pipeline = ScrapePipeline(concurrency=4, timeout=5.0, **options)
+    output = io.StringIO()
+    summary = asyncio.run(pipeline.run(urls, output))
+    records = {record["url"]: record for record in map(json.loads, output.getvalue().splitlines())}
+    return summary, records
+
+
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/mesa.html"
+
+
+def test_extracts_every_page(server):
+    urls = [f"{server.base_url}/{name}" for name in PAGES]
+    summary, records = run(urls + ["# comentário", ""])
+    assert (summary["ok"], summary["total"]) == (2, 2)
+    mesa = records[urls[0]]
+    assert (mesa["status"], mesa["name"], mesa["price"]) == (200, "Mesa de Jantar", "$ 450,00")
+    assert records[urls[1]]["brand"] == "Tok"
+    assert "cache" not in mesa
+
+
+def test_http_and_network_errors_are_reported_per_url(server):
+    missing = f"{server.base_url}/nao-existe.html"
+    offline = closed_port_url()
+    summary, records = run([missing, offline, f"{server.base_url}/mesa.html"])
+    assert (summary["ok"], summary["http_error"], summary["fetch_error"]) == (1, 1, 1)
+    assert (records[missing]["status"], records[missing]["error"]) == (404, "HTTP 404")
+    assert records[offline]["status"] is None
+    assert records[offline]["error"].startswith("ConnectError")
+
+
+def test_second_run_revalidates_with_304(server, cache):
+    url = f"{server.base_url}/mesa.html"
+    _, first = run([url], cache=cache)
+    served = server.requests_served
+    summary, second = run([url], cache=cache)
+
+    assert first[url]["cache"] == "new"
+    assert (second[url]["status"], second[url]["cache"]) == (304, "not_modified")
+    assert second[url]["price"] == "$ 450,00"
+    assert server.requests_served == served + 1
+    assert summary["ok"] == 1
+    assert summary["cache"]["not_modified"] == 1
+
+
+def test_same_content_reuses_the_cached_extraction(server, cache):
+    url = f"{server.base_url}/mesa.html"
+    # Validador antigo: o servidor responde 200, mas o corpo tem o mesmo hash
+    cached = {"name": "Do cache", "brand": None, "price": "$ 1,00"}
+    cache.put(url, cached, content_hash(PAGES["mesa.html"]), etag='"antigo"', last_modified=None)
+    summary, records = run([url], cache=cache)
+
+    assert (records[url]["status"], records[url]["cache"]) == (200, "unchanged")
+    assert records[url]["name"] == "Do cache"
+    assert summary["cache"]["unchanged"] == 1
+    assert cache.get(url)["etag"] == server.pages["/mesa.html"][1]
+
+
+def test_changed_page_is_extracted_again(server, cache):
+    url = f"{server.base_url}/mesa.html"
+    run([url], cache=cache)
+    server.set_page("mesa.html", PAGES["mesa.html"].replace(b"450,00", b"399,00"))
+    summary, records = run([url], cache=cache)
+
+    assert (records[url]["cache"], records[url]["price"]) == ("changed", "$ 399,00")
+    assert summary["cache"]["changed"] == 1
+    assert cache.get(url)["result"]["price"] == "$ 399,00"
@@ -0,0 +1,94 @@
+import pytest
+
+from scraping.profiles import ProfileRegistry, extract_with_profile
+
+URL = "https://www.loja.com.br/produto/{}"
+
+
+def page(name: str, offer: str, extra: str = "") -> str:
+    return f"<html><body><h1>{name}</h1><div><p>Oferta</p><p>{offer}</p></div>{extra}</body></html>"
+
+
+def test_learned_profile_is_reused_on_the_same_template():
+    registry = ProfileRegistry()
+    first = registry.extract(URL.format(1), page("Mesa de Jantar", "Por R$ 450,00"))
+    second = registry.extract(URL.format(2), page("Cadeira", "Por R$ 99,90"))
+    assert first["price"] == "$ 450,00"
+    assert second == {"name": "Cadeira", "brand": None, "price": "$ 99,90"}
+    assert registry.stats["learned"] == 1
+    assert registry.stats["hits"] == 1
+
+
+def test_template_shift_falls_back_and_unlearns_price_text_profile():
+    registry = ProfileRegistry()
+    registry.extract(URL.format(1), page("Mesa de Jantar", "Por R$ 450,00"))
+    # O caminho aprendido agora aponta para um número que não é preço
+    shifted = page("Cadeira", "Garantia de 12 meses", extra="<p>R$ 99,00</p>")
+    result, _, outcome = extract_with_profile(shifted, registry.profile_for(URL.format(2)))
+    registry.record(URL.format(2), outcome, None)
+    assert outcome == "miss"
+    assert result["name"] == "Cadeira"
+    assert registry.stats["invalidated"] == 1
+    assert registry.profile_for(URL.format(3)) is None
+
+
+def test_price_hint_in_markup_validates_numbers_without_currency():
+    html = "<html><body><h1>Mesa</h1><div class='preco'><p>Oferta</p><p>450,00</p></div></body></html>"
+    _, learned, outcome = extract_with_profile(html)
+    assert outcome == "learned"
+    assert learned["fields"]["price"][1] == "price_text"
+    result, _, outcome = extract_with_profile(html.replace("450,00", "512,30"), learned)
+    assert (outcome, result["price"]) == ("hit", "512,30")
+
+
+def test_bare_numbers_are_not_learned_as_prices():
+    _, learned, outcome = extract_with_profile(page("Mesa", "Código 12345"))
+    assert outcome == "learned"
+    assert learned is None
+
+
+def test_declared_profiles_accept_plain_xpaths():
+    registry = ProfileRegistry({"WWW.LOJA.COM.BR": {"fields": {"name": "//h1", "price": "//span[@class='v']"}}})
+    profile = registry.profile_for(URL.format(1))
+    assert profile == {
+        "strategy": "heuristic",
+        "fields": {"name": ["//h1", "text"], "price": ["//span[@class='v']", "price"]},
+    }
+
+
+def test_declared_profiles_reject_unknown_strategies():
+    with pytest.raises(ValueError):
+        ProfileRegistry({"loja.com.br": {"strategy": "regex"}})
+
+
+@pytest.mark.parametrize("source", [
+    "//h1[",
+    ["//h1", "html"],
+    ["//h1"],
+    42,
+])
+def test_declared_profiles_reject_invalid_sources_at_load(source):
+    with pytest.raises(ValueError):
+        ProfileRegistry({"loja.com.br": {"fields": {"name": source}}})
+
+
+def test_declared_profiles_keep_absent_fields():
+    registry = ProfileRegistry({"loja.com.br": {"fields": {"name": ["//h1", "text"], "brand": None}}})
+    assert registry.declared["loja.com.br"]["fields"] == {"name": ["//h1", "text"], "brand": None}
+
+
+def test_learned_profiles_ignore_script_text():
+    html = "<html><body><h1>Mesa</h1><div class='price'><script>1</script>R$ 5,00</div></body></html>"
+    result, learned, _ = extract_with_profile(html)
+    assert result["price"] == "$ 5,00"
+    result, _, outcome = extract_with_profile(html.replace("5,00", "6,00"), learned)
+    assert (outcome, result["price"]) == ("hit", "$ 6,00")
+
+
+@pytest.mark.parametrize("xpath", ["count(//h1)", "boolean(//h1)", "//nada"])
+def test_profile_lookups_that_return_no_node_do_not_match(xpath):
+    html = "<html><body><h1>Mesa</h1></body></html>"
+    profile = {"strategy": "heuristic", "fields": {"name": ["//h1", "text"], "brand": [xpath, "text"]}}
+    result, _, outcome = extract_with_profile(html, profile)
+    assert outcome == "miss"
+    assert result["name"] == "Mesa"
@@ -0,0 +1,73 @@
+import pytest
+
+from repositories.search import PREFIX_QUERY, TEXT_QUERY, normalize_doi, prefix_tsquery, text_query
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("redes", "redes:*"),
+    ("redes neur", "redes & neur:*"),
+    ("  Redes   Neurais  Prof ", "Redes & Neurais & Prof:*"),
+    ("educação pública", "educação & pública:*"),
+    ("10.1590/abc", "10.1590/abc:*"),
+])
+def test_prefix_tsquery_makes_the_last_word_a_prefix(text, expected):
+    assert prefix_tsquery(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("redes & neurais", "redes & neurais:*"),
+    ("redes | neurais", "redes & neurais:*"),
+    ("(redes) !neurais", "redes & neurais:*"),
+    ("redes:* <-> neurais", "redes & neurais:*"),
+    ("d'água", "d & água:*"),
+    ("redes\\ neurais", "redes & neurais:*"),
+    ("redes - neurais", "redes & neurais:*"),
+    ("redes, neurais.", "redes, & neurais.:*"),
+])
+def test_prefix_tsquery_strips_tsquery_syntax_and_loose_punctuation(text, expected):
+    assert prefix_tsquery(text) == expected
+
+
+@pytest.mark.parametrize("text", ['"redes neurais"', "redes -neurais", "-redes", "redes or neurais", "redes OR neurais"])
+def test_web_search_operators_keep_websearch_to_tsquery(text):
+    assert prefix_tsquery(text) is None
+    assert text_query(text, 0, 20) == (TEXT_QUERY, (text, text, 20, 0))
+
+
+@pytest.mark.parametrize("text", ["", "   ", "&|!", " - ", "()"])
+def test_nothing_searchable_falls_back_to_websearch(text):
+    assert prefix_tsquery(text) is None
+    assert text_query(text, 0, 20)[0] == TEXT_QUERY
+
+
+def test_text_query_pages_the_prefix_search():
+    assert text_query("redes neur", 40, 20) == (PREFIX_QUERY, ("redes & neur:*", "redes & neur:*", 20, 40))
+
+
+def test_words_with_or_inside_are_not_operators():
+    assert prefix_tsquery("fatores ortogonais") == "fatores & ortogonais:*"
+
+
+@pytest.mark.parametrize("text", [
+    "10.1590/S0102-311X2004000100001",
+    " 10.1590/S0102-311X2004000100001 ",
+    "doi:10.1590/S0102-311X2004000100001",
+    "DOI: 10.1590/S0102-311X2004000100001",
+    "https://doi.org/10.1590/S0102-311X2004000100001",
+    "http://dx.doi.org/10.1590/S0102-311X2004000100001",
+    "HTTPS://DOI.ORG/10.1590/S0102-311X2004000100001",
+])
+def test_normalize_doi_accepts_the_usual_forms(text):
+    assert normalize_doi(text) == "10.1590/S0102-311X2004000100001"
+
+
+@pytest.mark.parametrize("text", [
+    "redes neurais",
+    "10.1590",
+    "10.12/curto",
+    "veja 10.1590/abc",
+    "10.1590/abc def",
+    "https://example.org/10.1590/abc",
+])
+def test_normalize_doi_rejects_partial_or_embedded_dois(text):
+    assert normalize_doi(text) is None
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from repositories.singleflight import SingleFlight
+
+
+class Load:
+    """Leitura controlada pelo teste: termina quando `release` é chamado"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+        self.gates = []
+
+    async def __call__(self):
+        self.calls += 1
+        gate = asyncio.Event()
+        self.gates.append(gate)
+        result = self.results[min(self.calls, len(self.results)) - 1]
+        await gate.wait()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def release(self):
+        for gate in self.gates:
+            gate.set()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_identical_concurrent_calls_share_one_load():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load({"id_artigo": 1})
+        tasks = [asyncio.ensure_future(flights.do(("artigo", 1), load)) for _ in range(10)]
+        await settle()
+        load.release()
+        return flights, load, await asyncio.gather(*tasks)
+
+    flights, load, results = asyncio.run(scenario())
+    assert load.calls == 1
+    assert results == [{"id_artigo": 1}] * 10
+    stats = flights.stats()
+    assert (stats["leaders"], stats["coalesced"], stats["in_flight"]) == (1, 9, 0)
+
+
+def test_different_keys_do_not_coalesce():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load("a")
+        tasks = [asyncio.ensure_future(flights.do(("artigo", i), load)) for i in (1, 2)]
+        await settle()
+        load.release()
+        await asyncio.gather(*tasks)
+        return load
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load(LookupError("falhou"), "ok")
+        tasks = [asyncio.ensure_future(flights.do(("artigo", 1), load)) for _ in range(3)]
+        await settle()
+        load.release()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        retry = asyncio.ensure_future(flights.do(("artigo", 1), load))
+        await settle()
+        load.release()
+        return results, await retry
+
+    results, retry = asyncio.run(scenario())
+    assert all(isinstance(result, LookupError) for result in results)
+    assert retry == "ok"
+
+
+def test_write_supersedes_in_flight_read_and_waiters_reload():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load({"versao": 1}, {"versao": 2})
+        tasks = [asyncio.ensure_future(flights.do(("artigo", 1), load)) for _ in range(3)]
+        await settle()
+        flights.cancel(("artigo", 1))
+        await settle()
+        load.release()
+        return flights, load, await asyncio.gather(*tasks)
+
+    flights, load, results = asyncio.run(scenario())
+    # Ninguém recebe a versão lida antes da escrita
+    assert results == [{"versao": 2}] * 3
+    assert load.calls == 2
+    stats = flights.stats()
+    assert (stats["superseded"], stats["leaders"], stats["coalesced"]) == (1, 2, 2)
+
+
+def test_cancel_method_supersedes_every_key_of_the_method():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load(["antiga"], ["nova"])
+        pages = [asyncio.ensure_future(flights.do(("list", skip, 10), load)) for skip in (0, 10)]
+        other = asyncio.ensure_future(flights.do(("artigo", 1), load))
+        await settle()
+        flights.cancel_method("list")
+        await settle()
+        load.release()
+        return await asyncio.gather(*pages), flights.superseded
+
+    pages, superseded = asyncio.run(scenario())
+    assert superseded == 2
+    assert pages == [["nova"], ["nova"]]
+
+
+def test_cancelling_a_waiter_does_not_cancel_the_shared_load():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load("ok")
+        first = asyncio.ensure_future(flights.do(("artigo", 1), load))
+        second = asyncio.ensure_future(flights.do(("artigo", 1), load))
+        await settle()
+        first.cancel()
+        await settle()
+        load.release()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_disabled_runs_every_load():
+    async def scenario():
+        flights = SingleFlight(enabled=False)
+        load = Load("ok")
+        tasks = [asyncio.ensure_future(flights.do(("artigo", 1), load)) for _ in range(3)]
+        await settle()
+        load.release()
+        await asyncio.gather(*tasks)
+        return load
+
+    assert asyncio.run(scenario()).calls == 3
@@ -0,0 +1,135 @@
+from email.utils import formatdate
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from integrations.spotify_client import SpotifyAPIError, SpotifyClient, TokenBucket, retry_after_seconds
+
+
+def test_token_bucket_allows_burst_then_paces():
+    async def scenario():
+        bucket = TokenBucket(rate=100.0, capacity=3)
+        waits = [await bucket.acquire() for _ in range(5)]
+        return waits
+
+    waits = asyncio.run(scenario())
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert all(wait > 0 for wait in waits[3:])
+    assert sum(waits) == pytest.approx(0.02, abs=0.01)
+
+
+def test_token_bucket_pause_blocks_even_without_rate_limit():
+    async def scenario():
+        bucket = TokenBucket(rate=None, capacity=1)
+        assert await bucket.acquire() == 0.0
+        bucket.pause(0.05)
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.045
+
+
+def run_client(handler, scenario, token="t0"):
+    async def main():
+        client = SpotifyClient(token=token, base_url="https://api.test/v1", rate=None)
+        client._http = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+        try:
+            return client, await scenario(client)
+        finally:
+            await client._http.aclose()
+
+    return asyncio.run(main())
+
+
+def test_429_pauses_for_retry_after_and_retries():
+    responses = [httpx.Response(429, headers={"Retry-After": "0.05"}), httpx.Response(200, json={"ok": True})]
+    sent = []
+
+    def handler(request):
+        sent.append(time.monotonic())
+        return responses[len(sent) - 1]
+
+    client, result = run_client(handler, lambda client: client.get("/me"))
+    assert result == {"ok": True}
+    assert client.stats["retries"] == 1
+    assert sent[1] - sent[0] >= 0.045
+
+
+def test_identical_concurrent_gets_share_one_request():
+    calls = []
+
+    async def slow_handler(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": "x"})
+
+    async def scenario(client):
+        return await asyncio.gather(*(client.get("/tracks", {"ids": "a,b"}) for _ in range(5)))
+
+    client, results = run_client(slow_handler, scenario)
+    assert len(calls) == 1
+    assert results == [{"id": "x"}] * 5
+    assert client.stats["coalesced"] == 4
+
+
+def test_client_errors_are_not_retried():
+    def handler(request):
+        return httpx.Response(404, text="não encontrado")
+
+    async def scenario(client):
+        with pytest.raises(SpotifyAPIError) as error:
+            await client.get("/tracks/nada")
+        return error.value.status_code
+
+    client, status = run_client(handler, scenario)
+    assert status == 404
+    assert client.stats["requests"] == 1
+
+
+def test_401_refreshes_the_token_once():
+    class TokenSource:
+        def __init__(self):
+            self.tokens = iter(["velho", "novo"])
+            self.invalidated = 0
+
+        def __call__(self):
+            return next(self.tokens)
+
+        def invalidate(self):
+            self.invalidated += 1
+
+    source = TokenSource()
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(401 if len(seen) == 1 else 200, json={})
+
+    _, result = run_client(handler, lambda client: client.get("/me"), token=source)
+    assert result == {}
+    assert seen == ["Bearer velho", "Bearer novo"]
+    assert source.invalidated == 1
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert retry_after_seconds("2.5") == 2.5
+    assert retry_after_seconds(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+    # Data no passado: tentar de novo já
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    for invalid in (None, "", "amanhã", "inf"):
+        assert retry_after_seconds(invalid) == 1.0
+
+
+def test_429_with_http_date_retry_after_backs_off_instead_of_failing():
+    retry_at = formatdate(time.time(), usegmt=True)
+    responses = [httpx.Response(429, headers={"Retry-After": retry_at}), httpx.Response(200, json={"ok": True})]
+
+    def handler(request):
+        return responses.pop(0)
+
+    client, result = run_client(handler, lambda client: client.get("/me"))
+    assert result == {"ok": True}
+    assert client.stats["retries"] == 1
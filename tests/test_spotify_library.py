@@ -0,0 +1,153 @@
+import asyncio
+import copy
+
+import pytest
+
+from benchmarks.spotify_stub import start_spotify_stub
+from integrations.spotify_client import SpotifyClient
+from integrations.spotify_library import LibraryIngestion
+from integrations.spotify_store import LibraryStore
+
+TRACKS = 230  # 5 páginas de /me/tracks, 3 lotes de audio features, 46 artistas
+USER_ID = "stub-user"
+
+
+@pytest.fixture
+def stub():
+    stub = start_spotify_stub(TRACKS)
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LibraryStore(str(tmp_path / "biblioteca.sqlite"))
+    yield store
+    store.close()
+
+
+def run(stub, store, method="ingest", **options):
+    async def main():
+        async with SpotifyClient(token="stub", base_url=stub.base_url, rate=None) as client:
+            ingestion = LibraryIngestion(client, store, **options)
+            return await getattr(ingestion, method)()
+
+    stub.requests.clear()
+    return asyncio.run(main())
+
+
+def save_track(stub, track_id, added_at):
+    """Salvar uma faixa nova no topo da biblioteca do stub"""
+    library = stub.library
+    item = copy.deepcopy(library["items"][0])
+    item["added_at"] = added_at
+    item["track"]["id"] = track_id
+    library["items"].insert(0, item)
+    library["features"][track_id] = {**library["features"]["track0000000"], "id": track_id}
+
+
+def saved_ids(store):
+    return store.saved_track_ids(USER_ID)
+
+
+def test_full_ingestion_stores_the_whole_library(stub, store):
+    summary = run(stub, store)
+    assert store.counts() == {"saved_tracks": 230, "tracks": 230, "audio_features": 230, "artists": 46}
+    assert (summary["mode"], summary["tracks"], summary["skipped"]) == ("full", 230, 0)
+    # Páginas de 50 e lotes do tamanho máximo de cada endpoint
+    assert stub.requests == {"/v1/me": 1, "/v1/me/tracks": 5, "/v1/audio-features": 3, "/v1/artists": 1}
+    assert summary["requests"] == 10
+
+
+def test_second_ingestion_skips_features_and_artists_already_stored(stub, store):
+    run(stub, store)
+    summary = run(stub, store)
+    assert (summary["audio_features"], summary["artists"]) == (0, 0)
+    assert stub.requests == {"/v1/me": 1, "/v1/me/tracks": 5}
+    assert store.counts()["audio_features"] == 230
+
+
+def test_concurrent_ingestions_share_the_library_requests(stub, store):
+    async def main():
+        async with SpotifyClient(token="stub", base_url=stub.base_url, rate=None) as client:
+            ingestions = [LibraryIngestion(client, store) for _ in range(2)]
+            await asyncio.gather(*(ingestion.ingest() for ingestion in ingestions))
+            return client
+
+    client = asyncio.run(main())
+    assert stub.requests["/v1/me"] == 1
+    assert stub.requests["/v1/me/tracks"] == 5
+    assert client.stats["coalesced"] >= 6
+    assert store.counts()["saved_tracks"] == 230
+
+
+def test_first_sync_without_state_is_a_full_ingestion(stub, store):
+    summary = run(stub, store, "sync")
+    assert (summary["mode"], summary["tracks"]) == ("full", 230)
+    assert store.sync_state(USER_ID)["watermark"] == "2024-06-01T00:00:00Z"
+
+
+def test_incremental_sync_stops_at_the_watermark(stub, store):
+    run(stub, store, "sync")
+    save_track(stub, "nova1", "2024-06-02T10:00:00Z")
+    save_track(stub, "nova2", "2024-06-02T11:00:00Z")
+    summary = run(stub, store, "sync")
+
+    assert (summary["mode"], summary["tracks"], summary["pages"]) == ("incremental", 2, 1)
+    # Uma página de /me/tracks em vez das 5 da listagem completa
+    assert stub.requests == {"/v1/me": 1, "/v1/me/tracks": 1, "/v1/audio-features": 1}
+    assert {"nova1", "nova2"} <= saved_ids(store)
+    assert store.counts()["saved_tracks"] == 232
+    state = store.sync_state(USER_ID)
+    assert (state["watermark"], state["remote_total"]) == ("2024-06-02T11:00:00Z", 232)
+
+
+def test_tracks_saved_in_the_same_second_as_the_watermark_are_new(stub, store):
+    run(stub, store, "sync")
+    save_track(stub, "mesmo_segundo", "2024-06-01T00:00:00Z")
+    summary = run(stub, store, "sync")
+    assert (summary["mode"], summary["tracks"]) == ("incremental", 1)
+    assert "mesmo_segundo" in saved_ids(store)
+
+
+def test_unchanged_library_costs_one_page(stub, store):
+    run(stub, store, "sync")
+    before = store.sync_state(USER_ID)
+    summary = run(stub, store, "sync")
+
+    assert (summary["mode"], summary["tracks"], summary["pages"]) == ("incremental", 0, 1)
+    assert stub.requests == {"/v1/me": 1, "/v1/me/tracks": 1}
+    after = store.sync_state(USER_ID)
+    assert (after["watermark"], after["remote_total"]) == (before["watermark"], before["remote_total"])
+    assert after["reconciled_at"] == before["reconciled_at"]
+
+
+def test_removal_diverges_the_total_and_reconciles(stub, store):
+    run(stub, store, "sync")
+    removed = stub.library["items"].pop(100)["track"]["id"]
+    summary = run(stub, store, "sync")
+
+    assert (summary["mode"], summary["tracks"]) == ("reconcile", 229)
+    assert removed not in saved_ids(store)
+    assert store.counts()["saved_tracks"] == 229
+    assert store.sync_state(USER_ID)["remote_total"] == 229
+
+
+def test_removal_and_addition_together_still_reconcile(stub, store):
+    run(stub, store, "sync")
+    removed = stub.library["items"].pop(100)["track"]["id"]
+    save_track(stub, "nova", "2024-06-02T10:00:00Z")
+    summary = run(stub, store, "sync")
+
+    # O total não mudou, mas devia ter crescido com a faixa nova
+    assert summary["mode"] == "reconcile"
+    assert removed not in saved_ids(store)
+    assert "nova" in saved_ids(store)
+
+
+def test_reconcile_interval_forces_a_full_listing(stub, store):
+    run(stub, store, "sync")
+    summary = run(stub, store, "sync", reconcile_interval=0)
+    assert (summary["mode"], summary["tracks"]) == ("reconcile", 230)
+    assert stub.requests["/v1/me/tracks"] == 5
@@ -0,0 +1,84 @@
+from typing import Dict, Tuple
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.bench_extraction import synthetic_corpus
+from scraping import fast_extract
+from scraping.streaming import StreamingExtractor, fetch_product_info
+from tests.test_extraction import EDGE_CASES
+
+FILLER = "".join(f"<div class='card'><span>Produto relacionado {index}</span></div>" for index in range(2000))
+MICRODATA = (
+    '<div itemscope itemtype="http://schema.org/Product"><span itemprop="name">Cadeira</span>'
+    '<span itemprop="brand">Tok</span><span itemprop="price" content="99.90">R$ 99,90</span></div>'
+)
+JSON_LD = (
+    '<script type="application/ld+json">{"@type": "Product", "name": "Fone", '
+    '"brand": "Acme", "offers": {"price": "199.90"}}</script>'
+)
+
+
+def feed(html: str, chunk_size: int, stop_on_microdata: bool = True) -> Tuple[StreamingExtractor, Dict]:
+    """Entregar o documento em blocos, como chegaria da rede"""
+    data = html.encode("utf-8")
+    extractor = StreamingExtractor("utf-8", stop_on_microdata)
+    for offset in range(0, len(data), chunk_size):
+        if extractor.feed(data[offset:offset + chunk_size]) is not None:
+            break
+    return extractor, extractor.close()
+
+
+@pytest.mark.parametrize("chunk_size", [256, 16 * 1024])
+@pytest.mark.parametrize("html", [pytest.param(html, id=name) for name, html in synthetic_corpus()])
+def test_streaming_matches_the_full_parse_on_corpus(html, chunk_size):
+    assert feed(html, chunk_size)[1] == fast_extract.extract_product_info(html)
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_streaming_matches_the_full_parse_on_edge_cases(name):
+    html = EDGE_CASES[name]
+    assert feed(html, 64)[1] == fast_extract.extract_product_info(html)
+
+
+def test_stops_reading_after_json_ld():
+    html = f"<html><head>{JSON_LD}</head><body>{FILLER}</body></html>"
+    extractor, result = feed(html, 1024)
+    assert extractor.source == "json_ld"
+    assert extractor.bytes_fed < len(html.encode("utf-8")) / 10
+    assert result == fast_extract.extract_product_info(html)
+
+
+def test_stops_reading_after_a_complete_microdata_item():
+    html = f"<html><body>{MICRODATA}{FILLER}</body></html>"
+    extractor, result = feed(html, 1024)
+    assert extractor.source == "microdata"
+    assert extractor.bytes_fed < len(html.encode("utf-8")) / 10
+    assert result == {"name": "Cadeira", "brand": "Tok", "price": "99.90"}
+
+
+def test_strict_precedence_reads_on_to_a_later_json_ld():
+    html = f"<html><body>{MICRODATA}{FILLER}{JSON_LD}</body></html>"
+    # Parando na microdata o resultado diverge do parse completo (documentado no módulo)
+    assert feed(html, 1024)[0].source == "microdata"
+    strict, result = feed(html, 1024, stop_on_microdata=False)
+    assert strict.source == "json_ld"
+    assert result == fast_extract.extract_product_info(html)
+
+
+def test_fetch_product_info_stops_the_download_early():
+    body = f"<html><head>{JSON_LD}</head><body>{FILLER}</body></html>".encode("utf-8")
+
+    def handler(request):
+        return httpx.Response(200, content=body, headers={"ETag": '"v1"', "Content-Type": "text/html"})
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_product_info(client, "https://loja.test/p/1", chunk_size=1024)
+
+    status, info, stats = asyncio.run(main())
+    assert (status, info["name"]) == (200, "Fone")
+    assert stats["early_exit"] is True
+    assert stats["bytes_read"] < len(body) / 10
+    assert stats["etag"] == '"v1"'
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+
+from database.view_refresh import ViewRefresher
+
+
+class Refresh:
+    def __init__(self, fail_times: int = 0):
+        self.calls = 0
+        self.fail_times = fail_times
+
+    async def __call__(self):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise RuntimeError("falha simulada")
+
+
+class Clock:
+    """Relógio manual: o intervalo só passa quando o teste libera a espera"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.delays = []
+        self._gate = asyncio.Event()
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.delays.append(delay)
+        await self._gate.wait()
+        self._gate.clear()
+        self.now += delay
+
+    def release(self) -> None:
+        self._gate.set()
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def refresher_for(refresh, interval: float = 10.0):
+    clock = Clock()
+    refresher = ViewRefresher("teste", refresh, interval=interval, clock=clock, sleep=clock.sleep)
+    refresher.start()
+    return refresher, clock
+
+
+def test_writes_within_the_interval_share_one_refresh():
+    async def scenario():
+        refresh = Refresh()
+        refresher, clock = refresher_for(refresh)
+        for _ in range(100):
+            refresher.mark_dirty()
+        await settle()
+        # A primeira atualização sai logo
+        assert refresh.calls == 1
+        clock.now += 2
+        for _ in range(100):
+            refresher.mark_dirty()
+        await settle()
+        # As seguintes esperam o resto do intervalo e vão juntas
+        assert (refresh.calls, clock.delays) == (1, [8.0])
+        assert refresher.staleness() == 0.0
+        clock.release()
+        await settle()
+        await refresher.stop()
+        return refresh, refresher
+
+    refresh, refresher = asyncio.run(scenario())
+    assert refresh.calls == 2
+    assert refresher.marks == 200
+    assert refresher.stats()["dirty"] is False
+
+
+def test_no_refresh_without_writes():
+    async def scenario():
+        refresh = Refresh()
+        refresher, clock = refresher_for(refresh)
+        await settle()
+        await refresher.stop()
+        return refresh, clock
+
+    refresh, clock = asyncio.run(scenario())
+    assert (refresh.calls, clock.delays) == (0, [])
+
+
+def test_failed_refresh_is_retried_after_the_interval():
+    async def scenario():
+        refresh = Refresh(fail_times=1)
+        refresher, clock = refresher_for(refresh)
+        refresher.mark_dirty()
+        await settle()
+        assert (refresh.calls, refresher.failures, clock.delays) == (1, 1, [10.0])
+        clock.now += 3
+        # A escrita que falhou continua contando como pendente
+        assert refresher.staleness() == 3.0
+        clock.release()
+        await settle()
+        await refresher.stop()
+        return refresh, refresher
+
+    refresh, refresher = asyncio.run(scenario())
+    assert refresh.calls == 2
+    assert (refresher.failures, refresher.refreshes) == (1, 1)
+    assert refresher.staleness() == 0.0
+
+
+def test_stop_flushes_pending_writes():
+    async def scenario():
+        refresh = Refresh()
+        refresher, _ = refresher_for(refresh, interval=60.0)
+        refresher.mark_dirty()
+        await settle()
+        refresher.mark_dirty()
+        await settle()
+        await refresher.stop()
+        return refresh
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_stop_without_flush_leaves_pending_writes():
+    async def scenario():
+        refresh = Refresh()
+        refresher, _ = refresher_for(refresh, interval=60.0)
+        refresher.mark_dirty()
+        await settle()
+        refresher.mark_dirty()
+        await refresher.stop(flush=False)
+        return refresh, refresher
+
+    refresh, refresher = asyncio.run(scenario())
+    assert refresh.calls == 1
+    assert refresher.stats()["dirty"] is True
+
+
+def test_sync_refresh_functions_run_in_a_thread():
+    threads = []
+
+    async def scenario():
+        refresher, _ = refresher_for(lambda: threads.append(threading.get_ident()))
+        refresher.mark_dirty()
+        await settle()
+        await refresher.stop()
+
+    asyncio.run(scenario())
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+def test_stop_waits_for_a_threaded_refresh_before_flushing():
+    started = threading.Event()
+    gate = threading.Event()
+    lock = threading.Lock()
+    state = {"calls": 0, "active": 0, "max_active": 0}
+
+    def refresh():
+        with lock:
+            state["calls"] += 1
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        started.set()
+        gate.wait(5)
+        with lock:
+            state["active"] -= 1
+
+    async def scenario():
+        refresher, _ = refresher_for(refresh)
+        refresher.mark_dirty()
+        assert await asyncio.to_thread(started.wait, 5)
+        refresher.mark_dirty()
+        stopping = asyncio.ensure_future(refresher.stop())
+        await settle()
+        # O REFRESH em andamento não foi interrompido e o final ainda não começou
+        assert (state["calls"], stopping.done()) == (1, False)
+        gate.set()
+        await stopping
+        return refresher
+
+    refresher = asyncio.run(scenario())
+    assert (state["calls"], state["max_active"]) == (2, 1)
+    assert refresher.refreshes == 2
+    assert refresher.stats()["dirty"] is False